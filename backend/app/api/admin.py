@@ -3,9 +3,12 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from app.db.database import get_db
-from app.models.user import User
 from app.models.collection import Collection
-from app.auth.jwt_auth import get_current_admin_or_editor_user
+from app.models.api_key import APIKey, APIKeyStatus
+from app.core.request_accounting import request_totals
+from app.auth.jwt_auth import get_current_admin_or_editor_user, get_current_admin_user
+from app.auth.user_cache import UserPrincipal
+from app.core.metrics import metrics
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,29 +17,40 @@ router = APIRouter()
 
 @router.get("/stats")
 async def get_dashboard_stats(
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """
     Get dashboard statistics for admin users.
+    
+    Request totals are UTC day and month counts of public data requests.
     """
     try:
         # Count collections
         total_collections = db.query(Collection).count()
         
-        # Count API keys - placeholder for now
-        total_api_keys = 0  # This would need to be implemented with proper API key tracking
+        # Count active API keys
+        total_api_keys = db.query(APIKey).filter(APIKey.status == APIKeyStatus.ACTIVE).count()
         
-        # Request counts - placeholder for now  
-        total_requests_today = 0  # This would need to be implemented with proper request tracking
-        total_requests_month = 0  # This would need to be implemented with proper request tracking
+        # Request counts come from the daily rollup written by request accounting,
+        # so they lag live traffic by up to one flush interval
+        requests = request_totals(db)
         
         return {
             "total_collections": total_collections,
             "total_api_keys": total_api_keys,
-            "total_requests_today": total_requests_today,
-            "total_requests_month": total_requests_month
+            "total_requests_today": requests["today"],
+            "total_requests_month": requests["month"]
         }
     except Exception as e:
         logger.error(f"Failed to get dashboard stats: {e}")
         raise HTTPException(status_code=500, detail="Failed to get dashboard statistics")
+
+@router.get("/metrics")
+async def get_latency_metrics(
+    current_user: UserPrincipal = Depends(get_current_admin_user)
+):
+    """
+    Get request and public-path stage latency summaries for this worker process.
+    """
+    return {"histograms": metrics.snapshot()}
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 
 from app.db.database import get_db
-from app.models.user import User
+from app.db.pagination import MAX_PAGE_SIZE, keyset_page
 from app.models.api_key import APIKey, APIKeyStatus, APIKeyScope, APIKeyAllowed
 from app.models.collection import Collection
 from app.schemas.api_key import (
@@ -11,14 +12,47 @@ from app.schemas.api_key import (
     APIKeyCreateResponse, APIKeyScope as APIKeyScopeSchema
 )
 from app.auth.jwt_auth import get_current_user
+from app.auth.user_cache import UserPrincipal
 from app.auth.api_key_auth import generate_api_key, hash_api_key
+from app.auth.api_key_cache import api_key_cache
+from app.auth.api_key_usage import api_key_usage
 
 router = APIRouter()
 
+API_KEY_SORTS = {"created": APIKey.id, "label": APIKey.label}
+
+def check_collections_accessible(db: Session, current_user: UserPrincipal, collection_ids: List[int]) -> None:
+    """
+    Raise 400 naming the first requested collection that does not exist or,
+    for non-admins, is not owned by the user. Checks every id in one query.
+    """
+    from app.models.user import UserRole
+    query = db.query(Collection.id).filter(Collection.id.in_(sorted(set(collection_ids))))
+    if current_user.role != UserRole.ADMIN:
+        query = query.filter(Collection.owner_id == current_user.id)
+    accessible = {collection_id for (collection_id,) in query}
+    for collection_id in collection_ids:
+        if collection_id not in accessible:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Collection {collection_id} not found or not accessible"
+            )
+
+def delete_api_keys(db: Session, condition) -> None:
+    """
+    Delete the API keys matching condition with their scopes and collection
+    grants, one DELETE per table instead of the ORM cascade's per-key loads.
+    """
+    api_key_ids = select(APIKey.id).where(condition)
+    db.query(APIKeyScope).filter(APIKeyScope.api_key_id.in_(api_key_ids)).delete(synchronize_session=False)
+    db.query(APIKeyAllowed).filter(APIKeyAllowed.api_key_id.in_(api_key_ids)).delete(synchronize_session=False)
+    db.query(APIKey).filter(condition).delete(synchronize_session=False)
+
 @router.post("/api-keys", response_model=APIKeyCreateResponse)
 async def create_api_key(
     api_key_data: APIKeyCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new API key."""
@@ -48,28 +82,12 @@ async def create_api_key(
     
     # Add collection restrictions if specified
     if api_key_data.collection_ids:
-        for collection_id in api_key_data.collection_ids:
-            # Verify collection exists (Admin can access all, others only owned)
-            from app.models.user import UserRole
-            if current_user.role == UserRole.ADMIN:
-                collection = db.query(Collection).filter(Collection.id == collection_id).first()
-            else:
-                collection = db.query(Collection).filter(
-                    Collection.id == collection_id,
-                    Collection.owner_id == current_user.id
-                ).first()
-            if not collection:
-                db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Collection {collection_id} not found or not accessible"
-                )
-            
-            db_allowed = APIKeyAllowed(
-                api_key_id=db_api_key.id,
-                collection_id=collection_id
-            )
-            db.add(db_allowed)
+        # Verify collections exist (Admin can access all, others only owned)
+        check_collections_accessible(db, current_user, api_key_data.collection_ids)
+        db.execute(insert(APIKeyAllowed), [
+            {"api_key_id": db_api_key.id, "collection_id": collection_id}
+            for collection_id in api_key_data.collection_ids
+        ])
     
     db.commit()
     
@@ -81,25 +99,36 @@ async def create_api_key(
 
 @router.get("/api-keys", response_model=List[APIKeyResponse])
 async def list_api_keys(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    q: Optional[str] = Query(None, description="Only keys whose label starts with this"),
+    sort: Literal["created", "label"] = "created",
+    order: Literal["asc", "desc"] = "asc",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """List API keys for the current user."""
+    """List API keys for the current user, one page at a time when a limit is given."""
     from app.models.user import UserRole
     
-    if current_user.role == UserRole.ADMIN:
-        # Admin can see all API keys
-        api_keys = db.query(APIKey).all()
-    else:
+    query = db.query(APIKey)
+    if current_user.role != UserRole.ADMIN:
         # Users can only see their own API keys
-        api_keys = db.query(APIKey).filter(APIKey.user_id == current_user.id).all()
+        query = query.filter(APIKey.user_id == current_user.id)
+    if q:
+        query = query.filter(APIKey.label.startswith(q, autoescape=True))
+    
+    api_keys = keyset_page(
+        query, API_KEY_SORTS[sort], APIKey.id, response,
+        descending=order == "desc", limit=limit, cursor=cursor
+    )
     
     return [APIKeyResponse.from_orm(key) for key in api_keys]
 
 @router.get("/api-keys/{api_key_id}", response_model=APIKeyResponse)
 async def get_api_key(
     api_key_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific API key."""
@@ -125,7 +154,7 @@ async def get_api_key(
 async def update_api_key(
     api_key_id: int,
     api_key_data: APIKeyUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update an API key."""
@@ -152,6 +181,7 @@ async def update_api_key(
     
     db.commit()
     db.refresh(api_key)
+    api_key_cache.invalidate_key(api_key_id)
     
     return APIKeyResponse.from_orm(api_key)
 
@@ -160,7 +190,7 @@ async def update_api_key(
 async def edit_api_key(
     api_key_id: int,
     edit_data: APIKeyEditRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Edit an API key (label, expiration, and collection access)."""
@@ -193,36 +223,22 @@ async def edit_api_key(
         
         # Add new collection permissions (if not empty, empty means all collections)
         if edit_data.collection_ids:
-            for collection_id in edit_data.collection_ids:
-                # Verify collection exists and user has access
-                if current_user.role == UserRole.ADMIN:
-                    collection = db.query(Collection).filter(Collection.id == collection_id).first()
-                else:
-                    collection = db.query(Collection).filter(
-                        Collection.id == collection_id,
-                        Collection.owner_id == current_user.id
-                    ).first()
-                if not collection:
-                    db.rollback()
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Collection {collection_id} not found or not accessible"
-                    )
-                
-                db_allowed = APIKeyAllowed(
-                    api_key_id=api_key_id,
-                    collection_id=collection_id
-                )
-                db.add(db_allowed)
+            # Verify collections exist and user has access
+            check_collections_accessible(db, current_user, edit_data.collection_ids)
+            db.execute(insert(APIKeyAllowed), [
+                {"api_key_id": api_key_id, "collection_id": collection_id}
+                for collection_id in edit_data.collection_ids
+            ])
     
     db.commit()
     db.refresh(api_key)
+    api_key_cache.invalidate_key(api_key_id)
     
     return APIKeyResponse.from_orm(api_key)
 @router.delete("/api-keys/{api_key_id}")
 async def delete_api_key(
     api_key_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete an API key."""
@@ -244,13 +260,15 @@ async def delete_api_key(
     
     db.delete(api_key)
     db.commit()
+    api_key_cache.invalidate_key(api_key_id)
+    api_key_usage.discard(api_key_id)
     
     return {"message": "API key deleted successfully"}
 
 @router.post("/api-keys/{api_key_id}/revoke")
 async def revoke_api_key(
     api_key_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Revoke an API key (set status to revoked)."""
@@ -272,13 +290,14 @@ async def revoke_api_key(
     
     api_key.status = APIKeyStatus.REVOKED
     db.commit()
+    api_key_cache.invalidate_key(api_key_id)
     
     return {"message": "API key revoked successfully"}
 
 @router.get("/api-keys/{api_key_id}/allowed-collections")
 async def get_api_key_allowed_collections(
     api_key_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get collections allowed for an API key."""
@@ -298,18 +317,18 @@ async def get_api_key_allowed_collections(
             detail="Access denied to this API key"
         )
     
-    allowed_collections = db.query(APIKeyAllowed).filter(
+    # One join instead of a collection lookup per grant
+    allowed_collections = db.query(
+        APIKeyAllowed.collection_id, Collection.name, APIKeyAllowed.collection_type
+    ).join(Collection, Collection.id == APIKeyAllowed.collection_id).filter(
         APIKeyAllowed.api_key_id == api_key_id
-    ).all()
-    
-    results = []
-    for allowed in allowed_collections:
-        collection = db.query(Collection).filter(Collection.id == allowed.collection_id).first()
-        if collection:
-            results.append({
-                "collection_id": collection.id,
-                "collection_name": collection.name,
-                "collection_type": allowed.collection_type
-            })
-    
-    return results
+    ).order_by(APIKeyAllowed.id).all()
+    
+    return [
+        {
+            "collection_id": collection_id,
+            "collection_name": collection_name,
+            "collection_type": collection_type
+        }
+        for collection_id, collection_name, collection_type in allowed_collections
+    ]
@@ -1,28 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Literal, Optional, Union
 from datetime import datetime
 from pydantic import Field as PydanticField
 from pydantic import BaseModel
 
 from app.db.database import get_db
+from app.db.pagination import MAX_PAGE_SIZE, keyset_page
 from app.models.user import User
 from app.models.collection import Collection
 from app.models.field import Field
+from app.models.api_key import APIKeyAllowed
+from app.models.spike_schedule import SpikeSchedule
+from app.models.spike_schedule_field import SpikeScheduleField
 from app.schemas.collection import (
     CollectionCreate, CollectionUpdate, CollectionResponse,
-    FieldCreate, FieldUpdate, FieldResponse, CollectionWithFields
+    FieldCreate, FieldUpdate, FieldResponse, CollectionWithFields, CollectionSummary
 )
 from app.auth.jwt_auth import get_current_user, get_current_admin_or_editor_user, get_current_admin_user
+from app.auth.user_cache import UserPrincipal
 from app.generators.value_generator import ValueGenerator
+from app.generators.generation_plan import plan_cache
+from app.generators.counter_engine import counter_engine
+from app.auth.api_key_cache import api_key_cache
 
 router = APIRouter()
 
+COLLECTION_SORTS = {"created": Collection.id, "name": Collection.name}
+
+def delete_collections(db: Session, condition) -> List[int]:
+    """
+    Delete the collections matching condition and everything that cascades
+    from them, one DELETE per table instead of the ORM cascade's per-collection
+    loads. Returns the ids of the deleted fields.
+    """
+    collection_ids = select(Collection.id).where(condition)
+    deleted_field_ids = [
+        field_id for (field_id,) in db.query(Field.id).filter(Field.collection_id.in_(collection_ids))
+    ]
+    schedule_ids = select(SpikeSchedule.id).where(SpikeSchedule.collection_id.in_(collection_ids))
+    db.query(SpikeScheduleField).filter(
+        SpikeScheduleField.spike_schedule_id.in_(schedule_ids)
+    ).delete(synchronize_session=False)
+    db.query(SpikeSchedule).filter(SpikeSchedule.collection_id.in_(collection_ids)).delete(synchronize_session=False)
+    db.query(APIKeyAllowed).filter(APIKeyAllowed.collection_id.in_(collection_ids)).delete(synchronize_session=False)
+    db.query(Field).filter(Field.collection_id.in_(collection_ids)).delete(synchronize_session=False)
+    db.query(Collection).filter(condition).delete(synchronize_session=False)
+    return deleted_field_ids
+
 @router.post("/collections", response_model=CollectionResponse)
 async def create_collection(
     collection_data: CollectionCreate,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Create a new collection."""
@@ -57,23 +88,62 @@ async def create_collection(
         updated_at=db_collection.updated_at
     )
 
-@router.get("/collections", response_model=List[CollectionWithFields])
+@router.get("/collections", response_model=List[Union[CollectionSummary, CollectionWithFields]])
 async def list_collections(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    q: Optional[str] = Query(None, description="Only collections whose name starts with this"),
+    sort: Literal["created", "name"] = "created",
+    order: Literal["asc", "desc"] = "asc",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    summary: bool = Query(False, description="Return field counts instead of the fields"),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """List collections accessible to the current user."""
+    """
+    List collections accessible to the current user.
+
+    With a limit, one page is returned and the X-Next-Cursor header holds
+    the cursor for the next one.
+    """
     from app.models.user import UserRole
     
-    if current_user.role == UserRole.ADMIN:
-        # Admin can see all collections
-        collections = db.query(Collection).options(joinedload(Collection.fields), joinedload(Collection.owner)).all()
+    if summary:
+        field_count = select(func.count(Field.id)).where(
+            Field.collection_id == Collection.id
+        ).correlate(Collection).scalar_subquery()
+        query = db.query(Collection, field_count).options(joinedload(Collection.owner))
     else:
+        query = db.query(Collection).options(selectinload(Collection.fields), joinedload(Collection.owner))
+    
+    if current_user.role != UserRole.ADMIN:
         # Editors and Viewers can only see their own collections
-        collections = db.query(Collection).options(joinedload(Collection.fields), joinedload(Collection.owner)).filter(Collection.owner_id == current_user.id).all()
+        query = query.filter(Collection.owner_id == current_user.id)
+    if q:
+        query = query.filter(Collection.name.startswith(q, autoescape=True))
+    
+    rows = keyset_page(
+        query, COLLECTION_SORTS[sort], Collection.id, response,
+        descending=order == "desc", limit=limit, cursor=cursor,
+        entity=(lambda row: row[0]) if summary else (lambda row: row)
+    )
+    
+    if summary:
+        return [
+            CollectionSummary(
+                id=c.id,
+                name=c.name,
+                owner_id=c.owner_id,
+                owner_username=c.owner.username,
+                created_at=c.created_at,
+                updated_at=c.updated_at,
+                field_count=count
+            )
+            for c, count in rows
+        ]
     
     result = []
-    for c in collections:
+    for c in rows:
         # Manually construct response with proper owner data
         collection_data = {
             "id": c.id,
@@ -90,7 +160,7 @@ async def list_collections(
 @router.get("/collections/{collection_id}", response_model=CollectionWithFields)
 async def get_collection(
     collection_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific collection with its fields."""
@@ -129,7 +199,7 @@ async def get_collection(
 async def update_collection(
     collection_id: int,
     collection_data: CollectionUpdate,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Update a collection."""
@@ -165,6 +235,7 @@ async def update_collection(
     
     db.commit()
     db.refresh(collection)
+    plan_cache.invalidate_collection(collection.id)
     
     # Load owner relationship and construct response manually
     owner = db.query(User).filter(User.id == collection.owner_id).first()
@@ -186,7 +257,7 @@ class BulkDeleteCollectionsRequest(BaseModel):
 @router.delete("/collections/bulk")
 async def bulk_delete_collections(
     request: BulkDeleteCollectionsRequest,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Delete multiple collections and their associated fields and API key permissions."""
@@ -200,10 +271,8 @@ async def bulk_delete_collections(
             detail="No collection IDs provided"
         )
     
-    # Fetch all collections to be deleted with their owners
-    collections = db.query(Collection).options(joinedload(Collection.owner)).filter(
-        Collection.id.in_(collection_ids)
-    ).all()
+    # Fetch all collections to be deleted
+    collections = db.query(Collection).filter(Collection.id.in_(collection_ids)).all()
     
     # Check if all requested collections exist
     found_ids = {c.id for c in collections}
@@ -226,34 +295,30 @@ async def bulk_delete_collections(
             detail=f"Access denied to collections: {denied_collections}"
         )
     
-    # Count associated records that will be deleted
-    total_fields = 0
-    
-    for collection in collections:
-        # Count fields
-        field_count = db.query(Field).filter(Field.collection_id == collection.id).count()
-        total_fields += field_count
-    
-    # Delete all collections (cascade will handle fields and API key permissions)
+    # Delete all collections with their fields, spike schedules and API key permissions
     deleted_names = [c.name for c in collections]
-    for collection in collections:
-        db.delete(collection)
+    deleted_field_ids = delete_collections(db, Collection.id.in_(sorted(found_ids)))
     
     db.commit()
+    counter_engine.discard(deleted_field_ids)
+    for collection_id in found_ids:
+        plan_cache.invalidate_collection(collection_id)
+    # API key grants for the deleted collections were removed by the cascade
+    api_key_cache.clear()
     
     return {
         "message": f"Successfully deleted {len(collections)} collection(s)",
         "deleted_collections": deleted_names,
         "deleted_count": len(collections),
         "cascade_deleted": {
-            "fields": total_fields
+            "fields": len(deleted_field_ids)
         }
     }
 
 @router.delete("/collections/{collection_id}")
 async def delete_collection(
     collection_id: int,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Delete a collection."""
@@ -273,8 +338,12 @@ async def delete_collection(
             detail="Access denied to this collection"
         )
     
-    db.delete(collection)
+    deleted_field_ids = delete_collections(db, Collection.id == collection_id)
     db.commit()
+    counter_engine.discard(deleted_field_ids)
+    plan_cache.invalidate_collection(collection_id)
+    # API key grants for the deleted collection were removed by the cascade
+    api_key_cache.clear()
     
     return {"message": "Collection deleted successfully"}
 
@@ -283,7 +352,7 @@ async def delete_collection(
 async def create_field(
     collection_id: int,
     field_data: FieldCreate,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Create a new field for a collection."""
@@ -353,6 +422,7 @@ async def create_field(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Field with this name already exists for this collection type"
         )
+    plan_cache.invalidate_collection(collection_id)
     
     return FieldResponse.from_orm(db_field)
 
@@ -360,7 +430,7 @@ async def create_field(
 async def update_field(
     field_id: int,
     field_data: FieldUpdate,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Update a field."""
@@ -403,13 +473,14 @@ async def update_field(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Field with this name already exists for this collection type"
         )
+    plan_cache.invalidate_collection(field.collection_id)
     
     return FieldResponse.from_orm(field)
 
 @router.delete("/fields/{field_id}")
 async def delete_field(
     field_id: int,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Delete a field."""
@@ -432,6 +503,8 @@ async def delete_field(
     
     db.delete(field)
     db.commit()
+    counter_engine.discard([field_id])
+    plan_cache.invalidate_collection(collection.id)
     
     return {"message": "Field deleted successfully"}
 
@@ -449,7 +522,7 @@ class CopyCollectionResponse(BaseModel):
 async def copy_collection(
     collection_id: int,
     request: CopyCollectionRequest,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -473,11 +546,22 @@ async def copy_collection(
             detail="Access denied to this collection"
         )
     
+    # Persist in-memory counter progress so the copies start from the live state
+    counter_engine.flush()
+    
     # Get all fields from the original collection  
     original_fields = db.query(Field).filter(Field.collection_id == collection_id).all()
     
     copied_collections = []
     
+    # Load every existing "<name> (Copy n)" name at once rather than probing name by name
+    copy_prefix = f"{original_collection.name} (Copy "
+    taken_names = {
+        name for (name,) in db.query(Collection.name).filter(
+            Collection.name.startswith(copy_prefix, autoescape=True)
+        )
+    }
+    
     try:
         for i in range(1, request.count + 1):
             # Generate unique name
@@ -486,9 +570,10 @@ async def copy_collection(
             # Check if name already exists and increment if needed
             existing_count = 1
             final_name = copy_name
-            while db.query(Collection).filter(Collection.name == final_name).first():
+            while final_name in taken_names:
                 existing_count += 1
                 final_name = f"{original_collection.name} (Copy {existing_count})"
+            taken_names.add(final_name)
             
             # Create new collection
             new_collection = Collection(
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Literal, Optional
 from datetime import datetime, timezone
 
 from app.db.database import get_db
-from app.models.user import User, UserRole
+from app.db.pagination import MAX_PAGE_SIZE, keyset_page
+from app.db.types import as_utc
+from app.models.user import UserRole
 from app.models.collection import Collection
 from app.models.field import Field, ValueType
 from app.models.spike_schedule import SpikeSchedule
@@ -14,9 +16,17 @@ from app.schemas.spike_schedule import (
     SpikeScheduleResponse, SpikeScheduleFieldResponse
 )
 from app.auth.jwt_auth import get_current_admin_or_editor_user
+from app.auth.user_cache import UserPrincipal
+from app.generators.generation_plan import plan_cache
 
 router = APIRouter()
 
+SPIKE_SCHEDULE_SORTS = {
+    "created": SpikeSchedule.id,
+    "name": SpikeSchedule.name,
+    "start": SpikeSchedule.start_datetime
+}
+
 PERFORMANCE_NUMERIC_TYPES = [
     ValueType.NUMBER_FIXED, ValueType.FLOAT_FIXED,
     ValueType.NUMBER_RANGE, ValueType.FLOAT_RANGE,
@@ -27,14 +37,9 @@ def compute_schedule_status(schedule: SpikeSchedule) -> str:
     """Compute schedule status based on current time."""
     now = datetime.now(timezone.utc)
     
-    # Ensure schedule datetimes are timezone-aware (SQLite workaround)
-    start_time = schedule.start_datetime
-    end_time = schedule.end_datetime
-    
-    if start_time.tzinfo is None:
-        start_time = start_time.replace(tzinfo=timezone.utc)
-    if end_time.tzinfo is None:
-        end_time = end_time.replace(tzinfo=timezone.utc)
+    # Loaded schedules are aware UTC; as_utc also covers values assigned in this request
+    start_time = as_utc(schedule.start_datetime)
+    end_time = as_utc(schedule.end_datetime)
     
     if now < start_time:
         return "scheduled"
@@ -50,7 +55,7 @@ def is_field_editable(value_type: ValueType) -> bool:
 @router.post("/spike-schedules", response_model=SpikeScheduleResponse)
 async def create_spike_schedule(
     schedule_data: SpikeScheduleCreate,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -139,41 +144,49 @@ async def create_spike_schedule(
     
     db.commit()
     db.refresh(spike_schedule)
+    plan_cache.invalidate_collection(spike_schedule.collection_id)
     
     # Build response
     return build_spike_schedule_response(spike_schedule, db)
 
 @router.get("/spike-schedules", response_model=List[SpikeScheduleResponse])
 async def list_spike_schedules(
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    response: Response,
+    q: Optional[str] = Query(None, description="Only schedules whose name starts with this"),
+    sort: Literal["created", "name", "start"] = "created",
+    order: Literal["asc", "desc"] = "asc",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
-    """List all spike schedules accessible to the current user."""
-    if current_user.role == UserRole.ADMIN:
-        schedules = db.query(SpikeSchedule).options(
-            joinedload(SpikeSchedule.collection),
-            joinedload(SpikeSchedule.spike_fields)
-        ).all()
-    else:
-        schedules = db.query(SpikeSchedule).join(Collection).filter(
-            Collection.owner_id == current_user.id
-        ).options(
-            joinedload(SpikeSchedule.collection),
-            joinedload(SpikeSchedule.spike_fields)
-        ).all()
+    """List all spike schedules accessible to the current user, one page at a time when a limit is given."""
+    query = db.query(SpikeSchedule).options(
+        joinedload(SpikeSchedule.collection),
+        selectinload(SpikeSchedule.spike_fields)
+    )
+    if current_user.role != UserRole.ADMIN:
+        query = query.join(Collection).filter(Collection.owner_id == current_user.id)
+    if q:
+        query = query.filter(SpikeSchedule.name.startswith(q, autoescape=True))
+    
+    schedules = keyset_page(
+        query, SPIKE_SCHEDULE_SORTS[sort], SpikeSchedule.id, response,
+        descending=order == "desc", limit=limit, cursor=cursor
+    )
     
     return [build_spike_schedule_response(s, db) for s in schedules]
 
 @router.get("/spike-schedules/{schedule_id}", response_model=SpikeScheduleResponse)
 async def get_spike_schedule(
     schedule_id: int,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific spike schedule."""
     schedule = db.query(SpikeSchedule).options(
         joinedload(SpikeSchedule.collection),
-        joinedload(SpikeSchedule.spike_fields)
+        selectinload(SpikeSchedule.spike_fields)
     ).filter(SpikeSchedule.id == schedule_id).first()
     
     if not schedule:
@@ -188,7 +201,7 @@ async def get_spike_schedule(
 @router.get("/collections/{collection_id}/spike-schedules", response_model=List[SpikeScheduleResponse])
 async def list_collection_spike_schedules(
     collection_id: int,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """List spike schedules for a specific collection."""
@@ -204,7 +217,7 @@ async def list_collection_spike_schedules(
         SpikeSchedule.collection_id == collection_id
     ).options(
         joinedload(SpikeSchedule.collection),
-        joinedload(SpikeSchedule.spike_fields)
+        selectinload(SpikeSchedule.spike_fields)
     ).all()
     
     return [build_spike_schedule_response(s, db) for s in schedules]
@@ -213,13 +226,13 @@ async def list_collection_spike_schedules(
 async def update_spike_schedule(
     schedule_id: int,
     schedule_data: SpikeScheduleUpdate,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Update a spike schedule."""
     schedule = db.query(SpikeSchedule).options(
         joinedload(SpikeSchedule.collection),
-        joinedload(SpikeSchedule.spike_fields)
+        selectinload(SpikeSchedule.spike_fields)
     ).filter(SpikeSchedule.id == schedule_id).first()
     
     if not schedule:
@@ -257,13 +270,14 @@ async def update_spike_schedule(
     schedule.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(schedule)
+    plan_cache.invalidate_collection(schedule.collection_id)
     
     return build_spike_schedule_response(schedule, db)
 
 @router.delete("/spike-schedules/{schedule_id}")
 async def delete_spike_schedule(
     schedule_id: int,
-    current_user: User = Depends(get_current_admin_or_editor_user),
+    current_user: UserPrincipal = Depends(get_current_admin_or_editor_user),
     db: Session = Depends(get_db)
 ):
     """Delete a spike schedule."""
@@ -278,13 +292,20 @@ async def delete_spike_schedule(
     if current_user.role != UserRole.ADMIN and schedule.collection.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    collection_id = schedule.collection_id
     db.delete(schedule)
     db.commit()
+    plan_cache.invalidate_collection(collection_id)
     
     return {"message": "Spike schedule deleted successfully"}
 
 def build_spike_schedule_response(schedule: SpikeSchedule, db: Session) -> SpikeScheduleResponse:
-    """Build response object with computed fields."""
+    """
+    Build response object with computed fields.
+
+    Reads schedule.collection and schedule.spike_fields, so list queries
+    should load both eagerly rather than once per schedule.
+    """
     spike_fields_response = []
     for sf in schedule.spike_fields:
         spike_fields_response.append(SpikeScheduleFieldResponse(
@@ -1,33 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from typing import List
-from passlib.context import CryptContext
+from typing import List, Literal, Optional
 
 from app.db.database import get_db
+from app.db.pagination import MAX_PAGE_SIZE, keyset_page
 from app.models.user import User, UserRole
+from app.models.collection import Collection
+from app.models.api_key import APIKey
 from app.schemas.user import (
     UserCreate, UserUpdate, UserResponse, 
     PasswordChangeRequest, UserProfileUpdate
 )
-from app.auth.jwt_auth import get_current_user, get_current_admin_user
+from app.api.admin_collections import delete_collections
+from app.api.admin_api_keys import delete_api_keys
+from app.generators.generation_plan import plan_cache
+from app.generators.counter_engine import counter_engine
+from app.auth.api_key_cache import api_key_cache
+from app.auth.user_cache import UserPrincipal, user_cache
+from app.auth.password import hash_password_async, verify_password_async
+from app.auth.jwt_auth import get_current_user, get_current_user_record, get_current_admin_user
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+USER_SORTS = {"created": User.id, "username": User.username, "email": User.email}
 
 # Admin-only user management endpoints
 @router.get("/users", response_model=List[UserResponse])
 async def list_users(
-    current_user: User = Depends(get_current_admin_user),
+    response: Response,
+    q: Optional[str] = Query(None, description="Only users whose username or email starts with this"),
+    sort: Literal["created", "username", "email"] = "created",
+    order: Literal["asc", "desc"] = "asc",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """List all users (Admin only)."""
-    users = db.query(User).all()
+    """List all users (Admin only), one page at a time when a limit is given."""
+    query = db.query(User)
+    if q:
+        query = query.filter(or_(
+            User.username.startswith(q, autoescape=True),
+            User.email.startswith(q, autoescape=True)
+        ))
+    users = keyset_page(
+        query, USER_SORTS[sort], User.id, response,
+        descending=order == "desc", limit=limit, cursor=cursor
+    )
     return [UserResponse.from_orm(user) for user in users]
 
 @router.post("/users", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Create a new user (Admin only)."""
@@ -47,7 +73,7 @@ async def create_user(
         )
     
     # Create user
-    hashed_password = pwd_context.hash(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -64,7 +90,7 @@ async def create_user(
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific user (Admin only)."""
@@ -80,7 +106,7 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Update a user (Admin only)."""
@@ -115,17 +141,19 @@ async def update_user(
     
     # Hash new password if provided
     if user_data.password:
-        user.password_hash = pwd_context.hash(user_data.password)
+        user.password_hash = await hash_password_async(user_data.password)
     
     db.commit()
     db.refresh(user)
+    # Role and profile changes apply to the user's next request
+    user_cache.invalidate_user(user.id)
     
     return UserResponse.from_orm(user)
 
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Delete a user (Admin only)."""
@@ -143,15 +171,23 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
     
+    # Remove what the user owns set-wise so the ORM cascade finds nothing to load
+    deleted_field_ids = delete_collections(db, Collection.owner_id == user_id)
+    delete_api_keys(db, APIKey.user_id == user_id)
     db.delete(user)
     db.commit()
+    # Deleting a user cascades to the collections and API keys they own
+    counter_engine.discard(deleted_field_ids)
+    plan_cache.clear()
+    api_key_cache.clear()
+    user_cache.invalidate_user(user_id)
     
     return {"message": "User deleted successfully"}
 
 # Self-service endpoints (all authenticated users)
 @router.get("/profile", response_model=UserResponse)
 async def get_profile(
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """Get current user's profile."""
     return UserResponse.from_orm(current_user)
@@ -159,7 +195,7 @@ async def get_profile(
 @router.patch("/profile", response_model=UserResponse)
 async def update_profile(
     profile_data: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """Update current user's profile."""
@@ -184,19 +220,20 @@ async def update_profile(
     
     db.commit()
     db.refresh(current_user)
+    user_cache.invalidate_user(current_user.id)
     
     return UserResponse.from_orm(current_user)
 
 @router.post("/change-password")
 async def change_password(
     password_data: PasswordChangeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """Change current user's password."""
     
     # Verify current password
-    if not pwd_context.verify(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -210,7 +247,7 @@ async def change_password(
         )
     
     # Hash and save new password
-    current_user.password_hash = pwd_context.hash(password_data.new_password)
+    current_user.password_hash = await hash_password_async(password_data.new_password)
     db.commit()
     
     return {"message": "Password changed successfully"}
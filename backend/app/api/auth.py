@@ -7,13 +7,21 @@ from datetime import datetime
 
 from app.db.database import get_db
 from app.models.user import User, UserRole
+from app.models.collection import Collection
+from app.models.api_key import APIKey
 from app.schemas.auth import (
     UserLogin, UserCreate, UserUpdate, UserResponse, 
     ChangePassword, LoginResponse, LogoutResponse
 )
-from app.auth.password import hash_password, verify_password
+from app.auth.password import hash_password_async, verify_password_async, needs_rehash
+from app.api.admin_collections import delete_collections
+from app.api.admin_api_keys import delete_api_keys
+from app.generators.generation_plan import plan_cache
+from app.generators.counter_engine import counter_engine
+from app.auth.api_key_cache import api_key_cache
+from app.auth.user_cache import UserPrincipal, user_cache
 from app.auth.jwt_auth import (
-    create_access_token, get_current_user, verify_token,
+    create_access_token, get_current_user, get_current_user_record, verify_token,
     get_current_admin_user, get_current_admin_or_editor_user
 )
 
@@ -35,13 +43,17 @@ async def login(
             detail="Invalid email or password"
         )
     
-    # Verify password
-    if not verify_password(login_data.password, user.password_hash):
+    # Verify password off the event loop
+    if not await verify_password_async(login_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
+    # Upgrade hashes made with older Argon2 cost settings while the password is at hand
+    if needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(login_data.password)
+    
     # Create access token
     access_token = create_access_token(data={"sub": str(user.id)})
     
@@ -58,6 +70,7 @@ async def login(
     # Update last login
     user.last_login_at = datetime.utcnow()
     db.commit()
+    user_cache.invalidate_user(user.id)
     
     return LoginResponse(user=UserResponse.from_orm(user))
 
@@ -128,7 +141,7 @@ async def logout(response: Response):
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """Get current user information."""
     return UserResponse.from_orm(current_user)
@@ -136,20 +149,20 @@ async def get_current_user_info(
 @router.post("/change-password")
 async def change_password(
     password_data: ChangePassword,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """Change current user's password."""
     
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid current password"
         )
     
     # Hash new password
-    current_user.password_hash = hash_password(password_data.new_password)
+    current_user.password_hash = await hash_password_async(password_data.new_password)
     db.commit()
     
     return {"message": "Password changed successfully"}
@@ -158,13 +171,13 @@ async def change_password(
 @router.post("/users", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Create a new user (Admin only)."""
     
     # Hash password
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     
     # Create user
     db_user = User(
@@ -189,7 +202,7 @@ async def create_user(
 
 @router.get("/users", response_model=list[UserResponse])
 async def list_users(
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """List all users (Admin only)."""
@@ -200,7 +213,7 @@ async def list_users(
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific user (Admin only)."""
@@ -218,7 +231,7 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Update a user (Admin only)."""
@@ -247,13 +260,15 @@ async def update_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email or username already exists"
         )
+    # Role and profile changes apply to the user's next request
+    user_cache.invalidate_user(user.id)
     
     return UserResponse.from_orm(user)
 
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: UserPrincipal = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Delete a user (Admin only)."""
@@ -272,7 +287,15 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
     
+    # Remove what the user owns set-wise so the ORM cascade finds nothing to load
+    deleted_field_ids = delete_collections(db, Collection.owner_id == user_id)
+    delete_api_keys(db, APIKey.user_id == user_id)
     db.delete(user)
     db.commit()
+    # Deleting a user cascades to the collections and API keys they own
+    counter_engine.discard(deleted_field_ids)
+    plan_cache.clear()
+    api_key_cache.clear()
+    user_cache.invalidate_user(user_id)
     
     return {"message": "User deleted successfully"}
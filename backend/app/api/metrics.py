@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+@router.get("", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """
+    Latency histograms in the Prometheus text exposition format.
+    
+    Values are per worker process.
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -1,201 +1,409 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Query, Header
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import asyncio
 import time
+import orjson
 from datetime import datetime, timezone
 from urllib.parse import unquote
 
-from app.db.database import get_db
-from app.auth.api_key_auth import get_api_key_from_header, verify_collection_access
-from app.models.api_key import APIKey
-from app.models.collection import Collection
-from app.models.field import Field, CollectionType, ValueType
-from app.models.spike_schedule import SpikeSchedule
-from app.models.spike_schedule_field import SpikeScheduleField
+from app.core.config import settings
+from app.core.metrics import stage_histogram
+from app.db.database import get_async_db
+from app.auth.api_key_auth import get_api_key_from_header, get_api_key_hash, resolve_api_key, verify_collection_access
+from app.auth.api_key_cache import APIKeyPrincipal
+from app.models.field import CollectionType
+from app.generators.field_spec import FieldSpec
 from app.generators.value_generator import ValueGenerator
+from app.generators.vectorized import batch_generator
+from app.generators.generation_plan import GenerationPlan, SpikeOverlay, plan_cache, COUNTER_TYPES
+from app.generators.record_template import RecordTemplate
+from app.generators.counter_engine import counter_engine
+from app.auth.api_key_usage import api_key_usage
+from app.core.request_accounting import request_accounting
+from app.schemas.data import BatchDataRequest
 
 router = APIRouter()
 
-# Performance numeric types that can be modified in spike schedules
-PERFORMANCE_NUMERIC_TYPES = [
-    ValueType.NUMBER_FIXED, ValueType.FLOAT_FIXED,
-    ValueType.NUMBER_RANGE, ValueType.FLOAT_RANGE,
-    ValueType.INCREMENT, ValueType.DECREMENT
-]
+# Latency of each stage of the public data path; see app.core.metrics
+PLAN_STAGE = stage_histogram("plan_load")
+ACCESS_STAGE = stage_histogram("access_check")
+SPIKE_STAGE = stage_histogram("spike_lookup")
+GENERATE_STAGE = stage_histogram("generate")
+COMMIT_STAGE = stage_histogram("commit")
 
-def is_field_editable(value_type: ValueType) -> bool:
-    """Check if field type is editable in spike schedules."""
-    return value_type in PERFORMANCE_NUMERIC_TYPES
+# Media types for /stream, keyed by the format query parameter
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+async def persist_write_through(db: AsyncSession) -> None:
+    """Persist counter and usage state in this request when write-behind is disabled."""
+    buffers = [b for b in (counter_engine, api_key_usage, request_accounting) if b.write_through]
+    if buffers:
+        started = time.perf_counter()
+        # Keep flushes that commit on their own, and may wait on other workers, off the event loop
+        for buffer in buffers:
+            if buffer.flush_blocking:
+                await run_in_threadpool(buffer.flush)
+        def flush(session: Session) -> None:
+            for buffer in buffers:
+                if not buffer.flush_blocking:
+                    buffer.flush(session)
+        await db.run_sync(flush)
+        await db.commit()
+        COMMIT_STAGE.lap(started)
+
+def parse_collection_type(collection_type: str) -> CollectionType:
+    """Normalize a case-insensitive collection type to its enum value."""
+    collection_type = collection_type.lower()
+    if collection_type not in ["performance", "configuration"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="collection_type must be 'Performance' or 'Configuration'"
+        )
+    return CollectionType.PERFORMANCE if collection_type == "performance" else CollectionType.CONFIGURATION
+
+def format_stream_event(payload: bytes, stream_format: str, event_id: int) -> bytes:
+    """Frame one encoded payload as an NDJSON line or a Server-Sent Event."""
+    if stream_format == "sse":
+        return b"id: %d\ndata: %s\n\n" % (event_id, payload)
+    return payload + b"\n"
+
+def error_payload(e: HTTPException) -> Dict[str, Any]:
+    return {"status_code": e.status_code, "detail": e.detail}
+
+def resolve_active_spike(
+    plan: Optional[GenerationPlan],
+    api_key: APIKeyPrincipal,
+    collection_name: str,
+    collection_type: CollectionType
+) -> Optional[SpikeOverlay]:
+    """Check access and return the spike schedule active for the plan, if any."""
+    started = time.perf_counter()
+    
+    # Verify API key has access to this collection and type
+    if not plan or not verify_collection_access(
+        api_key, plan.collection_id, plan.owner_id, collection_type.value
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this collection"
+        )
+    
+    started = ACCESS_STAGE.lap(started)
+    
+    # Check for active spike schedule
+    now = datetime.now(timezone.utc)
+    active_spike = plan.active_spike(now)
+    SPIKE_STAGE.lap(started)
+    
+    if not active_spike and not plan.fields:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No fields found for collection '{collection_name}' type '{collection_type.value}'"
+        )
+    return active_spike
+
+def resolve_effective_fields(
+    plan: Optional[GenerationPlan],
+    api_key: APIKeyPrincipal,
+    collection_name: str,
+    collection_type: CollectionType
+) -> List[FieldSpec]:
+    """Check access and return the plan's fields with any active spike applied."""
+    active_spike = resolve_active_spike(plan, api_key, collection_name, collection_type)
+    if not active_spike:
+        return plan.fields
+    return active_spike.effective_fields(plan.fields)
+
+def resolve_record_template(
+    plan: Optional[GenerationPlan],
+    api_key: APIKeyPrincipal,
+    collection_name: str,
+    collection_type: CollectionType
+) -> RecordTemplate:
+    """Check access and return the response template for the plan's current field set."""
+    active_spike = resolve_active_spike(plan, api_key, collection_name, collection_type)
+    return plan.record_template(active_spike)
+
+async def advance_counter(effective_field: FieldSpec, count: int, generator=ValueGenerator) -> List[float]:
+    """Advance a counter, off the event loop when the engine does database I/O."""
+    if counter_engine.blocking:
+        return await run_in_threadpool(counter_engine.advance_many, effective_field, count, generator)
+    return counter_engine.advance_many(effective_field, count, generator)
+
+async def render_record(template: RecordTemplate) -> bytes:
+    """Generate the template's dynamic values and encode one record."""
+    started = time.perf_counter()
+    values = []
+    for effective_field in template.dynamic_fields:
+        try:
+            if effective_field.value_type in COUNTER_TYPES:
+                # CRITICAL: Counter state is keyed by the original field id (single source of truth)
+                values.extend(await advance_counter(effective_field, 1))
+            else:
+                # Only counters need a session, and they never reach generate_value here
+                values.append(ValueGenerator.generate_value(effective_field, None))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error generating value for field '{effective_field.field_name}'"
+            )
+    record = template.render(int(time.time()), values)
+    GENERATE_STAGE.lap(started)
+    return record
+
+async def render_collection_data(
+    plan: Optional[GenerationPlan],
+    api_key: APIKeyPrincipal,
+    collection_name: str,
+    collection_type: CollectionType
+) -> bytes:
+    """Check access and encode one record generated from a resolved plan."""
+    return await render_record(resolve_record_template(plan, api_key, collection_name, collection_type))
+
+@router.post("/batch")
+async def get_generated_data_batch(
+    batch: BatchDataRequest,
+    api_key: APIKeyPrincipal = Depends(get_api_key_from_header),
+    db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """
+    Generate data for several collections in one request.
+    
+    The API key is resolved once and all uncached collection plans are loaded
+    together. Each result carries either the generated payload or an error with
+    the status code the single-collection endpoint would have returned.
+    """
+    if len(batch.items) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.batch_max_items} items"
+        )
+    
+    # Validate collection types up front so plans can be loaded in one batch
+    keys = []
+    for item in batch.items:
+        try:
+            keys.append((item.collection, parse_collection_type(item.type)))
+        except HTTPException as e:
+            keys.append(e)
+    plans = await plan_cache.get_many(db, [key for key in keys if not isinstance(key, HTTPException)])
+    
+    results = []
+    for item, key in zip(batch.items, keys):
+        try:
+            if isinstance(key, HTTPException):
+                raise key
+            collection_name, collection_type_enum = key
+            plan = plans.get(key)
+            results.append(await render_collection_data(
+                plan, api_key, collection_name, collection_type_enum
+            ))
+            request_accounting.record(api_key.id, plan.collection_id, collection_type_enum.value)
+        except HTTPException as e:
+            results.append(orjson.dumps({
+                "collection": item.collection,
+                "type": item.type,
+                "error": error_payload(e)
+            }))
+    
+    # Record API key usage; it is written behind in batches
+    api_key_usage.record(api_key.id)
+    await persist_write_through(db)
+    
+    # Results are already encoded, so assemble the body around them
+    body = b'{"generated_at_epoch":%d,"results":[%s]}' % (int(time.time()), b",".join(results))
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{collection_name}/{collection_type}")
 async def get_generated_data(
     collection_name: str = Path(..., description="URL-encoded collection name"),
     collection_type: str = Path(..., description="Collection type: Performance or Configuration"),
-    api_key: APIKey = Depends(get_api_key_from_header),
-    db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+    if_none_match: Optional[str] = Header(None),
+    api_key: APIKeyPrincipal = Depends(get_api_key_from_header),
+    db: AsyncSession = Depends(get_async_db)
+) -> Response:
     """
     Generate and return data for a collection.
     
     - **collection_name**: The name of the collection (URL-encoded)
     - **collection_type**: Either "Performance" or "Configuration" (case-insensitive)
+    
+    The response is rendered from the plan's pre-encoded template. Field sets
+    that are all fixed values (plus EPOCH_NOW) carry a weak ETag; a matching
+    If-None-Match returns 304 until the fields are edited.
     """
     
     # URL decode the collection name
     decoded_collection_name = unquote(collection_name)
     
     # Validate collection type
-    collection_type = collection_type.lower()
-    if collection_type not in ["performance", "configuration"]:
+    collection_type_enum = parse_collection_type(collection_type)
+    
+    # Resolve the compiled plan (cached between polls)
+    started = time.perf_counter()
+    plan = await plan_cache.get(db, decoded_collection_name, collection_type_enum)
+    PLAN_STAGE.lap(started)
+    template = resolve_record_template(plan, api_key, decoded_collection_name, collection_type_enum)
+    not_modified = template.matches(if_none_match)
+    body = None if not_modified else await render_record(template)
+    
+    # Record API key usage and request counts; both are written behind in batches
+    api_key_usage.record(api_key.id)
+    request_accounting.record(api_key.id, plan.collection_id, collection_type_enum.value)
+    await persist_write_through(db)
+    
+    headers = {"ETag": template.etag} if template.etag else None
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/{collection_name}/{collection_type}/samples")
+async def get_generated_samples(
+    collection_name: str = Path(..., description="URL-encoded collection name"),
+    collection_type: str = Path(..., description="Collection type: Performance or Configuration"),
+    count: int = Query(..., ge=1, description="Number of consecutive records to generate"),
+    api_key: APIKeyPrincipal = Depends(get_api_key_from_header),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Generate several consecutive records for a collection in one request.
+    
+    Values are generated a column at a time. INCREMENT/DECREMENT fields advance
+    count steps and only their final state is persisted.
+    """
+    if count > settings.samples_max_count:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="collection_type must be 'Performance' or 'Configuration'"
+            detail=f"count must be <= {settings.samples_max_count}"
         )
     
-    # Normalize to enum value
-    collection_type_enum = CollectionType.PERFORMANCE if collection_type == "performance" else CollectionType.CONFIGURATION
+    decoded_collection_name = unquote(collection_name)
+    collection_type_enum = parse_collection_type(collection_type)
+    plan = await plan_cache.get(db, decoded_collection_name, collection_type_enum)
+    effective_fields = resolve_effective_fields(plan, api_key, decoded_collection_name, collection_type_enum)
     
-    # Verify API key has access to this collection and type
-    has_access = await verify_collection_access(
-        api_key, decoded_collection_name, collection_type, db
-    )
-    if not has_access:
+    generator = batch_generator()
+    try:
+        value_columns = iter(generator.generate_columns(
+            [f for f in effective_fields if f.value_type not in COUNTER_TYPES], count
+        ))
+    except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to this collection"
+            status_code=500,
+            detail=f"Error generating values for collection '{decoded_collection_name}'"
         )
     
-    # Get the collection
-    collection = db.query(Collection).filter(Collection.name == decoded_collection_name).first()
-    if not collection:
+    columns = []
+    for effective_field in effective_fields:
+        if effective_field.value_type not in COUNTER_TYPES:
+            columns.append(next(value_columns))
+            continue
+        try:
+            columns.append(await advance_counter(effective_field, count, generator))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error generating value for field '{effective_field.field_name}'"
+            )
+    
+    field_names = [f.field_name for f in effective_fields]
+    records = [dict(zip(field_names, row)) for row in zip(*columns)] if columns else [{} for _ in range(count)]
+    
+    # Record API key usage and request counts; both are written behind in batches
+    api_key_usage.record(api_key.id)
+    request_accounting.record(api_key.id, plan.collection_id, collection_type_enum.value)
+    await persist_write_through(db)
+    
+    # Values are plain JSON types, so skip jsonable_encoder for large batches
+    return Response(content=orjson.dumps({
+        "collection": decoded_collection_name,
+        "type": collection_type_enum.value,
+        "generated_at_epoch": int(time.time()),
+        "count": count,
+        "records": records
+    }), media_type="application/json")
+
+@router.get("/{collection_name}/{collection_type}/stream")
+async def stream_generated_data(
+    collection_name: str = Path(..., description="URL-encoded collection name"),
+    collection_type: str = Path(..., description="Collection type: Performance or Configuration"),
+    interval: float = Query(1.0, gt=0, description="Seconds between records"),
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson or sse"),
+    limit: Optional[int] = Query(None, ge=1, description="Stop after this many records"),
+    api_key: APIKeyPrincipal = Depends(get_api_key_from_header),
+    key_hash: str = Depends(get_api_key_hash),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream generated records for a collection over one long-lived connection.
+    
+    The API key is resolved again through the key cache and each record is
+    generated from the cached plan, so revocations, grant changes and admin
+    edits still apply mid-stream. Records are emitted on a fixed schedule; an
+    error after the stream has started is sent as a final event.
+    """
+    if interval < settings.stream_min_interval_seconds:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Collection not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"interval must be >= {settings.stream_min_interval_seconds}"
         )
     
-    # Check for active spike schedule
-    now = datetime.now(timezone.utc)
-    active_spike = db.query(SpikeSchedule).filter(
-        SpikeSchedule.collection_id == collection.id,
-        SpikeSchedule.start_datetime <= now,
-        SpikeSchedule.end_datetime >= now
-    ).first()
-    
-    # Generate data
-    data = {}
-    
-    if active_spike:
-        # Get spike configuration for this collection type
-        spike_fields = db.query(SpikeScheduleField).filter(
-            SpikeScheduleField.spike_schedule_id == active_spike.id,
-            SpikeScheduleField.collection_type == collection_type_enum
-        ).all()
-        
-        # Build map of spike configurations for quick lookup
-        spike_config_map = {sf.original_field_id: sf for sf in spike_fields}
-        
-        # Process ALL collection fields (unified field processing)
-        all_fields = db.query(Field).filter(
-            Field.collection_id == collection.id,
-            Field.collection_type == collection_type_enum
-        ).all()
-        
-        for field in all_fields:
-            # Check if this field has spike configuration
-            spike_config = spike_config_map.get(field.id)
+    decoded_collection_name = unquote(collection_name)
+    collection_type_enum = parse_collection_type(collection_type)
+    
+    # Generate the first record up front so access and lookup errors are
+    # returned with a proper status code instead of inside the stream
+    plan = await plan_cache.get(db, decoded_collection_name, collection_type_enum)
+    first_payload = await render_collection_data(plan, api_key, decoded_collection_name, collection_type_enum)
+    
+    # A stream counts as one request for API key usage and accounting
+    api_key_usage.record(api_key.id)
+    request_accounting.record(api_key.id, plan.collection_id, collection_type_enum.value)
+    await persist_write_through(db)
+    # Release the connection between records so an open stream does not pin it
+    await db.close()
+    
+    async def events():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + settings.stream_max_duration_seconds
+        payload = first_payload
+        sent = 0
+        while True:
+            sent += 1
+            yield format_stream_event(payload, stream_format, sent)
+            if limit is not None and sent >= limit:
+                return
             
-            if spike_config and is_field_editable(field.value_type):
-                # Create effective field with spike configuration but original field state
-                effective_field = Field(
-                    id=field.id,
-                    collection_id=field.collection_id,
-                    collection_type=field.collection_type,
-                    field_name=field.field_name,
-                    value_type=field.value_type,
-                    # Use spike configuration for numeric values
-                    fixed_value_text=field.fixed_value_text,
-                    fixed_value_number=spike_config.fixed_value_number if spike_config.fixed_value_number is not None else field.fixed_value_number,
-                    fixed_value_float=spike_config.fixed_value_float if spike_config.fixed_value_float is not None else field.fixed_value_float,
-                    range_start_number=spike_config.range_start_number if spike_config.range_start_number is not None else field.range_start_number,
-                    range_end_number=spike_config.range_end_number if spike_config.range_end_number is not None else field.range_end_number,
-                    range_start_float=spike_config.range_start_float if spike_config.range_start_float is not None else field.range_start_float,
-                    range_end_float=spike_config.range_end_float if spike_config.range_end_float is not None else field.range_end_float,
-                    float_precision=spike_config.float_precision if spike_config.float_precision is not None else field.float_precision,
-                    start_number=spike_config.start_number if spike_config.start_number is not None else field.start_number,
-                    step_number=spike_config.step_number if spike_config.step_number is not None else field.step_number,
-                    reset_number=spike_config.reset_number if spike_config.reset_number is not None else field.reset_number,
-                    # CRITICAL: Always use original field's current state (single source of truth)
-                    current_number=field.current_number,
-                    randomization_percentage=spike_config.randomization_percentage if spike_config.randomization_percentage is not None else field.randomization_percentage
-                )
-            else:
-                # Use original field configuration and state
-                effective_field = Field(
-                    id=field.id,
-                    collection_id=field.collection_id,
-                    collection_type=field.collection_type,
-                    field_name=field.field_name,
-                    value_type=field.value_type,
-                    fixed_value_text=field.fixed_value_text,
-                    fixed_value_number=field.fixed_value_number,
-                    fixed_value_float=field.fixed_value_float,
-                    range_start_number=field.range_start_number,
-                    range_end_number=field.range_end_number,
-                    range_start_float=field.range_start_float,
-                    range_end_float=field.range_end_float,
-                    float_precision=field.float_precision,
-                    start_number=field.start_number,
-                    step_number=field.step_number,
-                    reset_number=field.reset_number,
-                    current_number=field.current_number,
-                    randomization_percentage=field.randomization_percentage
-                )
+            # Schedule from the start time so slow ticks do not accumulate drift
+            next_tick = started + sent * interval
+            if next_tick > deadline:
+                return
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
             
             try:
-                value = ValueGenerator.generate_value(effective_field, db)
-                
-                # CRITICAL: Update original field's state immediately (single source of truth)
-                if field.value_type in [ValueType.INCREMENT, ValueType.DECREMENT]:
-                    if effective_field.current_number != field.current_number:
-                        field.current_number = effective_field.current_number
-                        db.flush()
-                
-                data[field.field_name] = value
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Error generating value for field '{field.field_name}'"
-                )
-    else:
-        # Use normal collection fields
-        fields = db.query(Field).filter(
-            Field.collection_id == collection.id,
-            Field.collection_type == collection_type_enum
-        ).all()
-        
-        if not fields:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No fields found for collection '{decoded_collection_name}' type '{collection_type_enum.value}'"
-            )
-        
-        for field in fields:
-            try:
-                value = ValueGenerator.generate_value(field, db)
-                data[field.field_name] = value
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Error generating value for field '{field.field_name}'"
+                # Re-resolve the key each tick; render_collection_data re-checks access
+                principal = await resolve_api_key(key_hash, db)
+                plan = await plan_cache.get(db, decoded_collection_name, collection_type_enum)
+                payload = await render_collection_data(
+                    plan, principal, decoded_collection_name, collection_type_enum
                 )
+                await persist_write_through(db)
+            except HTTPException as e:
+                yield format_stream_event(orjson.dumps({"error": error_payload(e)}), stream_format, sent + 1)
+                return
+            finally:
+                await db.close()
     
-    # Update API key last used time
-    api_key.last_used_at = datetime.utcnow()
-    db.commit()
-    
-    return {
-        "collection": decoded_collection_name,
-        "type": collection_type_enum.value,
-        "generated_at_epoch": int(time.time()),
-        "data": data
-    }
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,12 +1,16 @@
 import hashlib
 import secrets
-from datetime import datetime
-from typing import Optional, Tuple
+import time
+from typing import Dict, Optional, Set, Tuple
 from fastapi import HTTPException, status, Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.models.api_key import APIKey, APIKeyStatus
-from app.models.user import User
+from app.db.database import get_async_db
+from app.models.api_key import APIKey, APIKeyStatus, APIKeyAllowed
+from app.auth.api_key_cache import APIKeyPrincipal, api_key_cache
+from app.core.metrics import stage_histogram
+
+AUTH_STAGE = stage_histogram("auth")
 
 def generate_api_key() -> Tuple[str, str, str]:
     """Generate a new API key and return (full_key, prefix, hash)."""
@@ -19,13 +23,11 @@ def hash_api_key(key: str) -> str:
     """Hash an API key."""
     return hashlib.sha256(key.encode()).hexdigest()
 
-async def get_api_key_from_header(
+def get_api_key_hash(
     x_api_key: Optional[str] = Header(None),
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-) -> APIKey:
-    """Extract and validate API key from headers."""
-    
+    authorization: Optional[str] = Header(None)
+) -> str:
+    """Extract the API key from headers and return its hash."""
     # Try X-API-Key header first
     api_key = x_api_key
     
@@ -39,57 +41,67 @@ async def get_api_key_from_header(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="API key required"
         )
+    return hash_api_key(api_key)
+
+async def resolve_api_key(key_hash: str, db: AsyncSession) -> APIKeyPrincipal:
+    """Resolve an active, unexpired API key by hash (cached between requests) or raise 401."""
+    principal = api_key_cache.get(key_hash)
+    if principal is None:
+        version = api_key_cache.version
+        principal = await db.run_sync(lambda session: load_api_key_principal(key_hash, session))
+        if not principal:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid API key"
+            )
+        api_key_cache.put(key_hash, principal, version)
     
-    # Hash the provided key and look it up
-    key_hash = hash_api_key(api_key)
+    # Check if key has expired
+    if principal.is_expired():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="API key has expired"
+        )
+    return principal
+
+async def get_api_key_from_header(
+    key_hash: str = Depends(get_api_key_hash),
+    db: AsyncSession = Depends(get_async_db)
+) -> APIKeyPrincipal:
+    """Extract and validate API key from headers."""
+    started = time.perf_counter()
+    principal = await resolve_api_key(key_hash, db)
+    AUTH_STAGE.lap(started)
+    return principal
+
+def load_api_key_principal(key_hash: str, db: Session) -> Optional[APIKeyPrincipal]:
+    """Resolve an active API key and its collection grants from the database."""
     db_api_key = db.query(APIKey).filter(
         APIKey.key_hash == key_hash,
         APIKey.status == APIKeyStatus.ACTIVE
     ).first()
-    
     if not db_api_key:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key"
-        )
+        return None
     
-    # Check if key has expired
-    if db_api_key.expires_at and db_api_key.expires_at < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="API key has expired"
-        )
+    allowed: Dict[int, Set[Optional[str]]] = {}
+    rows = db.query(APIKeyAllowed.collection_id, APIKeyAllowed.collection_type).filter(
+        APIKeyAllowed.api_key_id == db_api_key.id
+    ).all()
+    for collection_id, collection_type in rows:
+        allowed.setdefault(collection_id, set()).add(collection_type.lower() if collection_type else None)
     
-    return db_api_key
+    return APIKeyPrincipal(
+        id=db_api_key.id,
+        user_id=db_api_key.user_id,
+        expires_at=db_api_key.expires_at,
+        allowed={collection_id: frozenset(types) for collection_id, types in allowed.items()}
+    )
 
-async def verify_collection_access(
-    api_key: APIKey,
-    collection_name: str,
-    collection_type: str,
-    db: Session
+def verify_collection_access(
+    api_key: APIKeyPrincipal,
+    collection_id: int,
+    owner_id: int,
+    collection_type: str
 ) -> bool:
     """Verify that the API key has access to the specified collection and type."""
-    from app.models.collection import Collection
-    from app.models.api_key import APIKeyAllowed
-    
-    # Get the collection
-    collection = db.query(Collection).filter(Collection.name == collection_name).first()
-    if not collection:
-        return False
-    
-    # Check if this API key has access to this collection
-    allowed = db.query(APIKeyAllowed).filter(
-        APIKeyAllowed.api_key_id == api_key.id,
-        APIKeyAllowed.collection_id == collection.id
-    ).first()
-    
-    if not allowed:
-        # Check if key has access to all collections owned by the same user
-        if collection.owner_id != api_key.user_id:
-            return False
-    else:
-        # If there's a specific collection type restriction, check it
-        if allowed.collection_type and allowed.collection_type.lower() != collection_type.lower():
-            return False
-    
-    return True
+    return api_key.can_access(collection_id, owner_id, collection_type)
@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Optional
+
+from app.core.config import settings
+from app.core.shared_generation import SharedGeneration, shared_generation
+from app.core.versioned_cache import VersionedTTLCache
+
+
+@dataclass(frozen=True)
+class APIKeyPrincipal:
+    """Everything the public endpoint needs to authorize an API key."""
+    id: int
+    user_id: int
+    expires_at: Optional[datetime]
+    # collection_id -> allowed collection types (lowercase); None in the set means any type
+    allowed: Dict[int, FrozenSet[Optional[str]]]
+
+    def is_expired(self) -> bool:
+        if self.expires_at is None:
+            return False
+        expires_at = self.expires_at
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return expires_at < datetime.utcnow()
+
+    def can_access(self, collection_id: int, owner_id: int, collection_type: str) -> bool:
+        """Check access to a collection and type without touching the database."""
+        allowed_types = self.allowed.get(collection_id)
+        if allowed_types is None:
+            # Keys without an explicit grant can access collections owned by the same user
+            return owner_id == self.user_id
+        return None in allowed_types or collection_type.lower() in allowed_types
+
+
+class APIKeyCache(VersionedTTLCache[str, APIKeyPrincipal]):
+    """
+    LRU cache of resolved API key principals keyed by key hash, with a TTL.
+
+    Admin endpoints that change or revoke a key must call invalidate_key() so
+    the change takes effect on the next request in every worker; the TTL is a
+    backstop for changes made outside the app, such as direct SQL.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, shared: Optional[SharedGeneration] = None):
+        super().__init__(ttl_seconds, max_size=max_size, shared=shared)
+
+    def invalidate_key(self, api_key_id: int) -> None:
+        self.invalidate_where(lambda principal: principal.id == api_key_id)
+
+
+api_key_cache = APIKeyCache(
+    max_size=settings.api_key_cache_size,
+    ttl_seconds=settings.api_key_cache_ttl_seconds,
+    shared=shared_generation("api_keys")
+)
@@ -0,0 +1,82 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.write_behind import WriteBehindBuffer
+from app.models.api_key import APIKey
+
+
+class APIKeyUsageTracker(WriteBehindBuffer):
+    """
+    Aggregates last-used timestamps and request counts per API key in memory.
+
+    Pending usage is written to api_keys in a single batched UPDATE every flush
+    interval, so serving a public request does not need a database write.
+    """
+
+    thread_name = "api-key-usage"
+
+    def __init__(self, flush_interval_seconds: float, session_factory=SessionLocal):
+        super().__init__(flush_interval_seconds, session_factory)
+        # api_key_id -> (last used epoch seconds, requests since last flush)
+        self._pending: Dict[int, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, api_key_id: int) -> None:
+        now = time.time()
+        with self._lock:
+            _, count = self._pending.get(api_key_id, (now, 0))
+            self._pending[api_key_id] = (now, count + 1)
+
+    def discard(self, api_key_id: int) -> None:
+        """Drop pending usage for a deleted key so a reused id starts clean."""
+        with self._lock:
+            self._pending.pop(api_key_id, None)
+
+    def reset(self) -> None:
+        """Drop all pending usage without persisting it."""
+        with self._lock:
+            self._pending.clear()
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Write pending usage to api_keys and return how many keys were updated."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+
+        params = [
+            {
+                "api_key_id": api_key_id,
+                "last_used_at": datetime.fromtimestamp(last_used, timezone.utc).replace(tzinfo=None),
+                "request_count": count
+            }
+            for api_key_id, (last_used, count) in pending.items()
+        ]
+        table = APIKey.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("api_key_id"))
+            .values(
+                last_used_at=bindparam("last_used_at"),
+                request_count=table.c.request_count + bindparam("request_count")
+            )
+        )
+        try:
+            self._execute(statement, params, db)
+        except Exception:
+            # Merge the failed batch back so the next flush retries it
+            with self._lock:
+                for api_key_id, (last_used, count) in pending.items():
+                    newer_used, newer_count = self._pending.get(api_key_id, (last_used, 0))
+                    self._pending[api_key_id] = (max(last_used, newer_used), count + newer_count)
+            raise
+        return len(params)
+
+
+api_key_usage = APIKeyUsageTracker(flush_interval_seconds=settings.api_key_usage_flush_interval_seconds)
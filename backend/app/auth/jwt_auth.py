@@ -6,7 +6,9 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.database import get_db
+from app.db.types import as_utc
 from app.models.user import User
+from app.auth.user_cache import UserPrincipal, user_cache
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token with renewable session support."""
@@ -59,30 +61,50 @@ def should_refresh_token(payload: Dict[str, Any]) -> bool:
     
     return 0 < time_until_expiry <= threshold_seconds
 
-def get_current_user_from_token(token: str, db: Session) -> Optional[User]:
-    """Get the current user from a JWT token."""
-    payload = verify_token(token)
-    if payload is None:
-        return None
-    
-    user_id = payload.get("sub")
-    if user_id is None:
-        return None
-    
+def user_id_from_payload(payload: Dict[str, Any]) -> Optional[int]:
+    """Return the user id a decoded token was issued for."""
     try:
-        user_id = int(user_id)
+        return int(payload.get("sub"))
     except (ValueError, TypeError):
         return None
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    return user
+
+def load_user_principal(user_id: int, db: Session) -> Optional[UserPrincipal]:
+    """Resolve a user principal, from the cache when possible."""
+    principal = user_cache.get(user_id)
+    if principal is None:
+        version = user_cache.version
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return None
+        principal = UserPrincipal.from_user(user)
+        user_cache.put(principal, version)
+    return principal
+
+def record_activity(principal: UserPrincipal, db: Session) -> None:
+    """Update last_login_at at most once per settings.last_login_update_minutes."""
+    now = datetime.utcnow()
+    last_login_at = principal.last_login_at
+    interval = timedelta(minutes=settings.last_login_update_minutes)
+    if last_login_at is not None and as_utc(last_login_at).replace(tzinfo=None) > now - interval:
+        return
+    db.query(User).filter(User.id == principal.id).update(
+        {User.last_login_at: now}, synchronize_session=False
+    )
+    db.commit()
+    # Reload on the next request so the principal carries the new time
+    user_cache.invalidate_user(principal.id)
 
 async def get_current_user(
     response: Response,
     session_token: Optional[str] = Cookie(None),
     db: Session = Depends(get_db)
-) -> User:
-    """Dependency to get current authenticated user with auto-refresh capability."""
+) -> UserPrincipal:
+    """
+    Dependency to get current authenticated user with auto-refresh capability.
+    
+    The user is resolved through a short-lived cache, so read-only admin
+    requests normally run no query and no write.
+    """
     
     if not session_token:
         raise HTTPException(
@@ -105,7 +127,8 @@ async def get_current_user(
             detail="Session expired - please log in again"
         )
     
-    user = get_current_user_from_token(session_token, db)
+    user_id = user_id_from_payload(payload)
+    user = load_user_principal(user_id, db) if user_id is not None else None
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -126,15 +149,27 @@ async def get_current_user(
         # Add header to indicate refresh occurred
         response.headers["X-Token-Refreshed"] = "true"
     
-    # Update last login time
-    user.last_login_at = datetime.utcnow()
-    db.commit()
+    # Update last login time, coalesced
+    record_activity(user, db)
     
     return user
 
-async def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
+async def get_current_user_record(
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ) -> User:
+    """Dependency returning the current user's row, for endpoints that change it."""
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    return user
+
+async def get_current_admin_user(
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> UserPrincipal:
     """Dependency to ensure the current user is an admin."""
     from app.models.user import UserRole
     
@@ -146,8 +181,8 @@ async def get_current_admin_user(
     return current_user
 
 async def get_current_admin_or_editor_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> UserPrincipal:
     """Dependency to ensure the current user is an admin or editor."""
     from app.models.user import UserRole
     
@@ -1,9 +1,44 @@
 from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
+import asyncio
 import secrets
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# Initialize Argon2id password hasher with the configured cost
+ph = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism
+)
+
+# Argon2 releases the GIL, so a small thread pool keeps hashing off the event
+# loop while capping how many cores logins can take from the data endpoints
+_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="argon2")
+_pending = 0
+_pending_lock = threading.Lock()
+
+QUEUE_WAIT = metrics.histogram("password_hash_queue_seconds")
+HASH_TIME = metrics.histogram("password_hash_duration_seconds")
+metrics.describe("password_hash_queue_seconds", "Time Argon2 jobs waited for a hashing thread")
+metrics.describe("password_hash_duration_seconds", "Argon2 hash and verify time")
+
+
+class PasswordHasherBusy(HTTPException):
+    """Raised when settings.password_hash_max_pending Argon2 jobs are already queued."""
+
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password checks in progress, try again shortly",
+            headers={"Retry-After": "1"}
+        )
 
-# Initialize Argon2id password hasher
-ph = PasswordHasher()
 
 def hash_password(password: str) -> str:
     """Hash a password using Argon2id."""
@@ -14,9 +49,46 @@ def verify_password(password: str, hashed_password: str) -> bool:
     try:
         ph.verify(hashed_password, password)
         return True
-    except VerifyMismatchError:
+    except (VerifyMismatchError, VerificationError, InvalidHashError):
         return False
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Whether a hash was made with different cost parameters than the current settings."""
+    try:
+        return ph.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+async def _run_bounded(function, *args):
+    """Run an Argon2 job on the hashing pool, recording queue and run time."""
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.password_hash_max_pending:
+            raise PasswordHasherBusy()
+        _pending += 1
+    submitted = time.perf_counter()
+
+    def timed():
+        started = QUEUE_WAIT.lap(submitted)
+        try:
+            return function(*args)
+        finally:
+            HASH_TIME.lap(started)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, timed)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the bounded hashing pool."""
+    return await _run_bounded(hash_password, password)
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """verify_password() on the bounded hashing pool."""
+    return await _run_bounded(verify_password, password, hashed_password)
+
 def generate_password(length: int = 16) -> str:
     """Generate a random password."""
     return secrets.token_urlsafe(length)
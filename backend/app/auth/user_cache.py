@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.config import settings
+from app.core.shared_generation import SharedGeneration, shared_generation
+from app.core.versioned_cache import VersionedTTLCache
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    The signed-in user as admin endpoints see it.
+
+    Carries the attributes endpoints read (and UserResponse serializes) but
+    no password hash; endpoints that change the user load the row with
+    get_current_user_record instead.
+    """
+    id: int
+    email: str
+    username: str
+    role: UserRole
+    created_at: Optional[datetime]
+    last_login_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            role=user.role,
+            created_at=user.created_at,
+            last_login_at=user.last_login_at
+        )
+
+
+class UserPrincipalCache(VersionedTTLCache[int, UserPrincipal]):
+    """
+    Resolved user principals keyed by user id, with a TTL.
+
+    Endpoints that change a user's role, profile or existence must call
+    invalidate_user() so the change applies to that user's next request in
+    every worker; the TTL is a backstop for changes made outside the app.
+    """
+
+    def __init__(self, ttl_seconds: float, shared: Optional[SharedGeneration] = None):
+        super().__init__(ttl_seconds, shared=shared)
+
+    def put(self, principal: UserPrincipal, version: Tuple[int, int]) -> None:
+        super().put(principal.id, principal, version)
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.invalidate(user_id)
+
+
+user_cache = UserPrincipalCache(
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    shared=shared_generation("users")
+)
@@ -7,6 +7,15 @@ class Settings(BaseSettings):
     project_root: str = os.path.expanduser("~/RPO_GenData")
     database_path: str = f"{project_root}/data/gendata.db"
     database_url: str = f"sqlite:///{database_path}"
+
+    # SQLite performance profile, applied to every new connection
+    sqlite_tuning: bool = True                   # False leaves SQLite's defaults in place
+    sqlite_journal_mode: str = "WAL"             # WAL lets readers run alongside a single writer
+    sqlite_synchronous: str = "NORMAL"           # NORMAL only fsyncs at WAL checkpoints
+    sqlite_mmap_size: int = 268435456            # Bytes of the database file to memory-map; 0 disables
+    sqlite_cache_size: int = -65536              # Page cache; negative values are KiB
+    sqlite_temp_store: str = "MEMORY"            # Temporary tables and indices
+    sqlite_busy_timeout_ms: int = 5000           # Wait for a lock instead of failing with "database is locked"
     
     # Security
     secret_key: str = "your-secret-key-change-this-in-production"
@@ -15,6 +24,13 @@ class Settings(BaseSettings):
     refresh_threshold_minutes: int = 10          # Refresh when 10 min left
     max_session_hours: int = 8                   # Maximum session duration
     activity_extension_minutes: int = 30         # Extend by 30 min on activity
+    user_cache_ttl_seconds: int = 30             # Backstop for role changes made outside the app
+    last_login_update_minutes: int = 15          # Admin activity refreshes last_login_at at most this often
+    argon2_time_cost: int = 3                    # Argon2id iterations; changing a cost rehashes on next login
+    argon2_memory_cost: int = 65536              # Argon2id memory in KiB
+    argon2_parallelism: int = 4                  # Argon2id lanes
+    password_hash_workers: int = 2               # Concurrent Argon2 jobs per worker process
+    password_hash_max_pending: int = 64          # Queued Argon2 jobs before logins get 503
     
     # API
     api_prefix: str = "/api"
@@ -23,10 +39,41 @@ class Settings(BaseSettings):
     # Server
     host: str = "0.0.0.0"
     port: int = 8088
+    server_reload: bool = False                  # Development only; forces a single worker
+    server_workers: int = 1                      # Worker processes; >1 needs counter_backend shared or database
+    cache_invalidation_path: str = ""            # Shared file publishing cache invalidations when server_workers > 1; empty picks /dev/shm or the temp dir
+    server_loop: str = "auto"                    # auto (uvloop when installed), uvloop or asyncio
+    server_http: str = "auto"                    # auto (httptools when installed), httptools or h11
+    server_backlog: int = 2048                   # Pending connections queued by the listening socket
+    server_keep_alive_seconds: int = 5           # Idle keep-alive connections are closed after this
+    server_graceful_shutdown_seconds: int = 30   # Wait for in-flight requests and streams on shutdown
+    server_limit_concurrency: Optional[int] = None  # Per-worker connection cap before answering 503
     
     # CORS
     backend_cors_origins: list = ["http://localhost:8088"]
-    
+
+    # Public data endpoint
+    plan_cache_ttl_seconds: int = 300            # Backstop for edits made outside the app; 0 disables
+    counter_flush_interval_seconds: float = 5.0  # Counter durability window; 0 writes on every request
+    counter_backend: str = "memory"              # memory (single worker), shared (workers on one host) or database
+    counter_shared_path: str = ""                # Memory-mapped counter file for "shared"; empty picks /dev/shm or the temp dir
+    counter_shared_capacity: int = 1048576       # Highest field id the shared counter file can hold
+    api_key_cache_size: int = 10000              # Resolved API keys kept in memory
+    api_key_cache_ttl_seconds: int = 60          # Backstop for key changes made outside the app
+    api_key_usage_flush_interval_seconds: float = 30.0  # last_used_at/request_count batching; 0 writes per request
+    request_accounting_flush_interval_seconds: float = 10.0  # Per-minute/day request rollups; 0 writes per request
+    request_accounting_retention_days: int = 7   # Per-minute rows older than this are pruned
+    batch_max_items: int = 500                   # Collections per /data/batch request
+    samples_max_count: int = 100000              # Records per /samples request
+    generator_backend: str = "auto"              # Bulk generation: auto, numpy or python
+    stream_min_interval_seconds: float = 0.1     # Fastest record rate a /stream client may request
+    stream_max_duration_seconds: int = 3600      # Streams end after this; clients reconnect and re-authenticate
+    spike_prewarm_seconds: float = 5.0           # Merge spike overrides this long before a schedule starts
+    spike_ticker_interval_seconds: float = 1.0   # How often cached plans are checked; 0 disables the ticker
+
+    # Observability
+    metrics_enabled: bool = True                 # Request/stage latency histograms and /api/metrics
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,229 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Bucket upper bounds in seconds; observations above the last bound land in +Inf
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Per-stage timings of the public data path
+PUBLIC_STAGE_SECONDS = "public_stage_duration_seconds"
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Counts live in a list allocated once, so observe() is a bisect and three
+    increments under a lock. Quantiles are estimated as the upper bound of the
+    bucket they fall in.
+    """
+
+    __slots__ = ("bounds", "counts", "total", "count", "_lock")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def lap(self, started: float) -> float:
+        """Observe the time since started and return now, for timing consecutive stages."""
+        now = time.perf_counter()
+        self.observe(now - started)
+        return now
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * len(self.counts)
+            self.total = 0.0
+            self.count = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts plus count, sum and estimated quantiles."""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.total
+            count = self.count
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.bounds + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {
+            "count": count,
+            "sum": total,
+            "buckets": cumulative,
+            "p50": self._quantile(cumulative, count, 0.50),
+            "p95": self._quantile(cumulative, count, 0.95),
+            "p99": self._quantile(cumulative, count, 0.99)
+        }
+
+    @staticmethod
+    def _quantile(cumulative: List[Tuple[float, int]], count: int, q: float) -> Optional[float]:
+        if not count:
+            return None
+        rank = q * count
+        for bound, running in cumulative:
+            if running >= rank:
+                return bound
+        return cumulative[-1][0]
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of named, labelled histograms.
+
+    Each worker process keeps its own registry and nothing aggregates them.
+    With several workers a scrape of /api/metrics or /api/admin/metrics is
+    answered by whichever worker accepts the connection, so it covers only
+    that worker's requests and successive scrapes may come from different
+    workers. Run a single worker when complete metrics matter.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], LatencyHistogram] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def histogram(self, name: str, **labels: str) -> LatencyHistogram:
+        """Return the histogram for name and labels, creating it on first use."""
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def reset(self) -> None:
+        """Zero every histogram; held references stay valid."""
+        for histogram in list(self._histograms.values()):
+            histogram.reset()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return every histogram with its labels and summary, for the admin API."""
+        series = []
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            snapshot = histogram.snapshot()
+            series.append({
+                "name": name,
+                "labels": dict(labels),
+                "count": snapshot["count"],
+                "sum_seconds": snapshot["sum"],
+                "p50_seconds": snapshot["p50"],
+                "p95_seconds": snapshot["p95"],
+                "p99_seconds": snapshot["p99"]
+            })
+        return series
+
+    def render_prometheus(self) -> str:
+        """Render every histogram in the Prometheus text exposition format."""
+        lines = []
+        described = set()
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            if name not in described:
+                described.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+            snapshot = histogram.snapshot()
+            for bound, running in snapshot["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {running}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {snapshot['sum']!r}")
+            lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency by method, route template and status class.
+
+    Routes are labelled by their path template, so label cardinality stays
+    bounded by the number of endpoints. Streaming responses are timed until
+    their last chunk is sent. Histograms are resolved once per route, method
+    and status class and kept in nested dicts, so a request only does
+    lookups.
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or metrics
+        # route path -> method -> histogram per status class (1xx..5xx at index 1..5)
+        self._histograms: Dict[str, Dict[str, List[Optional[LatencyHistogram]]]] = {}
+
+    def _histogram(self, method: str, route: str, status_class: int) -> LatencyHistogram:
+        by_method = self._histograms.get(route)
+        if by_method is None:
+            by_method = self._histograms.setdefault(route, {})
+        by_status = by_method.get(method)
+        if by_status is None:
+            by_status = by_method.setdefault(method, [None] * 6)
+        histogram = by_status[status_class]
+        if histogram is None:
+            histogram = self.registry.histogram(
+                "http_request_duration_seconds",
+                method=method,
+                route=route,
+                status=f"{status_class}xx"
+            )
+            by_status[status_class] = histogram
+        return histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self._histogram(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                min(max(status_code // 100, 1), 5)
+            ).observe(time.perf_counter() - started)
+
+
+metrics = MetricsRegistry()
+metrics.describe("http_request_duration_seconds", "HTTP request latency by route template")
+metrics.describe(PUBLIC_STAGE_SECONDS, "Time spent in each stage of the public data endpoints")
+
+
+def stage_histogram(stage: str) -> LatencyHistogram:
+    """Return the histogram for one stage of the public data path."""
+    return metrics.histogram(PUBLIC_STAGE_SECONDS, stage=stage)
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.write_behind import WriteBehindBuffer
+from app.models.request_count import RequestCountMinute, RequestCountDaily
+
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _increment_upsert(table, conflict_columns):
+    """INSERT rows, adding their count to any existing row with the same key."""
+    def build(dialect_name: str):
+        insert = _UPSERT_DIALECTS[dialect_name](table)
+        return insert.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={"count": table.c.count + insert.excluded.count}
+        )
+    return build
+
+
+class RequestAccounting(WriteBehindBuffer):
+    """
+    Counts public requests per API key, collection and type in memory.
+
+    Counters are spread over shards by API key so concurrent requests rarely
+    share a lock. Every flush interval the shards are swapped out and rolled
+    up into request_counts_minute and request_counts_daily with one upsert
+    each, so serving a request never writes to the database and the dashboard
+    reads at most a month of daily rows. Per-minute rows are pruned after
+    settings.request_accounting_retention_days.
+    """
+
+    thread_name = "request-accounting"
+
+    def __init__(self, flush_interval_seconds: float, session_factory=SessionLocal, shards: int = 16):
+        super().__init__(flush_interval_seconds, session_factory)
+        self._shards = [(threading.Lock(), Counter()) for _ in range(shards)]
+        self._upsert_minute = _increment_upsert(
+            RequestCountMinute.__table__,
+            ["bucket_start", "api_key_id", "collection_id", "collection_type"]
+        )
+        self._upsert_daily = _increment_upsert(RequestCountDaily.__table__, ["day"])
+        self._pruned_day: Optional[date] = None
+
+    def record(self, api_key_id: int, collection_id: int, collection_type: str, count: int = 1) -> None:
+        # Keyed by (epoch minute, api_key_id, collection_id, collection_type)
+        key = (int(time.time()) // 60, api_key_id, collection_id, collection_type)
+        lock, counts = self._shards[api_key_id % len(self._shards)]
+        with lock:
+            counts[key] += count
+
+    def reset(self) -> None:
+        """Drop all pending counts without persisting them."""
+        for lock, counts in self._shards:
+            with lock:
+                counts.clear()
+
+    def _drain(self) -> Counter:
+        drained = Counter()
+        for index, (lock, counts) in enumerate(self._shards):
+            with lock:
+                if counts:
+                    self._shards[index] = (lock, Counter())
+                    drained.update(counts)
+        return drained
+
+    def _restore(self, drained: Counter) -> None:
+        for key, count in drained.items():
+            lock, counts = self._shards[key[1] % len(self._shards)]
+            with lock:
+                counts[key] += count
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Roll pending counts into the aggregate tables and return how many minute rows were written."""
+        drained = self._drain()
+        if not drained:
+            return 0
+
+        minute_rows = []
+        daily = Counter()
+        for (minute, api_key_id, collection_id, collection_type), count in drained.items():
+            bucket_start = datetime.fromtimestamp(minute * 60, timezone.utc).replace(tzinfo=None)
+            minute_rows.append({
+                "bucket_start": bucket_start,
+                "api_key_id": api_key_id,
+                "collection_id": collection_id,
+                "collection_type": collection_type,
+                "count": count
+            })
+            daily[bucket_start.date()] += count
+        daily_rows = [{"day": day, "count": count} for day, count in daily.items()]
+
+        session = db if db is not None else self.session_factory()
+        try:
+            dialect_name = session.get_bind().dialect.name
+            session.execute(self._upsert_minute(dialect_name), minute_rows)
+            session.execute(self._upsert_daily(dialect_name), daily_rows)
+            self._prune(session)
+            if db is None:
+                session.commit()
+        except Exception:
+            if db is None:
+                session.rollback()
+            # Merge the failed batch back so the next flush retries it
+            self._restore(drained)
+            raise
+        finally:
+            if db is None:
+                session.close()
+        return len(minute_rows)
+
+    def _prune(self, session: Session) -> None:
+        """Delete expired per-minute rows, at most once per day per process."""
+        today = datetime.now(timezone.utc).date()
+        if self._pruned_day == today:
+            return
+        cutoff = datetime.combine(today - timedelta(days=settings.request_accounting_retention_days), datetime.min.time())
+        session.execute(delete(RequestCountMinute).where(RequestCountMinute.bucket_start < cutoff))
+        self._pruned_day = today
+
+
+def request_totals(db: Session, today: Optional[date] = None) -> Dict[str, int]:
+    """Return requests counted today and this month (UTC) from the daily rollup."""
+    today = today or datetime.now(timezone.utc).date()
+    month_start = today.replace(day=1)
+    total_today, total_month = db.execute(
+        select(
+            func.coalesce(func.sum(RequestCountDaily.count).filter(RequestCountDaily.day == today), 0),
+            func.coalesce(func.sum(RequestCountDaily.count), 0)
+        ).where(RequestCountDaily.day >= month_start, RequestCountDaily.day <= today)
+    ).one()
+    return {"today": total_today, "month": total_month}
+
+
+request_accounting = RequestAccounting(flush_interval_seconds=settings.request_accounting_flush_interval_seconds)
@@ -0,0 +1,85 @@
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # POSIX only; caches fall back to their TTL elsewhere
+    fcntl = None
+
+# One generation counter per cache, at a fixed index in the shared file
+SLOTS = {"plans": 0, "api_keys": 1, "users": 2}
+COUNTER = struct.Struct("<Q")
+FILE_SIZE = 64
+
+
+class SharedGeneration:
+    """
+    An invalidation counter in a small memory-mapped file shared by every worker on a host.
+
+    A worker bumps the counter after invalidating its own cache entries, and
+    the other workers drop their entries when they see it change, so admin
+    edits apply to every worker on their next request rather than when the
+    cached entries expire.
+    """
+
+    def __init__(self, path: str, index: int):
+        self.path = path
+        self.offset = index * COUNTER.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Whole-file lock so only one worker sizes the file
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < FILE_SIZE:
+                os.ftruncate(self._fd, FILE_SIZE)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, FILE_SIZE)
+        self._lock = threading.Lock()
+
+    def read(self) -> int:
+        return COUNTER.unpack_from(self._map, self.offset)[0]
+
+    def bump(self) -> int:
+        """Increment the counter and return its previous value."""
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, COUNTER.size, self.offset)
+            try:
+                previous = self.read()
+                COUNTER.pack_into(self._map, self.offset, previous + 1)
+                return previous
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, COUNTER.size, self.offset)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+def shared_generation_path() -> str:
+    """Return settings.cache_invalidation_path, defaulting to a file in /dev/shm when it exists."""
+    if settings.cache_invalidation_path:
+        return settings.cache_invalidation_path
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"rpo-gendata-caches-{settings.port}")
+
+
+_generations: Dict[str, SharedGeneration] = {}
+
+
+def shared_generation(name: str) -> Optional[SharedGeneration]:
+    """
+    Return the shared invalidation counter for a cache when several workers
+    run, or None for a single worker (or off POSIX), where in-process
+    invalidation is already complete.
+    """
+    if settings.server_workers <= 1 or fcntl is None:
+        return None
+    if name not in _generations:
+        _generations[name] = SharedGeneration(shared_generation_path(), SLOTS[name])
+    return _generations[name]
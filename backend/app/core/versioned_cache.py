@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from app.core.shared_generation import SharedGeneration
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class VersionedTTLCache(Generic[K, V]):
+    """
+    Thread-safe TTL cache whose fills cannot undo a racing invalidation.
+
+    Callers that miss snapshot `version` before loading from the database
+    and pass it to put(); every invalidation bumps the version, so a value
+    loaded before an invalidation finished is dropped instead of stored.
+    With max_size set, the least recently used entries are evicted.
+
+    With a SharedGeneration, invalidations also bump a counter shared by the
+    worker processes on the host; a worker that sees it change drops all its
+    entries, so other workers' edits apply on the next lookup instead of
+    after the TTL.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_size: Optional[int] = None,
+        shared: Optional[SharedGeneration] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.shared = shared
+        self._entries: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._seen_generation = shared.read() if shared is not None else 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and (self.max_size is None or self.max_size > 0)
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """Snapshot before loading a value and pass it to put()."""
+        return self._version, self._generation()
+
+    def _generation(self) -> int:
+        return self.shared.read() if self.shared is not None else 0
+
+    def _sync(self) -> None:
+        """Drop everything if another worker invalidated; callers hold self._lock."""
+        generation = self._generation()
+        if generation != self._seen_generation:
+            self._seen_generation = generation
+            self._version += 1
+            self._entries.clear()
+
+    def _invalidated(self) -> None:
+        """Publish a local invalidation to other workers; callers hold self._lock."""
+        self._version += 1
+        if self.shared is None:
+            return
+        previous = self.shared.bump()
+        if previous != self._seen_generation:
+            # Another worker invalidated too and this one had not seen it yet
+            self._entries.clear()
+        self._seen_generation = previous + 1
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            self._sync()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, loaded_at = entry
+            if time.monotonic() - loaded_at >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            if self.max_size is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V, version: Tuple[int, int]) -> None:
+        self.put_many({key: value}, version)
+
+    def put_many(self, values: Dict[K, V], version: Tuple[int, int]) -> None:
+        if not values or not self.enabled:
+            return
+        loaded_at = time.monotonic()
+        with self._lock:
+            self._sync()
+            # Skip storing values that an invalidation here or in another worker raced with while loading
+            if version != (self._version, self._seen_generation):
+                return
+            for key, value in values.items():
+                self._entries[key] = (value, loaded_at)
+                self._entries.move_to_end(key)
+            if self.max_size is not None:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def values(self) -> List[V]:
+        """Snapshot of the cached values, including expired ones not yet evicted."""
+        with self._lock:
+            self._sync()
+            return [value for value, _ in self._entries.values()]
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._invalidated()
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[V], bool]) -> None:
+        """Drop every entry whose value matches predicate."""
+        with self._lock:
+            self._invalidated()
+            for key in [k for k, (value, _) in self._entries.items() if predicate(value)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidated()
+            self._entries.clear()
@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from typing import List
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -9,9 +11,50 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
 )
 
+def sqlite_pragmas() -> List[str]:
+    """PRAGMA statements for the configured SQLite performance profile."""
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        f"PRAGMA cache_size={int(settings.sqlite_cache_size)}",
+        f"PRAGMA temp_store={settings.sqlite_temp_store}",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}"
+    ]
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Connect event listener that applies the SQLite performance profile."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+if "sqlite" in settings.database_url and settings.sqlite_tuning:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_url(database_url: str) -> str:
+    """Map a database URL to its asyncio driver (aiosqlite or asyncpg)."""
+    for prefix, async_prefix in [
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://")
+    ]:
+        if database_url.startswith(prefix):
+            return async_prefix + database_url[len(prefix):]
+    return database_url
+
+# Async engine for the public data endpoints; admin endpoints still use the sync session
+async_engine = create_async_engine(async_database_url(settings.database_url))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+if "sqlite" in settings.database_url and settings.sqlite_tuning:
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -23,6 +66,11 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def create_tables():
     """Create all tables in the database"""
     from app.models.user import User
@@ -0,0 +1,83 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from sqlalchemy.types import DateTime
+
+# Response header carrying the cursor for the next page, absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode the sort key of the last row on a page as an opaque URL-safe cursor."""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column) -> Tuple[Any, int]:
+    """Decode a cursor from encode_cursor(), raising 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        column_type = getattr(sort_column.type, "impl", sort_column.type)
+        if isinstance(column_type, DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_page(
+    query: Query,
+    sort_column,
+    id_column,
+    response: Response,
+    descending: bool = False,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    entity: Callable[[Any], Any] = lambda row: row
+) -> List[Any]:
+    """
+    Order query by (sort_column, id_column) and return the page after cursor.
+
+    Pages continue from the last row's sort key rather than an OFFSET, so
+    each page costs an index range scan however deep the client has paged.
+    When more rows follow, the next cursor is set in the X-Next-Cursor
+    header. Without a limit every remaining row is returned. sort_column
+    must not be nullable; entity maps a result row to the mapped object
+    carrying both columns.
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_column)
+        if sort_column is id_column:
+            after = id_column < last_id if descending else id_column > last_id
+        elif descending:
+            after = or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < last_id))
+        else:
+            after = or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > last_id))
+        query = query.filter(after)
+
+    ordering = [sort_column] if sort_column is id_column else [sort_column, id_column]
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in ordering])
+    if limit is None:
+        return query.all()
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = entity(rows[-1])
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return rows
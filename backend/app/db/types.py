@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.types import DateTime, TypeDecorator
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Return an aware UTC datetime; naive values are taken to be UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    DateTime that always binds and loads aware UTC values.
+
+    SQLite drops the UTC offset when storing a datetime, so an aware value in
+    another zone would be saved as its local wall time and read back naive.
+    Converting to UTC on the way in keeps stored values and query parameters
+    comparable, and loading them aware spares callers the naive/aware checks.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return as_utc(value)
+
+    def process_result_value(self, value, dialect):
+        return as_utc(value)
@@ -0,0 +1,81 @@
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer(ABC):
+    """
+    Base class for in-memory state that a background thread persists in batches.
+
+    Subclasses implement flush(). A flush interval of 0 disables the thread;
+    callers are then expected to flush with their request session.
+    """
+
+    thread_name = "write-behind"
+    # True when flush() ignores the caller's session and may wait on other
+    # processes; request-path callers then run it in a thread
+    flush_blocking = False
+
+    def __init__(self, flush_interval_seconds: float, session_factory=SessionLocal):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.session_factory = session_factory
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def write_through(self) -> bool:
+        """A zero interval persists at the end of every request."""
+        return self.flush_interval_seconds <= 0
+
+    @abstractmethod
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Persist pending state and return the number of rows written."""
+
+    def _execute(self, statement, params: list, db: Optional[Session]) -> None:
+        """
+        Run a batched statement.
+
+        With a session the statement joins the caller's transaction; otherwise a
+        dedicated session is opened and committed.
+        """
+        if db is not None:
+            db.execute(statement, params)
+            return
+        session = self.session_factory()
+        try:
+            session.execute(statement, params)
+            session.commit()
+        finally:
+            session.close()
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self.write_through or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and persist any remaining state."""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to persist {self.thread_name} state at shutdown: {e}")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush {self.thread_name} state: {e}")
@@ -0,0 +1,400 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.write_behind import WriteBehindBuffer
+from app.models.field import Field
+from app.generators.field_spec import FieldConfig
+from app.generators.value_generator import ValueGenerator
+
+try:
+    import fcntl
+except ImportError:  # POSIX only; the shared backend is unavailable elsewhere
+    fcntl = None
+
+_MISSING = object()
+
+# Batched checkpoint of counter state, executed with field_id/current_number rows
+CURRENT_NUMBER_UPDATE = (
+    update(Field.__table__)
+    .where(Field.__table__.c.id == bindparam("field_id"))
+    .values(current_number=bindparam("current_number"))
+)
+
+
+class CounterEngine(WriteBehindBuffer):
+    """
+    In-memory INCREMENT/DECREMENT state with periodic write-behind to the fields table.
+
+    State is keyed by the original field id, which keeps the original field the
+    single source of truth even while a spike schedule overrides its step or
+    reset values. Dirty counters are written to Field.current_number in one
+    batched UPDATE every flush interval and at shutdown, so up to one interval
+    of counter progress can be lost on a crash. The state is per process: run a
+    single worker when using this engine, or AtomicCounterEngine otherwise.
+    """
+
+    blocking = False
+    thread_name = "counter-write-behind"
+
+    def __init__(self, flush_interval_seconds: float, session_factory=SessionLocal):
+        super().__init__(flush_interval_seconds, session_factory)
+        self._state: Dict[int, Optional[float]] = {}
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    def advance(self, field: FieldConfig) -> float:
+        """
+        Return the next value for a counter field and advance its state atomically.
+
+        field.current_number seeds the state the first time this process sees the field.
+        """
+        return self.advance_many(field, 1)[0]
+
+    def advance_many(self, field: FieldConfig, count: int, generator=ValueGenerator) -> List[float]:
+        """
+        Return the next count values for a counter field, storing only the final state.
+
+        generator supplies advance_counter_many(); see app.generators.vectorized.
+        """
+        with self._lock:
+            current_number = self._state.get(field.id, _MISSING)
+            if current_number is _MISSING:
+                current_number = field.current_number
+            values, self._state[field.id] = generator.advance_counter_many(field, current_number, count)
+            self._dirty.add(field.id)
+        return values
+
+    def discard(self, field_ids: Iterable[int]) -> None:
+        """Forget state for deleted fields so a reused id starts from the database."""
+        with self._lock:
+            for field_id in field_ids:
+                self._state.pop(field_id, None)
+                self._dirty.discard(field_id)
+
+    def reset(self) -> None:
+        """Drop all state without persisting it."""
+        with self._lock:
+            self._state.clear()
+            self._dirty.clear()
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Write dirty counters to the database and return how many were written."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            pending = [
+                {"field_id": field_id, "current_number": self._state[field_id]}
+                for field_id in self._dirty
+            ]
+            self._dirty = set()
+
+        try:
+            self._execute(CURRENT_NUMBER_UPDATE, pending, db)
+        except Exception:
+            # Keep the counters dirty so the next flush retries them
+            with self._lock:
+                self._dirty.update(
+                    p["field_id"] for p in pending if p["field_id"] in self._state
+                )
+            raise
+        return len(pending)
+
+
+class SharedCounterEngine(WriteBehindBuffer):
+    """
+    INCREMENT/DECREMENT state in a memory-mapped file shared by every worker on a host.
+
+    The file holds one fixed-size slot per field id. A slot is advanced under
+    a POSIX record lock covering just that slot (plus a lock for this process's
+    threads), so workers serialize per field rather than per table and never
+    touch the database to count. Each worker checkpoints the slots it advanced
+    to Field.current_number every flush interval and at shutdown, like
+    CounterEngine. The header records which database the state belongs to; a
+    file written for another database is reset on open. Field ids above
+    capacity cannot be counted and raise a RuntimeError naming the setting.
+    """
+
+    thread_name = "counter-checkpoint"
+    blocking = False
+    flush_blocking = True
+
+    MAGIC = b"RPOCNT01"
+    HEADER = struct.Struct("<8s32s")
+    HEADER_SIZE = 64
+    # Byte in the header's padding locked while a worker checkpoints
+    CHECKPOINT_LOCK_OFFSET = 63
+    # Slot state byte, then the counter value
+    SLOT = struct.Struct("<B7xd")
+    UNSEEDED, NULL, SET = 0, 1, 2
+
+    def __init__(
+        self,
+        flush_interval_seconds: float,
+        path: str,
+        capacity: int,
+        namespace: str,
+        session_factory=SessionLocal
+    ):
+        if fcntl is None:
+            raise RuntimeError("counter_backend 'shared' requires a POSIX platform")
+        super().__init__(flush_interval_seconds, session_factory)
+        self.path = path
+        self.capacity = capacity
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._map = self._open_map(hashlib.sha256(namespace.encode()).digest())
+
+    def _open_map(self, identity: bytes) -> mmap.mmap:
+        size = self.HEADER_SIZE + self.capacity * self.SLOT.size
+        # Whole-file lock so only one worker initializes the file
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, self.HEADER.size, 0)
+            if os.fstat(self._fd).st_size != size or header != self.HEADER.pack(self.MAGIC, identity):
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, identity), 0)
+            return mmap.mmap(self._fd, size)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _has_slot(self, field_id: int) -> bool:
+        return 0 < field_id <= self.capacity
+
+    def _offset(self, field_id: int) -> int:
+        if not self._has_slot(field_id):
+            raise RuntimeError(
+                f"Counter field {field_id} exceeds counter_shared_capacity ({self.capacity}); "
+                "raise COUNTER_SHARED_CAPACITY above the highest field id or use COUNTER_BACKEND=database"
+            )
+        return self.HEADER_SIZE + (field_id - 1) * self.SLOT.size
+
+    def _read_slot(self, offset: int):
+        """Return a slot's counter state, or _MISSING if no worker has seeded it."""
+        state, value = self.SLOT.unpack_from(self._map, offset)
+        if state == self.UNSEEDED:
+            return _MISSING
+        return None if state == self.NULL else value
+
+    def _write_slot(self, offset: int, value: Optional[float]) -> None:
+        if value is None:
+            self.SLOT.pack_into(self._map, offset, self.NULL, 0.0)
+        else:
+            self.SLOT.pack_into(self._map, offset, self.SET, value)
+
+    @contextmanager
+    def _locked_slot(self, offset: int):
+        """Hold one slot against other processes; callers hold self._lock."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self.SLOT.size, offset)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.SLOT.size, offset)
+
+    @contextmanager
+    def _checkpointing(self):
+        """Hold the checkpoint against this process's other threads and other workers."""
+        with self._checkpoint_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, self.CHECKPOINT_LOCK_OFFSET)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, self.CHECKPOINT_LOCK_OFFSET)
+
+    def advance(self, field: FieldConfig) -> float:
+        """
+        Return the next value for a counter field and advance its shared state.
+
+        field.current_number seeds the slot the first time any worker sees the field.
+        """
+        return self.advance_many(field, 1)[0]
+
+    def advance_many(self, field: FieldConfig, count: int, generator=ValueGenerator) -> List[float]:
+        """Return the next count values for a counter field, storing only the final state."""
+        offset = self._offset(field.id)
+        with self._lock, self._locked_slot(offset):
+            current_number = self._read_slot(offset)
+            if current_number is _MISSING:
+                current_number = field.current_number
+            values, next_number = generator.advance_counter_many(field, current_number, count)
+            self._write_slot(offset, next_number)
+            self._dirty.add(field.id)
+        return values
+
+    def discard(self, field_ids: Iterable[int]) -> None:
+        """Forget state for deleted fields in every worker so a reused id starts from the database."""
+        with self._lock:
+            for field_id in field_ids:
+                if not self._has_slot(field_id):
+                    # Never counted here, so there is nothing to forget
+                    continue
+                offset = self._offset(field_id)
+                with self._locked_slot(offset):
+                    self.SLOT.pack_into(self._map, offset, self.UNSEEDED, 0.0)
+                self._dirty.discard(field_id)
+
+    def reset(self) -> None:
+        """Drop all state without persisting it."""
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                self._map[self.HEADER_SIZE:] = bytes(len(self._map) - self.HEADER_SIZE)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+            self._dirty.clear()
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """
+        Write the shared state of counters this worker advanced and return how many were written.
+
+        Workers checkpoint one at a time and commit before releasing the
+        checkpoint lock, so a worker that read a slot earlier can never
+        commit its older value over a newer checkpoint from another worker.
+        The UPDATE therefore always commits in its own session; db is not
+        used, and write-through requests run this in a thread (flush_blocking).
+        """
+        with self._checkpointing():
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                pending = []
+                for field_id in self._dirty:
+                    offset = self._offset(field_id)
+                    with self._locked_slot(offset):
+                        current_number = self._read_slot(offset)
+                    if current_number is not _MISSING:
+                        pending.append({"field_id": field_id, "current_number": current_number})
+                flushed, self._dirty = self._dirty, set()
+
+            try:
+                if pending:
+                    self._execute(CURRENT_NUMBER_UPDATE, pending, None)
+            except Exception:
+                # Keep the counters dirty so the next flush retries them
+                with self._lock:
+                    self._dirty.update(flushed)
+                raise
+        return len(pending)
+
+    def close(self) -> None:
+        """Unmap the counter file; its state stays on disk for the other workers."""
+        self._map.close()
+        os.close(self._fd)
+
+
+def shared_counter_path() -> str:
+    """Return settings.counter_shared_path, defaulting to a file in /dev/shm when it exists."""
+    if settings.counter_shared_path:
+        return settings.counter_shared_path
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"rpo-gendata-counters-{settings.port}")
+
+
+class AtomicCounterEngine:
+    """
+    INCREMENT/DECREMENT state kept only in Field.current_number.
+
+    Each advance reads the stored value, computes the next state with the same
+    reset rules as ValueGenerator and writes it back with a compare-and-swap
+    UPDATE that only matches if the stored value is unchanged, retrying when
+    another thread or worker process got there first. Every worker therefore
+    emits one shared sequence without a lock, at the cost of a committed write
+    per request. The method signatures match CounterEngine so either can back
+    counter_engine.
+    """
+
+    # Advances do database I/O, so async callers should run them in a thread
+    blocking = True
+    write_through = False
+
+    def __init__(self, session_factory=SessionLocal, max_attempts: int = 100):
+        self.session_factory = session_factory
+        self.max_attempts = max_attempts
+
+    def advance(self, field: FieldConfig) -> float:
+        """Return the next value for a counter field and store the following state."""
+        return self.advance_many(field, 1)[0]
+
+    def advance_many(self, field: FieldConfig, count: int, generator=ValueGenerator) -> List[float]:
+        """Return the next count values for a counter field, storing only the final state."""
+        table = Field.__table__
+        session = self.session_factory()
+        try:
+            for _ in range(self.max_attempts):
+                try:
+                    row = session.execute(
+                        select(table.c.current_number).where(table.c.id == field.id)
+                    ).first()
+                    if row is None:
+                        raise ValueError(f"Counter field {field.id} no longer exists")
+                    current_number = row.current_number
+                    values, next_number = generator.advance_counter_many(field, current_number, count)
+                    # IS NULL for an unset counter, equality otherwise
+                    unchanged = (
+                        table.c.current_number.is_(None) if current_number is None
+                        else table.c.current_number == current_number
+                    )
+                    result = session.execute(
+                        update(table)
+                        .where(table.c.id == field.id, unchanged)
+                        .values(current_number=next_number)
+                    )
+                    if result.rowcount == 1:
+                        session.commit()
+                        return values
+                    session.rollback()
+                except OperationalError:
+                    # SQLite refuses to upgrade a read snapshot that another
+                    # writer has moved past; start over from a fresh read
+                    session.rollback()
+            raise RuntimeError(f"Counter field {field.id} is too contended to advance")
+        finally:
+            session.close()
+
+    def discard(self, field_ids: Iterable[int]) -> None:
+        """Nothing is cached per field."""
+
+    def reset(self) -> None:
+        """Nothing is cached per field."""
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Every advance is already committed."""
+        return 0
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+def create_counter_engine(backend: str):
+    """Return the counter engine selected by settings.counter_backend."""
+    if backend == "database":
+        return AtomicCounterEngine()
+    if backend == "shared":
+        return SharedCounterEngine(
+            flush_interval_seconds=settings.counter_flush_interval_seconds,
+            path=shared_counter_path(),
+            capacity=settings.counter_shared_capacity,
+            namespace=settings.database_url
+        )
+    if backend == "memory":
+        return CounterEngine(flush_interval_seconds=settings.counter_flush_interval_seconds)
+    raise ValueError(f"Unknown counter_backend: {backend!r}")
+
+
+counter_engine = create_counter_engine(settings.counter_backend)
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Union
+
+from app.models.field import Field, ValueType
+
+# Field types whose numeric settings a spike schedule may override
+SPIKE_EDITABLE_TYPES = (
+    ValueType.NUMBER_FIXED, ValueType.FLOAT_FIXED,
+    ValueType.NUMBER_RANGE, ValueType.FLOAT_RANGE,
+    ValueType.INCREMENT, ValueType.DECREMENT
+)
+
+# Attributes copied from a spike schedule field when it sets them
+SPIKE_OVERRIDE_ATTRIBUTES = (
+    "fixed_value_number", "fixed_value_float",
+    "range_start_number", "range_end_number",
+    "range_start_float", "range_end_float", "float_precision",
+    "start_number", "step_number", "reset_number",
+    "randomization_percentage"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class FieldSpec:
+    """
+    Immutable generation settings for one field.
+
+    Plans hold FieldSpecs instead of ORM instances so generating a record
+    allocates nothing tracked by a session. current_number is the persisted
+    counter state when the plan was loaded; live counter state is kept by
+    the counter engine under the field id.
+    """
+    id: int
+    field_name: str
+    value_type: ValueType
+    fixed_value_text: Optional[str] = None
+    fixed_value_number: Optional[int] = None
+    fixed_value_float: Optional[float] = None
+    range_start_number: Optional[int] = None
+    range_end_number: Optional[int] = None
+    range_start_float: Optional[float] = None
+    range_end_float: Optional[float] = None
+    float_precision: Optional[int] = None
+    start_number: Optional[float] = None
+    step_number: Optional[float] = None
+    reset_number: Optional[float] = None
+    current_number: Optional[float] = None
+    randomization_percentage: Optional[float] = None
+
+    @classmethod
+    def from_field(cls, field: Field) -> "FieldSpec":
+        return cls(**{name: getattr(field, name) for name in cls.__dataclass_fields__})
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> "FieldSpec":
+        """Return this spec with a spike schedule's overrides applied."""
+        if not overrides or self.value_type not in SPIKE_EDITABLE_TYPES:
+            return self
+        # The id, and so the counter state, stays the original field's
+        return replace(self, **overrides)
+
+
+def spike_overrides(spike_field) -> Dict[str, Any]:
+    """Collect the attributes a spike schedule field sets."""
+    return {
+        name: getattr(spike_field, name)
+        for name in SPIKE_OVERRIDE_ATTRIBUTES
+        if getattr(spike_field, name) is not None
+    }
+
+
+# Anything ValueGenerator can generate from
+FieldConfig = Union[Field, FieldSpec]
@@ -0,0 +1,258 @@
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field as dataclass_field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.shared_generation import SharedGeneration, shared_generation
+from app.core.versioned_cache import VersionedTTLCache
+from app.models.collection import Collection
+from app.models.field import Field, CollectionType, ValueType
+from app.models.spike_schedule import SpikeSchedule
+from app.models.spike_schedule_field import SpikeScheduleField
+from app.generators.field_spec import FieldSpec, spike_overrides
+from app.generators.record_template import RecordTemplate, build_record_template
+
+COUNTER_TYPES = (ValueType.INCREMENT, ValueType.DECREMENT)
+
+
+@dataclass
+class SpikeOverlay:
+    """A spike schedule window and its field overrides for one collection type."""
+    schedule_id: int
+    start_datetime: datetime
+    end_datetime: datetime
+    # original field id -> attributes the schedule overrides
+    spike_fields: Dict[int, Dict[str, Any]] = dataclass_field(default_factory=dict)
+    _effective_fields: Optional[List[FieldSpec]] = dataclass_field(default=None, repr=False)
+
+    def is_active(self, now: datetime) -> bool:
+        return self.start_datetime <= now <= self.end_datetime
+
+    @property
+    def compiled(self) -> bool:
+        return self._effective_fields is not None
+
+    def effective_fields(self, fields: List[FieldSpec]) -> List[FieldSpec]:
+        """
+        The plan's fields with this schedule's overrides applied.
+
+        The merge normally happens ahead of start_datetime (see
+        app.generators.spike_ticker); otherwise it happens on first use.
+        """
+        effective_fields = self._effective_fields
+        if effective_fields is None:
+            effective_fields = self._effective_fields = [
+                f.with_overrides(self.spike_fields.get(f.id)) for f in fields
+            ]
+        return effective_fields
+
+    def release(self) -> None:
+        """Drop the merged specs once the schedule has ended."""
+        self._effective_fields = None
+
+
+class SpikeTimeline:
+    """
+    Interval index over a collection's spike overlays.
+
+    The start and end times split the timeline into boundary points and the
+    open gaps between them. The winning overlay for each is precomputed, so a
+    lookup is a single bisect. Where overlays overlap, the one that started
+    first wins, as with a scan of overlays sorted by start time.
+    """
+
+    def __init__(self, overlays: List[SpikeOverlay]):
+        overlays = sorted(overlays, key=lambda o: (o.start_datetime, o.schedule_id))
+        self.boundaries = sorted({o.start_datetime for o in overlays} | {o.end_datetime for o in overlays})
+        # at_boundary[i] is active at boundaries[i]; after_boundary[i] until boundaries[i + 1]
+        self.at_boundary: List[Optional[SpikeOverlay]] = []
+        self.after_boundary: List[Optional[SpikeOverlay]] = []
+        for i, boundary in enumerate(self.boundaries):
+            self.at_boundary.append(next((o for o in overlays if o.is_active(boundary)), None))
+            if i + 1 < len(self.boundaries):
+                gap_end = self.boundaries[i + 1]
+                self.after_boundary.append(next(
+                    (o for o in overlays if o.start_datetime <= boundary and o.end_datetime >= gap_end), None
+                ))
+            else:
+                self.after_boundary.append(None)
+
+    def active_at(self, now: datetime) -> Optional[SpikeOverlay]:
+        i = bisect_right(self.boundaries, now) - 1
+        if i < 0:
+            return None
+        if self.boundaries[i] == now:
+            return self.at_boundary[i]
+        return self.after_boundary[i]
+
+
+@dataclass
+class GenerationPlan:
+    """Resolved configuration needed to generate data for a collection type."""
+    collection_id: int
+    collection_name: str
+    owner_id: int
+    collection_type: CollectionType
+    fields: List[FieldSpec]
+    spike_overlays: List[SpikeOverlay]
+    loaded_at: float
+    spike_timeline: SpikeTimeline = dataclass_field(init=False, repr=False)
+    # spike schedule id (None for the base fields) -> response template
+    _templates: Dict[Optional[int], RecordTemplate] = dataclass_field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.spike_timeline = SpikeTimeline(self.spike_overlays)
+
+    def record_template(self, overlay: Optional[SpikeOverlay] = None) -> RecordTemplate:
+        """Response template for the base fields or an overlay's effective fields, built on first use."""
+        key = overlay.schedule_id if overlay is not None else None
+        template = self._templates.get(key)
+        if template is None:
+            fields = overlay.effective_fields(self.fields) if overlay is not None else self.fields
+            template = self._templates[key] = build_record_template(
+                self.collection_name, self.collection_type.value, fields
+            )
+        return template
+
+    def release_overlay(self, overlay: SpikeOverlay) -> None:
+        """Drop an ended overlay's merged specs and template."""
+        overlay.release()
+        self._templates.pop(overlay.schedule_id, None)
+
+    @property
+    def counter_field_ids(self) -> List[int]:
+        return [f.id for f in self.fields if f.value_type in COUNTER_TYPES]
+
+    def active_spike(self, now: datetime) -> Optional[SpikeOverlay]:
+        return self.spike_timeline.active_at(now)
+
+
+def load_generation_plans(
+    db: Session, keys: Iterable[Tuple[str, CollectionType]]
+) -> Dict[Tuple[str, CollectionType], GenerationPlan]:
+    """
+    Load generation plans for several (collection name, collection type) pairs.
+
+    Each table is read with a single IN query regardless of the number of keys.
+    Keys whose collection does not exist are missing from the result.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    collections = {
+        c.name: c for c in db.query(Collection).filter(Collection.name.in_({name for name, _ in keys})).all()
+    }
+    if not collections:
+        return {}
+    collection_ids = [c.id for c in collections.values()]
+    collection_types = {collection_type for _, collection_type in keys}
+
+    fields: Dict[Tuple[int, CollectionType], List[FieldSpec]] = {}
+    for f in db.query(Field).filter(
+        Field.collection_id.in_(collection_ids),
+        Field.collection_type.in_(collection_types)
+    ).order_by(Field.id).all():
+        fields.setdefault((f.collection_id, f.collection_type), []).append(FieldSpec.from_field(f))
+
+    # Expired schedules can never become active again without an admin edit,
+    # which invalidates the plan
+    schedules = db.query(SpikeSchedule).filter(
+        SpikeSchedule.collection_id.in_(collection_ids),
+        SpikeSchedule.end_datetime >= datetime.now(timezone.utc)
+    ).all()
+    spike_fields: Dict[Tuple[int, CollectionType], Dict[int, Dict[str, Any]]] = {}
+    if schedules:
+        for sf in db.query(SpikeScheduleField).filter(
+            SpikeScheduleField.spike_schedule_id.in_([s.id for s in schedules]),
+            SpikeScheduleField.collection_type.in_(collection_types)
+        ).all():
+            spike_fields.setdefault((sf.spike_schedule_id, sf.collection_type), {})[sf.original_field_id] = spike_overrides(sf)
+
+    plans = {}
+    loaded_at = time.monotonic()
+    # Overlays that are active or about to start are merged as part of loading
+    compile_before = datetime.now(timezone.utc) + timedelta(seconds=settings.spike_prewarm_seconds)
+    for name, collection_type in keys:
+        collection = collections.get(name)
+        if collection is None:
+            continue
+        overlays = [
+            SpikeOverlay(
+                schedule_id=s.id,
+                start_datetime=s.start_datetime,
+                end_datetime=s.end_datetime,
+                spike_fields=spike_fields.get((s.id, collection_type), {})
+            )
+            for s in schedules if s.collection_id == collection.id
+        ]
+        plans[(name, collection_type)] = GenerationPlan(
+            collection_id=collection.id,
+            collection_name=collection.name,
+            owner_id=collection.owner_id,
+            collection_type=collection_type,
+            fields=fields.get((collection.id, collection_type), []),
+            spike_overlays=sorted(overlays, key=lambda o: (o.start_datetime, o.schedule_id)),
+            loaded_at=loaded_at
+        )
+        plan = plans[(name, collection_type)]
+        for overlay in plan.spike_overlays:
+            if overlay.start_datetime <= compile_before:
+                plan.record_template(overlay)
+    return plans
+
+
+class GenerationPlanCache(VersionedTTLCache[Tuple[str, CollectionType], GenerationPlan]):
+    """
+    In-process cache of generation plans keyed by (collection name, collection type).
+
+    Admin endpoints that mutate a collection, its fields or its spike schedules
+    must call invalidate_collection() so the next poll, in any worker,
+    recompiles the plan.
+    """
+
+    def __init__(self, ttl_seconds: float, shared: Optional[SharedGeneration] = None):
+        super().__init__(ttl_seconds, shared=shared)
+
+    async def get(
+        self, db: AsyncSession, collection_name: str, collection_type: CollectionType
+    ) -> Optional[GenerationPlan]:
+        key = (collection_name, collection_type)
+        return (await self.get_many(db, [key])).get(key)
+
+    async def get_many(
+        self, db: AsyncSession, keys: Iterable[Tuple[str, CollectionType]]
+    ) -> Dict[Tuple[str, CollectionType], GenerationPlan]:
+        """Return cached plans, loading all misses in one batch without blocking the event loop."""
+        plans = {}
+        missing = []
+        for key in keys:
+            plan = super().get(key)
+            if plan is not None:
+                plans[key] = plan
+            else:
+                missing.append(key)
+        if not missing:
+            return plans
+
+        version = self.version
+        loaded = await db.run_sync(load_generation_plans, missing)
+        self.put_many(loaded, version)
+        plans.update(loaded)
+        return plans
+
+    def plans(self) -> List[GenerationPlan]:
+        """Snapshot of the cached plans."""
+        return self.values()
+
+    def invalidate_collection(self, collection_id: int) -> None:
+        self.invalidate_where(lambda plan: plan.collection_id == collection_id)
+
+
+plan_cache = GenerationPlanCache(
+    ttl_seconds=settings.plan_cache_ttl_seconds,
+    shared=shared_generation("plans")
+)
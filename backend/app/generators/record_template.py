@@ -0,0 +1,83 @@
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import orjson
+
+from app.models.field import ValueType
+from app.generators.field_spec import FieldSpec
+from app.generators.value_generator import ValueGenerator
+
+# Field types whose output only changes when the field is edited
+FIXED_TYPES = (ValueType.TEXT_FIXED, ValueType.NUMBER_FIXED, ValueType.FLOAT_FIXED)
+
+# Slot marker for the current epoch (generated_at_epoch and EPOCH_NOW fields)
+EPOCH = -1
+
+
+@dataclass(frozen=True)
+class RecordTemplate:
+    """
+    Pre-encoded public response for one field set.
+
+    The collection name, type, field keys and fixed values are encoded once.
+    Rendering splices the current epoch and the values of dynamic_fields, in
+    order, between the static chunks. Field sets without dynamic values get a
+    weak ETag over their fixed content.
+    """
+    chunks: Tuple[bytes, ...]
+    # EPOCH or an index into dynamic_fields, one per gap between chunks
+    slots: Tuple[int, ...]
+    dynamic_fields: Tuple[FieldSpec, ...]
+    etag: Optional[str]
+
+    def render(self, epoch: int, values: Sequence = ()) -> bytes:
+        epoch_bytes = str(epoch).encode()
+        parts = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            parts.append(epoch_bytes if slot == EPOCH else orjson.dumps(values[slot]))
+            parts.append(chunk)
+        return b"".join(parts)
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Weak comparison against an If-None-Match header."""
+        if self.etag is None or not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        opaque = self.etag[2:]
+        return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def build_record_template(collection_name: str, collection_type: str, fields: List[FieldSpec]) -> RecordTemplate:
+    """Encode everything about a record that does not change between requests."""
+    chunks = []
+    slots = []
+    dynamic_fields = []
+
+    current = b'{"collection":' + orjson.dumps(collection_name) + b',"type":' + orjson.dumps(collection_type)
+    current += b',"generated_at_epoch":'
+    chunks.append(current)
+    slots.append(EPOCH)
+    current = b',"data":{'
+    for i, f in enumerate(fields):
+        if i:
+            current += b","
+        current += orjson.dumps(f.field_name) + b":"
+        if f.value_type in FIXED_TYPES:
+            current += orjson.dumps(ValueGenerator.generate_value(f, None))
+            continue
+        chunks.append(current)
+        current = b""
+        if f.value_type == ValueType.EPOCH_NOW:
+            slots.append(EPOCH)
+        else:
+            slots.append(len(dynamic_fields))
+            dynamic_fields.append(f)
+    chunks.append(current + b"}}")
+
+    etag = None
+    if not dynamic_fields:
+        digest = hashlib.sha256(b"\0".join(chunks)).hexdigest()[:32]
+        etag = f'W/"{digest}"'
+    return RecordTemplate(chunks=tuple(chunks), slots=tuple(slots), dynamic_fields=tuple(dynamic_fields), etag=etag)
@@ -0,0 +1,70 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.generators.generation_plan import GenerationPlanCache, plan_cache
+
+logger = logging.getLogger(__name__)
+
+
+class SpikeActivationTicker:
+    """
+    Background thread that keeps cached plans' spike overlays ready.
+
+    Overlays starting within the prewarm window are merged into effective
+    field specs and a response template before start_datetime, so the first
+    request of a spike does no extra work. Overlays that have ended release
+    both.
+    """
+
+    thread_name = "spike-activation"
+
+    def __init__(self, cache: GenerationPlanCache, interval_seconds: float, prewarm_seconds: float):
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+        self.prewarm_seconds = prewarm_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """Compile upcoming overlays, release ended ones, and return how many were compiled."""
+        now = now or datetime.now(timezone.utc)
+        horizon = now + timedelta(seconds=self.prewarm_seconds)
+        compiled = 0
+        for plan in self.cache.plans():
+            for overlay in plan.spike_overlays:
+                if overlay.end_datetime < now:
+                    plan.release_overlay(overlay)
+                elif overlay.start_datetime <= horizon and not overlay.compiled:
+                    plan.record_template(overlay)
+                    compiled += 1
+        return compiled
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Spike activation tick failed: {e}")
+
+
+spike_ticker = SpikeActivationTicker(
+    plan_cache,
+    interval_seconds=settings.spike_ticker_interval_seconds,
+    prewarm_seconds=settings.spike_prewarm_seconds
+)
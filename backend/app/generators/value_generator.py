@@ -1,12 +1,13 @@
 import time
 import random
-from typing import Union, Any
+from typing import Union, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.field import Field, ValueType
+from app.generators.field_spec import FieldConfig
 
 class ValueGenerator:
     @staticmethod
-    def generate_value(field: Field, db: Session) -> Union[int, float, str]:
+    def generate_value(field: FieldConfig, db: Session) -> Union[int, float, str]:
         """Generate a value based on the field's configuration."""
         
         if field.value_type == ValueType.TEXT_FIXED:
@@ -38,59 +39,124 @@ class ValueGenerator:
         else:
             raise ValueError(f"Unknown value type: {field.value_type}")
     
+    @staticmethod
+    def generate_column(field: FieldConfig, count: int) -> List[Union[int, float, str]]:
+        """Generate count values for a non-counter field in one pass."""
+        
+        if field.value_type == ValueType.TEXT_FIXED:
+            return [field.fixed_value_text] * count
+        
+        elif field.value_type == ValueType.NUMBER_FIXED:
+            return [field.fixed_value_number] * count
+        
+        elif field.value_type == ValueType.FLOAT_FIXED:
+            return [field.fixed_value_float] * count
+        
+        elif field.value_type == ValueType.EPOCH_NOW:
+            return [int(time.time())] * count
+        
+        elif field.value_type == ValueType.NUMBER_RANGE:
+            # choices() indexes the range in C instead of calling randint() per value
+            return random.choices(range(field.range_start_number, field.range_end_number + 1), k=count)
+        
+        elif field.value_type == ValueType.FLOAT_RANGE:
+            start = field.range_start_float
+            span = field.range_end_float - start
+            precision = field.float_precision or 2
+            draw = random.random
+            return [round(start + span * draw(), precision) for _ in range(count)]
+        
+        elif field.value_type in [ValueType.INCREMENT, ValueType.DECREMENT]:
+            raise ValueError("Counter fields must be advanced step by step")
+        
+        else:
+            raise ValueError(f"Unknown value type: {field.value_type}")
+    
+    @staticmethod
+    def generate_columns(fields: List[FieldConfig], count: int) -> List[List[Union[int, float, str]]]:
+        """Generate count values for each non-counter field."""
+        return [ValueGenerator.generate_column(field, count) for field in fields]
+    
+    @staticmethod
+    def advance_counter_many(
+        field: FieldConfig, current_number: Optional[float], count: int
+    ) -> Tuple[List[float], float]:
+        """Return (count values to emit, final state) for an INCREMENT/DECREMENT field."""
+        values = []
+        for _ in range(count):
+            value, current_number = ValueGenerator.advance_counter(field, current_number)
+            values.append(value)
+        return values, current_number
+    
+    @staticmethod
+    def advance_counter(field: FieldConfig, current_number: Optional[float]) -> Tuple[float, float]:
+        """Return (value to emit, next state) for an INCREMENT/DECREMENT field without persisting."""
+        if field.value_type == ValueType.INCREMENT:
+            return ValueGenerator._advance_increment(field, current_number)
+        elif field.value_type == ValueType.DECREMENT:
+            return ValueGenerator._advance_decrement(field, current_number)
+        else:
+            raise ValueError(f"Not a counter value type: {field.value_type}")
+    
     @staticmethod
     def _handle_increment(field: Field, db: Session) -> float:
         """Handle INCREMENT value generation with persistence."""
+        current_value, field.current_number = ValueGenerator._advance_increment(field, field.current_number)
+        db.flush()
+        return current_value
+    
+    @staticmethod
+    def _handle_decrement(field: Field, db: Session) -> float:
+        """Handle DECREMENT value generation with persistence."""
+        current_value, field.current_number = ValueGenerator._advance_decrement(field, field.current_number)
+        db.flush()
+        return current_value
+    
+    @staticmethod
+    def _advance_increment(field: FieldConfig, current_number: Optional[float]) -> Tuple[float, float]:
+        """Calculate the INCREMENT value to return and the next state."""
         # Calculate randomized step
         randomized_step = ValueGenerator._apply_randomization(
             field.step_number, field.randomization_percentage or 0.0
         )
         
-        # If current is NULL, set to start and return it
-        if field.current_number is None:
+        # If current is NULL, start from start_number
+        if current_number is None:
             current_value = field.start_number
-            field.current_number = current_value + randomized_step
-        else:
-            # Return current value and calculate next
-            current_value = field.current_number
-            next_value = current_value + randomized_step
-            
-            # Check if reset_number is provided and next value exceeds reset threshold
-            if field.reset_number is not None and next_value > field.reset_number:
-                # Reset: next call should return start_number
-                field.current_number = field.start_number
-            else:
-                field.current_number = next_value
+            return current_value, current_value + randomized_step
         
-        db.flush()
-        return current_value
+        # Return current value and calculate next
+        current_value = current_number
+        next_value = current_value + randomized_step
+        
+        # Check if reset_number is provided and next value exceeds reset threshold
+        if field.reset_number is not None and next_value > field.reset_number:
+            # Reset: next call should return start_number
+            return current_value, field.start_number
+        return current_value, next_value
     
     @staticmethod
-    def _handle_decrement(field: Field, db: Session) -> float:
-        """Handle DECREMENT value generation with persistence."""
+    def _advance_decrement(field: FieldConfig, current_number: Optional[float]) -> Tuple[float, float]:
+        """Calculate the DECREMENT value to return and the next state."""
         # Calculate randomized step
         randomized_step = ValueGenerator._apply_randomization(
             field.step_number, field.randomization_percentage or 0.0
         )
         
-        # If current is NULL, set to start and return it
-        if field.current_number is None:
+        # If current is NULL, start from start_number
+        if current_number is None:
             current_value = field.start_number
-            field.current_number = current_value - randomized_step
-        else:
-            # Return current value and calculate next
-            current_value = field.current_number
-            next_value = current_value - randomized_step
-            
-            # Check if reset_number is provided and next value falls below reset threshold
-            if field.reset_number is not None and next_value < field.reset_number:
-                # Reset: next call should return start_number
-                field.current_number = field.start_number
-            else:
-                field.current_number = next_value
+            return current_value, current_value - randomized_step
         
-        db.flush()
-        return current_value
+        # Return current value and calculate next
+        current_value = current_number
+        next_value = current_value - randomized_step
+        
+        # Check if reset_number is provided and next value falls below reset threshold
+        if field.reset_number is not None and next_value < field.reset_number:
+            # Reset: next call should return start_number
+            return current_value, field.start_number
+        return current_value, next_value
 
     @staticmethod
     def _apply_randomization(step: float, percentage: float) -> float:
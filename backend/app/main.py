@@ -2,9 +2,13 @@ from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
 import os
 
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.db.database import async_engine
+from app.db.pagination import NEXT_CURSOR_HEADER
 from app.api.public import router as public_router
 from app.api.auth import router as auth_router
 from app.api.admin_collections import router as admin_collections_router
@@ -12,6 +16,27 @@ from app.api.admin_api_keys import router as admin_api_keys_router
 from app.api.admin_spike_schedules import router as admin_spike_schedules_router
 from app.api.admin import router as admin_router
 from app.api.admin_users import router as admin_users_router
+from app.api.metrics import router as metrics_router
+from app.generators.counter_engine import counter_engine
+from app.auth.api_key_usage import api_key_usage
+from app.core.request_accounting import request_accounting
+from app.generators.spike_ticker import spike_ticker
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup - begin write-behind persistence of counter state, key usage and request counts
+    counter_engine.start()
+    api_key_usage.start()
+    request_accounting.start()
+    # Keep spike overrides merged ahead of schedule start
+    spike_ticker.start()
+    yield
+    # Shutdown - persist anything still held in memory
+    spike_ticker.stop()
+    counter_engine.stop()
+    api_key_usage.stop()
+    request_accounting.stop()
+    await async_engine.dispose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -20,7 +45,8 @@ app = FastAPI(
     version="1.0.0",
     openapi_url=f"{settings.api_prefix}/openapi.json",
     docs_url=f"{settings.api_prefix}/docs",
-    redoc_url=f"{settings.api_prefix}/redoc"
+    redoc_url=f"{settings.api_prefix}/redoc",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -30,8 +56,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # Lets browser clients page through admin lists
 )
 
+# Record request latency by route
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routers FIRST (before catch-all route)
 app.include_router(public_router, prefix=f"{settings.api_prefix}/data", tags=["public"])
 app.include_router(auth_router, prefix=f"{settings.api_prefix}/auth", tags=["authentication"])
@@ -40,6 +71,7 @@ app.include_router(admin_api_keys_router, prefix=f"{settings.api_prefix}/admin",
 app.include_router(admin_spike_schedules_router, prefix=f"{settings.api_prefix}/admin", tags=["admin-spike-schedules"])
 app.include_router(admin_router, prefix=f"{settings.api_prefix}/admin", tags=["admin"])
 app.include_router(admin_users_router, prefix=f"{settings.api_prefix}/admin", tags=["admin-users"])
+app.include_router(metrics_router, prefix=f"{settings.api_prefix}/metrics", tags=["metrics"])
 
 # Health check for API
 @app.get(f"{settings.api_prefix}/health")
@@ -82,10 +114,6 @@ else:
         return {"message": "Data Generator API", "version": "1.0.0", "docs": f"{settings.api_prefix}/docs"}
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=True
-    )
+    # Same launcher as start_server.py: database init once, Settings-driven server options
+    from start_server import main
+    main()
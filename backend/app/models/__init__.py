@@ -4,6 +4,7 @@ from .field import Field, CollectionType, ValueType
 from .api_key import APIKey, APIKeyScope, APIKeyAllowed, APIKeyStatus
 from .spike_schedule import SpikeSchedule
 from .spike_schedule_field import SpikeScheduleField
+from .request_count import RequestCountMinute, RequestCountDaily
 
 # Make sure all models are imported for Alembic
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
     "Collection", 
     "Field", "CollectionType", "ValueType",
     "APIKey", "APIKeyScope", "APIKeyAllowed", "APIKeyStatus",
-    "SpikeSchedule", "SpikeScheduleField"
+    "SpikeSchedule", "SpikeScheduleField",
+    "RequestCountMinute", "RequestCountDaily"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Enum, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from datetime import datetime, timezone
@@ -19,6 +19,7 @@ class APIKey(Base):
     status = Column(Enum(APIKeyStatus), default=APIKeyStatus.ACTIVE, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=True)
     last_used_at = Column(DateTime(timezone=True), nullable=True)
+    request_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     # Relationships
@@ -38,6 +39,9 @@ class APIKeyScope(Base):
 
 class APIKeyAllowed(Base):
     __tablename__ = "api_key_allowed"
+    __table_args__ = (
+        Index('ix_api_key_allowed_api_key_id_collection_id', 'api_key_id', 'collection_id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     api_key_id = Column(Integer, ForeignKey("api_keys.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, UniqueConstraint, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, UniqueConstraint, Enum, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from datetime import datetime, timezone
@@ -22,6 +22,8 @@ class Field(Base):
     __tablename__ = "fields"
     __table_args__ = (
         UniqueConstraint('collection_id', 'collection_type', 'field_name', name='unique_field_per_collection_type'),
+        # Plan loading filters on both columns and reads fields in id order
+        Index('ix_fields_collection_id_collection_type', 'collection_id', 'collection_type'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
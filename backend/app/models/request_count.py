@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, UniqueConstraint
+from app.db.database import Base
+
+class RequestCountMinute(Base):
+    """Public requests per minute, API key, collection and type."""
+    __tablename__ = "request_counts_minute"
+    __table_args__ = (
+        UniqueConstraint('bucket_start', 'api_key_id', 'collection_id', 'collection_type',
+                         name='uq_request_counts_minute_bucket'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_start = Column(DateTime, nullable=False)  # UTC minute
+    # No foreign keys: history outlives deleted keys and collections
+    api_key_id = Column(Integer, nullable=False)
+    collection_id = Column(Integer, nullable=False)
+    collection_type = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+class RequestCountDaily(Base):
+    """Total public requests per UTC day, read by the dashboard."""
+    __tablename__ = "request_counts_daily"
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False, unique=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,16 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.db.types import UTCDateTime
 from datetime import datetime, timezone
 
 class SpikeSchedule(Base):
     __tablename__ = "spike_schedules"
+    __table_args__ = (
+        Index('ix_spike_schedules_collection_id_start_end', 'collection_id', 'start_datetime', 'end_datetime'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     collection_id = Column(Integer, ForeignKey("collections.id"), nullable=False)
     name = Column(String, nullable=False)
-    start_datetime = Column(DateTime(timezone=True), nullable=False)
-    end_datetime = Column(DateTime(timezone=True), nullable=False)
+    start_datetime = Column(UTCDateTime(timezone=True), nullable=False)
+    end_datetime = Column(UTCDateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 from app.models.field import CollectionType, ValueType
@@ -6,6 +6,9 @@ from datetime import datetime, timezone
 
 class SpikeScheduleField(Base):
     __tablename__ = "spike_schedule_fields"
+    __table_args__ = (
+        Index('ix_spike_schedule_fields_schedule_id_collection_type', 'spike_schedule_id', 'collection_type'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     spike_schedule_id = Column(Integer, ForeignKey("spike_schedules.id"), nullable=False)
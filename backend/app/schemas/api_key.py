@@ -21,6 +21,7 @@ class APIKeyResponse(BaseModel):
     status: APIKeyStatus
     expires_at: Optional[datetime] = None
     last_used_at: Optional[datetime] = None
+    request_count: int = 0
     created_at: datetime
     
     class Config:
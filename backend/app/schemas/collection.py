@@ -99,3 +99,6 @@ class FieldResponse(BaseModel):
 
 class CollectionWithFields(CollectionResponse):
     fields: List[FieldResponse] = []
+
+class CollectionSummary(CollectionResponse):
+    field_count: int  # Counted in the database instead of listing the fields
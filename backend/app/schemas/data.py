@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import List
+
+class BatchDataItem(BaseModel):
+    collection: str  # Collection name (not URL-encoded)
+    type: str  # Performance or Configuration (case-insensitive)
+
+class BatchDataRequest(BaseModel):
+    items: List[BatchDataItem]
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Public endpoint throughput with and without the SQLite performance profile.
+
+Each profile runs in its own process against a fresh database file. Caches and
+write-behind are disabled so every request reads the configuration tables and
+writes counter and API key usage, while background threads keep committing
+field updates the way admin edits and other workers would.
+
+Usage (from backend/):
+    python benchmarks/sqlite_profile.py [--duration 10] [--concurrency 32] [--writers 2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROFILES = {
+    "default": {"SQLITE_TUNING": "false"},
+    "tuned": {"SQLITE_TUNING": "true"}
+}
+
+def run_profile(args) -> dict:
+    """Seed a database and measure the public endpoint in this process."""
+    import httpx
+    from sqlalchemy import update
+    from app.db.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.auth.api_key_auth import generate_api_key
+    from app.auth.password import hash_password
+    from app.models.api_key import APIKey
+    from app.models.collection import Collection
+    from app.models.field import Field, CollectionType, ValueType
+    from app.models.user import User, UserRole
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email="bench@example.com", username="bench", password_hash=hash_password("bench"), role=UserRole.ADMIN)
+    db.add(user)
+    db.flush()
+    collection = Collection(name="Bench", owner_id=user.id)
+    db.add(collection)
+    db.flush()
+    db.add_all([
+        Field(collection_id=collection.id, collection_type=CollectionType.PERFORMANCE, field_name="requests",
+              value_type=ValueType.NUMBER_RANGE, range_start_number=1, range_end_number=100),
+        Field(collection_id=collection.id, collection_type=CollectionType.PERFORMANCE, field_name="sequence",
+              value_type=ValueType.INCREMENT, start_number=0, step_number=1)
+    ])
+    full_key, prefix, key_hash = generate_api_key()
+    db.add(APIKey(user_id=user.id, label="bench", key_hash=key_hash, key_prefix=prefix))
+    db.commit()
+    collection_id = collection.id
+    db.close()
+
+    stop = threading.Event()
+    writes = [0]
+
+    def writer():
+        while not stop.is_set():
+            session = SessionLocal()
+            try:
+                session.execute(
+                    update(Field).where(Field.collection_id == collection_id, Field.field_name == "requests")
+                    .values(range_end_number=100)
+                )
+                session.commit()
+                writes[0] += 1
+            except Exception:
+                session.rollback()
+            finally:
+                session.close()
+
+    async def load() -> dict:
+        latencies = []
+        errors = 0
+        deadline = time.perf_counter() + args.duration
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def worker():
+                nonlocal errors
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    response = await client.get("/api/data/Bench/Performance", headers={"X-API-Key": full_key})
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - started)
+                    else:
+                        errors += 1
+            await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+        latencies.sort()
+        return {
+            "requests_per_second": round(len(latencies) / args.duration, 1),
+            "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+            "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else None,
+            "errors": errors
+        }
+
+    threads = [threading.Thread(target=writer, daemon=True) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    try:
+        result = asyncio.run(load())
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    result["background_writes"] = writes[0]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per profile")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent requests")
+    parser.add_argument("--writers", type=int, default=2, help="Background writer threads")
+    parser.add_argument("--profile", choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run_profile(args)))
+        return
+
+    results = {}
+    for name, overrides in PROFILES.items():
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                PLAN_CACHE_TTL_SECONDS="0",
+                API_KEY_CACHE_TTL_SECONDS="0",
+                COUNTER_FLUSH_INTERVAL_SECONDS="0",
+                API_KEY_USAGE_FLUSH_INTERVAL_SECONDS="0",
+                **overrides
+            )
+            output = subprocess.run(
+                [sys.executable, __file__, "--profile", name, "--duration", str(args.duration),
+                 "--concurrency", str(args.concurrency), "--writers", str(args.writers)],
+                env=env, stdout=subprocess.PIPE, text=True, check=True
+            ).stdout
+            results[name] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'profile':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'writes':>10}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['requests_per_second']:>10}{result['p50_ms']:>10}{result['p99_ms']:>10}"
+              f"{result['errors']:>8}{result['background_writes']:>10}")
+
+if __name__ == "__main__":
+    main()
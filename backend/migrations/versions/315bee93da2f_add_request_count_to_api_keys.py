@@ -0,0 +1,28 @@
+"""add_request_count_to_api_keys
+
+Revision ID: 315bee93da2f
+Revises: 31bc7369b465
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '315bee93da2f'
+down_revision: Union[str, None] = '31bc7369b465'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add request_count column to api_keys table (maintained by batched usage flushes)
+    op.add_column('api_keys', sa.Column('request_count', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    # Remove request_count column from api_keys table
+    op.drop_column('api_keys', 'request_count')
@@ -0,0 +1,34 @@
+"""add_public_lookup_indexes
+
+Revision ID: 9a7cc837603e
+Revises: 315bee93da2f
+Create Date: 2026-10-17 11:02:17.503114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a7cc837603e'
+down_revision: Union[str, None] = '315bee93da2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes for the lookups made when loading generation plans and API key grants
+    op.create_index('ix_fields_collection_id_collection_type', 'fields', ['collection_id', 'collection_type'], unique=False)
+    op.create_index('ix_spike_schedules_collection_id_start_end', 'spike_schedules', ['collection_id', 'start_datetime', 'end_datetime'], unique=False)
+    op.create_index('ix_spike_schedule_fields_schedule_id_collection_type', 'spike_schedule_fields', ['spike_schedule_id', 'collection_type'], unique=False)
+    op.create_index('ix_api_key_allowed_api_key_id_collection_id', 'api_key_allowed', ['api_key_id', 'collection_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Remove the composite lookup indexes
+    op.drop_index('ix_api_key_allowed_api_key_id_collection_id', table_name='api_key_allowed')
+    op.drop_index('ix_spike_schedule_fields_schedule_id_collection_type', table_name='spike_schedule_fields')
+    op.drop_index('ix_spike_schedules_collection_id_start_end', table_name='spike_schedules')
+    op.drop_index('ix_fields_collection_id_collection_type', table_name='fields')
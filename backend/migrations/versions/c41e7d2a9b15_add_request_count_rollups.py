@@ -0,0 +1,50 @@
+"""add_request_count_rollups
+
+Revision ID: c41e7d2a9b15
+Revises: 9a7cc837603e
+Create Date: 2026-10-17 14:20:41.118392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7d2a9b15'
+down_revision: Union[str, None] = '9a7cc837603e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-minute request counts by API key, collection and type
+    op.create_table('request_counts_minute',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('api_key_id', sa.Integer(), nullable=False),
+    sa.Column('collection_id', sa.Integer(), nullable=False),
+    sa.Column('collection_type', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('bucket_start', 'api_key_id', 'collection_id', 'collection_type', name='uq_request_counts_minute_bucket')
+    )
+    op.create_index(op.f('ix_request_counts_minute_id'), 'request_counts_minute', ['id'], unique=False)
+    # Daily request totals for the dashboard
+    op.create_table('request_counts_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day')
+    )
+    op.create_index(op.f('ix_request_counts_daily_id'), 'request_counts_daily', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop the request rollup tables
+    op.drop_index(op.f('ix_request_counts_daily_id'), table_name='request_counts_daily')
+    op.drop_table('request_counts_daily')
+    op.drop_index(op.f('ix_request_counts_minute_id'), table_name='request_counts_minute')
+    op.drop_table('request_counts_minute')
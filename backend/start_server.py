@@ -1,24 +1,51 @@
 #!/usr/bin/env python3
 """
 RPO GenData Server Startup Script
+
+Server options come from Settings (SERVER_* environment variables or .env).
+Set SERVER_RELOAD=true for development.
 """
 import uvicorn
-from app.main import app
 from app.core.config import settings
+from app.db.database import engine
 from app.db.init_db import create_initial_admin_user
 
+def uvicorn_options() -> dict:
+    """Translate the server settings into uvicorn.run() keyword arguments."""
+    options = {
+        "host": settings.host,
+        "port": settings.port,
+        "loop": settings.server_loop,
+        "http": settings.server_http,
+        "backlog": settings.server_backlog,
+        "timeout_keep_alive": settings.server_keep_alive_seconds,
+        "timeout_graceful_shutdown": settings.server_graceful_shutdown_seconds,
+        "limit_concurrency": settings.server_limit_concurrency,
+    }
+    if settings.server_reload:
+        options["reload"] = True
+    else:
+        options["workers"] = settings.server_workers
+    return options
+
 def main():
-    """Start the server with database initialization."""
+    """Initialize the database once, then start the server and its workers."""
     print("Initializing database...")
     create_initial_admin_user()
+    # Workers open their own connections
+    engine.dispose()
+    
+    options = uvicorn_options()
+    workers = options.get("workers", 1)
+    if workers > 1 and settings.counter_backend == "memory":
+        print(f"Warning: counter_backend 'memory' keeps counters per process; "
+              f"use 'shared' or 'database' with {workers} workers")
+    if workers > 1 and settings.metrics_enabled:
+        print(f"Warning: latency metrics are kept per process; each scrape of "
+              f"{settings.api_prefix}/metrics covers only the one of {workers} workers that answers it")
     
-    print(f"Starting RPO GenData server on {settings.host}:{settings.port}")
-    uvicorn.run(
-        "app.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=True
-    )
+    print(f"Starting RPO GenData server on {settings.host}:{settings.port} with {workers} worker(s)")
+    uvicorn.run("app.main:app", **options)
 
 if __name__ == "__main__":
     main()
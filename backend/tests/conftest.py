@@ -2,25 +2,23 @@ import pytest
 import tempfile
 import os
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.database import get_db, Base
+from app.db.database import get_db, get_async_db, Base
 from app.models.user import User, UserRole
+from app.models.api_key import APIKey
+from app.models.collection import Collection
+from app.models.field import Field, CollectionType
 from app.auth.password import hash_password
-
-# Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.auth.api_key_auth import generate_api_key
+from app.generators.generation_plan import plan_cache
+from app.generators.counter_engine import counter_engine
+from app.auth.api_key_cache import api_key_cache
+from app.auth.user_cache import user_cache
+from app.auth.api_key_usage import api_key_usage
+from app.core.metrics import metrics
+from app.core.request_accounting import request_accounting
+from tests.helpers import engine, TestingSessionLocal, TestingAsyncSessionLocal
 
 def override_get_db():
     try:
@@ -29,7 +27,15 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
+counter_engine.session_factory = TestingSessionLocal
+api_key_usage.session_factory = TestingSessionLocal
+request_accounting.session_factory = TestingSessionLocal
 
 @pytest.fixture(scope="function")
 def db():
@@ -42,6 +48,24 @@ def db():
         db.close()
         Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """In-process caches must not leak rows between per-test databases."""
+    plan_cache.clear()
+    counter_engine.reset()
+    api_key_cache.clear()
+    user_cache.clear()
+    api_key_usage.reset()
+    request_accounting.reset()
+    metrics.reset()
+    yield
+    plan_cache.clear()
+    counter_engine.reset()
+    api_key_cache.clear()
+    user_cache.clear()
+    api_key_usage.reset()
+    request_accounting.reset()
+
 @pytest.fixture(scope="function")
 def client():
     """Create a test client."""
@@ -85,3 +109,46 @@ def authenticated_client(client, admin_user):
     })
     assert response.status_code == 200
     return client
+
+@pytest.fixture(scope="function")
+def admin_client(client, admin_user):
+    """Create a client logged in as admin through the mounted API routes."""
+    response = client.post("/api/auth/login", json={
+        "email": "admin@test.com",
+        "password": "testpassword123"
+    })
+    assert response.status_code == 200
+    return client
+
+@pytest.fixture(scope="function")
+def api_key(db, admin_user):
+    """Create an API key owned by the admin user and return the raw key."""
+    full_key, prefix, key_hash = generate_api_key()
+    db.add(APIKey(
+        user_id=admin_user.id,
+        key_prefix=prefix,
+        key_hash=key_hash,
+        label="Test API Key"
+    ))
+    db.commit()
+    return full_key
+
+@pytest.fixture(scope="function")
+def make_collection(db, admin_user):
+    """
+    Factory adding a collection owned by the admin user.
+
+    Each field is a dict of Field columns; fields default to collection_type
+    unless they set their own.
+    """
+    def make(name, *fields, collection_type=CollectionType.PERFORMANCE):
+        collection = Collection(name=name, owner_id=admin_user.id)
+        db.add(collection)
+        db.flush()
+        db.add_all([
+            Field(collection_id=collection.id, **{"collection_type": collection_type, **field})
+            for field in fields
+        ])
+        db.commit()
+        return collection
+    return make
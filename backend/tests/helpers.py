@@ -0,0 +1,95 @@
+"""Shared test database, statement counting and seed data, imported by conftest and test modules."""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.models.api_key import APIKeyAllowed
+from app.models.collection import Collection
+from app.models.field import Field, CollectionType, ValueType
+from app.models.spike_schedule import SpikeSchedule
+from app.models.spike_schedule_field import SpikeScheduleField
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# The public endpoints use an async session on the same database file. Each
+# TestClient runs its own event loop, so async connections are not pooled.
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+ADMIN = "/api/admin"
+
+class QueryCounter:
+    """Count SQL statements executed on the sync and async test engines."""
+    def __init__(self):
+        self.statements = []
+        self.parameters = []
+
+    def __enter__(self):
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+def add_collections(db, owner, count, api_key=None):
+    """Add collections with two fields and a spike schedule each, granted to api_key."""
+    start = db.query(Collection).count()
+    now = datetime.now(timezone.utc)
+    collections = []
+    for index in range(start, start + count):
+        collection = Collection(name=f"Collection {index}", owner_id=owner.id)
+        db.add(collection)
+        db.flush()
+        fields = [
+            Field(
+                collection_id=collection.id,
+                collection_type=CollectionType.PERFORMANCE,
+                field_name=name,
+                value_type=ValueType.NUMBER_FIXED,
+                fixed_value_number=1
+            )
+            for name in ("cpu", "memory")
+        ]
+        db.add_all(fields)
+        schedule = SpikeSchedule(
+            collection_id=collection.id,
+            name=f"Spike {index}",
+            start_datetime=now,
+            end_datetime=now + timedelta(hours=1)
+        )
+        db.add(schedule)
+        db.flush()
+        db.add_all([
+            SpikeScheduleField(
+                spike_schedule_id=schedule.id,
+                original_field_id=field.id,
+                collection_type=field.collection_type,
+                field_name=field.field_name,
+                value_type=field.value_type,
+                fixed_value_number=100
+            )
+            for field in fields
+        ])
+        if api_key is not None:
+            db.add(APIKeyAllowed(api_key_id=api_key.id, collection_id=collection.id))
+        collections.append(collection)
+    db.commit()
+    return [collection.id for collection in collections]
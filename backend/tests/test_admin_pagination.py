@@ -0,0 +1,98 @@
+from app.auth.api_key_auth import generate_api_key
+from app.models.api_key import APIKey
+from app.models.user import User, UserRole
+from tests.helpers import ADMIN, QueryCounter, add_collections
+
+def fetch_all(client, url, **params):
+    """Follow X-Next-Cursor until the last page, returning the pages' items."""
+    pages = []
+    cursor = None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return pages
+
+def test_collections_page_by_name(admin_client, db, admin_user):
+    """Pages cover every collection once, in name order, without repeats."""
+    add_collections(db, admin_user, 7)
+    pages = fetch_all(admin_client, f"{ADMIN}/collections", sort="name", limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    names = [c["name"] for page in pages for c in page]
+    assert names == sorted(f"Collection {i}" for i in range(7))
+
+    pages = fetch_all(admin_client, f"{ADMIN}/collections", sort="created", order="desc", limit=4)
+    ids = [c["id"] for page in pages for c in page]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 7
+
+def test_collections_without_limit_are_unpaged(admin_client, db, admin_user):
+    """Existing callers still get every collection with its fields."""
+    add_collections(db, admin_user, 3)
+    response = admin_client.get(f"{ADMIN}/collections")
+    assert "x-next-cursor" not in response.headers
+    assert [len(c["fields"]) for c in response.json()] == [2, 2, 2]
+
+def test_collection_summary_counts_fields(admin_client, db, admin_user):
+    """Summary mode returns a field count and no field list, in constant queries."""
+    add_collections(db, admin_user, 3)
+    admin_client.post(f"{ADMIN}/collections", json={"name": "Empty"})
+    url = f"{ADMIN}/collections"
+    admin_client.get(url, params={"summary": True})
+
+    with QueryCounter() as small:
+        response = admin_client.get(url, params={"summary": True})
+    body = response.json()
+    assert [c["field_count"] for c in body] == [2, 2, 2, 0]
+    assert "fields" not in body[0]
+    assert body[0]["owner_username"] == "testadmin"
+
+    add_collections(db, admin_user, 5)
+    with QueryCounter() as large:
+        admin_client.get(url, params={"summary": True})
+    assert len(large.statements) == len(small.statements)
+
+def test_collection_prefix_search_escapes_wildcards(admin_client, db, admin_user):
+    """q matches a literal name prefix."""
+    for name in ("web-1", "web-2", "db_1", "dbx1", "100% cpu"):
+        admin_client.post(f"{ADMIN}/collections", json={"name": name})
+    assert [c["name"] for c in admin_client.get(f"{ADMIN}/collections", params={"q": "web"}).json()] == ["web-1", "web-2"]
+    assert [c["name"] for c in admin_client.get(f"{ADMIN}/collections", params={"q": "db_"}).json()] == ["db_1"]
+    assert [c["name"] for c in admin_client.get(f"{ADMIN}/collections", params={"q": "100%"}).json()] == ["100% cpu"]
+
+def test_invalid_cursor_and_sort_are_rejected(admin_client):
+    response = admin_client.get(f"{ADMIN}/collections", params={"limit": 2, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+    assert admin_client.get(f"{ADMIN}/collections", params={"sort": "owner"}).status_code == 422
+    assert admin_client.get(f"{ADMIN}/collections", params={"limit": 0}).status_code == 422
+
+def test_api_keys_users_and_schedules_page(admin_client, db, admin_user):
+    """The other admin lists share the same paging, search and sort parameters."""
+    for label in ("beta", "alpha", "gamma", "alpine"):
+        _, prefix, key_hash = generate_api_key()
+        db.add(APIKey(user_id=admin_user.id, key_prefix=prefix, key_hash=key_hash, label=label))
+    for index in range(3):
+        db.add(User(
+            email=f"user{index}@test.com",
+            username=f"user{index}",
+            password_hash="unused",
+            role=UserRole.VIEWER
+        ))
+    db.commit()
+    add_collections(db, admin_user, 5)
+
+    pages = fetch_all(admin_client, f"{ADMIN}/api-keys", sort="label", limit=3)
+    assert [[k["label"] for k in page] for page in pages] == [["alpha", "alpine", "beta"], ["gamma"]]
+    assert [k["label"] for k in admin_client.get(f"{ADMIN}/api-keys", params={"q": "alp"}).json()] == ["alpha", "alpine"]
+
+    pages = fetch_all(admin_client, f"{ADMIN}/users", sort="username", order="desc", limit=2)
+    assert [u["username"] for page in pages for u in page] == ["user2", "user1", "user0", "testadmin"]
+    assert [u["username"] for u in admin_client.get(f"{ADMIN}/users", params={"q": "user1@"}).json()] == ["user1"]
+
+    pages = fetch_all(admin_client, f"{ADMIN}/spike-schedules", sort="start", limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    names = [s["name"] for page in pages for s in page]
+    assert names == [f"Spike {i}" for i in range(5)]
+    assert len(pages[0][0]["spike_fields"]) == 2
@@ -0,0 +1,116 @@
+import pytest
+from app.auth.api_key_auth import generate_api_key
+from app.models.api_key import APIKey, APIKeyAllowed
+from app.models.collection import Collection
+from app.models.field import Field
+from app.models.spike_schedule import SpikeSchedule
+from app.models.spike_schedule_field import SpikeScheduleField
+from app.models.user import User, UserRole
+from tests.helpers import ADMIN, QueryCounter, add_collections
+
+@pytest.fixture(scope="function")
+def granted_key(db, admin_user):
+    """An API key owned by the admin user, with no collection grants yet."""
+    _, prefix, key_hash = generate_api_key()
+    key = APIKey(user_id=admin_user.id, key_prefix=prefix, key_hash=key_hash, label="Grants")
+    db.add(key)
+    db.commit()
+    return key
+
+def count_statements(client, method, url, **kwargs):
+    with QueryCounter() as counter:
+        response = client.request(method, url, **kwargs)
+    assert response.status_code == 200, response.text
+    return len(counter.statements)
+
+@pytest.mark.parametrize("url", [
+    f"{ADMIN}/collections",
+    f"{ADMIN}/spike-schedules",
+    f"{ADMIN}/api-keys/{{key_id}}/allowed-collections",
+])
+def test_list_endpoints_are_constant_query(admin_client, db, admin_user, granted_key, url):
+    """Listing 3 or 9 collections issues the same statements."""
+    url = url.format(key_id=granted_key.id)
+    add_collections(db, admin_user, 3, granted_key)
+    count_statements(admin_client, "GET", url)
+    small = count_statements(admin_client, "GET", url)
+
+    add_collections(db, admin_user, 6, granted_key)
+    large = count_statements(admin_client, "GET", url)
+    assert large == small
+
+    response = admin_client.get(url)
+    assert len(response.json()) == 9
+
+def test_allowed_collections_are_named_in_grant_order(admin_client, db, admin_user, granted_key):
+    """Grants are returned in order with their collection names."""
+    ids = add_collections(db, admin_user, 2, granted_key)
+    response = admin_client.get(f"{ADMIN}/api-keys/{granted_key.id}/allowed-collections")
+    assert response.json() == [
+        {"collection_id": ids[0], "collection_name": "Collection 0", "collection_type": None},
+        {"collection_id": ids[1], "collection_name": "Collection 1", "collection_type": None},
+    ]
+
+def test_bulk_delete_is_constant_query(admin_client, db, admin_user, granted_key):
+    """Deleting 2 or 6 collections with their children issues the same statements."""
+    small_ids = add_collections(db, admin_user, 2, granted_key)
+    large_ids = add_collections(db, admin_user, 6, granted_key)
+    admin_client.get(f"{ADMIN}/collections")
+
+    small = count_statements(
+        admin_client, "DELETE", f"{ADMIN}/collections/bulk", json={"collection_ids": small_ids}
+    )
+    with QueryCounter() as counter:
+        response = admin_client.request(
+            "DELETE", f"{ADMIN}/collections/bulk", json={"collection_ids": large_ids}
+        )
+    assert len(counter.statements) == small
+    assert response.json()["cascade_deleted"] == {"fields": 12}
+
+    db.expire_all()
+    for model in (Collection, Field, SpikeSchedule, SpikeScheduleField, APIKeyAllowed):
+        assert db.query(model).count() == 0
+
+def test_api_key_grants_are_validated_in_one_query(admin_client, db, admin_user, granted_key):
+    """Editing grants for 2 or 8 collections issues the same statements."""
+    ids = add_collections(db, admin_user, 8)
+    url = f"{ADMIN}/api-keys/{granted_key.id}/edit"
+    admin_client.get(f"{ADMIN}/collections")
+
+    small = count_statements(admin_client, "PUT", url, json={"collection_ids": ids[:2]})
+    large = count_statements(admin_client, "PUT", url, json={"collection_ids": ids})
+    assert large == small
+
+    response = admin_client.put(url, json={"collection_ids": [ids[0], 999999]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Collection 999999 not found or not accessible"
+    db.expire_all()
+    assert db.query(APIKeyAllowed).count() == 8
+
+def test_user_delete_is_constant_query(admin_client, db, admin_user):
+    """Deleting a user with 2 or 6 collections and keys issues the same statements."""
+    statements = []
+    for index, count in enumerate((2, 6)):
+        user = User(
+            email=f"owner{index}@test.com",
+            username=f"owner{index}",
+            password_hash="unused",
+            role=UserRole.EDITOR
+        )
+        db.add(user)
+        db.commit()
+        keys = []
+        for _ in range(count):
+            _, prefix, key_hash = generate_api_key()
+            keys.append(APIKey(user_id=user.id, key_prefix=prefix, key_hash=key_hash, label="owned"))
+        db.add_all(keys)
+        db.commit()
+        add_collections(db, user, count, keys[0])
+        admin_client.get(f"{ADMIN}/collections")
+        statements.append(count_statements(admin_client, "DELETE", f"{ADMIN}/users/{user.id}"))
+
+    assert statements[0] == statements[1]
+    db.expire_all()
+    assert db.query(User).count() == 1
+    for model in (APIKey, Collection, Field, SpikeSchedule, SpikeScheduleField, APIKeyAllowed):
+        assert db.query(model).count() == 0
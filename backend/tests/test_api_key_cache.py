@@ -0,0 +1,80 @@
+import pytest
+from datetime import datetime, timedelta
+
+from app.models.api_key import APIKey
+from app.models.field import CollectionType, ValueType
+from app.auth.api_key_cache import APIKeyPrincipal, api_key_cache
+from app.auth.api_key_auth import hash_api_key
+from app.auth.api_key_usage import api_key_usage
+from tests.helpers import QueryCounter
+
+@pytest.fixture(scope="function")
+def collection(make_collection):
+    """Create a collection with a single fixed Configuration field."""
+    return make_collection(
+        "Keyed",
+        dict(field_name="Version", value_type=ValueType.TEXT_FIXED, fixed_value_text="1.0"),
+        collection_type=CollectionType.CONFIGURATION
+    )
+
+def test_principal_access_rules():
+    """Explicit grants override ownership and may restrict the collection type."""
+    principal = APIKeyPrincipal(
+        id=1,
+        user_id=10,
+        expires_at=datetime.utcnow() - timedelta(minutes=1),
+        allowed={5: frozenset({"performance"}), 6: frozenset({None})}
+    )
+    assert principal.is_expired()
+    assert principal.can_access(5, 99, "Performance")
+    assert not principal.can_access(5, 99, "Configuration")
+    assert principal.can_access(6, 99, "Configuration")
+    assert principal.can_access(7, 10, "Configuration")
+    assert not principal.can_access(7, 99, "Configuration")
+
+def test_api_key_resolution_is_cached(client, db, collection, api_key):
+    """Repeated requests resolve the key without querying api_keys or api_key_allowed."""
+    headers = {"X-API-Key": api_key}
+    assert client.get("/api/data/Keyed/Configuration", headers=headers).status_code == 200
+    assert api_key_cache.get(hash_api_key(api_key)) is not None
+
+    with QueryCounter() as counter:
+        response = client.get("/api/data/Keyed/Configuration", headers=headers)
+    assert response.status_code == 200
+    assert not [s for s in counter.statements if s.lstrip().upper().startswith("SELECT")]
+
+def test_revoke_invalidates_cached_key(admin_client, db, collection, api_key):
+    """Revoking a key takes effect on the very next request."""
+    headers = {"X-API-Key": api_key}
+    assert admin_client.get("/api/data/Keyed/Configuration", headers=headers).status_code == 200
+
+    key_id = db.query(APIKey.id).scalar()
+    assert admin_client.post(f"/api/admin/api-keys/{key_id}/revoke").status_code == 200
+    assert admin_client.get("/api/data/Keyed/Configuration", headers=headers).status_code == 401
+
+def test_edit_invalidates_cached_grants(admin_client, db, editor_user, collection, api_key):
+    """Granting a key access to another user's collection is visible immediately."""
+    collection.owner_id = editor_user.id
+    db.commit()
+    headers = {"X-API-Key": api_key}
+    assert admin_client.get("/api/data/Keyed/Configuration", headers=headers).status_code == 403
+
+    key_id = db.query(APIKey.id).scalar()
+    response = admin_client.put(f"/api/admin/api-keys/{key_id}/edit", json={"collection_ids": [collection.id]})
+    assert response.status_code == 200
+    assert admin_client.get("/api/data/Keyed/Configuration", headers=headers).status_code == 200
+
+def test_usage_is_written_behind(client, db, collection, api_key):
+    """Public requests record usage in memory and flush it in one batch."""
+    headers = {"X-API-Key": api_key}
+    for _ in range(3):
+        assert client.get("/api/data/Keyed/Configuration", headers=headers).status_code == 200
+
+    key = db.query(APIKey).first()
+    assert key.last_used_at is None
+    assert key.request_count == 0
+
+    assert api_key_usage.flush() == 1
+    db.refresh(key)
+    assert key.last_used_at is not None
+    assert key.request_count == 3
@@ -0,0 +1,297 @@
+import multiprocessing
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base
+from app.db.write_behind import WriteBehindBuffer
+from app.models.collection import Collection
+from app.models.field import Field, CollectionType, ValueType
+from app.generators import counter_engine as counter_engine_module
+from app.generators.counter_engine import AtomicCounterEngine, CounterEngine, SharedCounterEngine
+from app.generators.field_spec import FieldSpec
+from app.generators.value_generator import ValueGenerator
+from tests.helpers import TestingSessionLocal
+
+def make_counter(db, **kwargs):
+    """Persist a counter field on a throwaway collection id."""
+    field = Field(
+        collection_id=kwargs.pop("collection_id", 1),
+        collection_type=CollectionType.PERFORMANCE,
+        field_name=kwargs.pop("field_name", "Counter"),
+        **kwargs
+    )
+    db.add(field)
+    db.commit()
+    return field
+
+def test_counter_engine_keeps_reset_semantics(db):
+    """The engine follows the same sequence as ValueGenerator."""
+    engine = CounterEngine(flush_interval_seconds=60, session_factory=TestingSessionLocal)
+    field = make_counter(db, value_type=ValueType.INCREMENT, start_number=1, step_number=1, reset_number=3)
+
+    values = [engine.advance(field) for _ in range(5)]
+    assert values == [1, 2, 3, 1, 2]
+    # The seed field is not mutated; state lives in the engine
+    assert field.current_number is None
+
+def test_counter_engine_write_behind(db):
+    """Dirty counters are persisted in one flush and seeded from the database."""
+    engine = CounterEngine(flush_interval_seconds=60, session_factory=TestingSessionLocal)
+    up = make_counter(db, field_name="Up", value_type=ValueType.INCREMENT, start_number=10, step_number=5)
+    down = make_counter(db, field_name="Down", value_type=ValueType.DECREMENT, start_number=10, current_number=4, step_number=1)
+
+    assert engine.advance(up) == 10
+    assert engine.advance(down) == 4
+    assert engine.flush() == 2
+    assert engine.flush() == 0
+
+    db.refresh(up)
+    db.refresh(down)
+    assert up.current_number == 15
+    assert down.current_number == 3
+
+def test_counter_engine_discard(db):
+    """Discarded counters are reseeded from the field on next use."""
+    engine = CounterEngine(flush_interval_seconds=60, session_factory=TestingSessionLocal)
+    field = make_counter(db, value_type=ValueType.INCREMENT, start_number=1, step_number=1)
+
+    engine.advance(field)
+    engine.advance(field)
+    engine.discard([field.id])
+    assert engine.flush() == 0
+    assert engine.advance(field) == 1
+
+@pytest.mark.parametrize("value_type,start,step,reset,current", [
+    (ValueType.INCREMENT, 1, 1, 3, None),
+    (ValueType.INCREMENT, 0, 2.5, None, 4),
+    (ValueType.DECREMENT, 10, 3, 2, None),
+    (ValueType.DECREMENT, 10, 3, 2, 5),
+])
+def test_atomic_counter_engine_keeps_reset_semantics(db, value_type, start, step, reset, current):
+    """Each advance is committed to the field and follows ValueGenerator's sequence."""
+    engine = AtomicCounterEngine(session_factory=TestingSessionLocal)
+    field = make_counter(
+        db, value_type=value_type, start_number=start, step_number=step,
+        reset_number=reset, current_number=current
+    )
+    expected, final = ValueGenerator.advance_counter_many(field, current, 7)
+
+    values = [engine.advance(field) for _ in range(4)] + engine.advance_many(field, 3)
+    assert values == expected
+    db.refresh(field)
+    assert field.current_number == final
+
+def test_atomic_counter_engine_is_shared_across_connections(tmp_path):
+    """Threads on separate connections never emit the same counter value."""
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'counters.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=file_engine)
+    Session = sessionmaker(bind=file_engine)
+    with Session() as session:
+        field = make_counter(
+            session, value_type=ValueType.INCREMENT, start_number=0, step_number=1, reset_number=1000
+        )
+        field = FieldSpec.from_field(field)
+
+    engine = AtomicCounterEngine(session_factory=Session)
+    emitted = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(50):
+            value = engine.advance(field)
+            with lock:
+                emitted.append(value)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(emitted) == list(range(400))
+    with Session() as session:
+        assert session.get(Field, field.id).current_number == 400
+    file_engine.dispose()
+
+def test_public_endpoint_with_atomic_counter_engine(client, db, admin_user, api_key, monkeypatch):
+    """The database backend persists every value the endpoint returns."""
+    collection = Collection(name="Atomic", owner_id=admin_user.id)
+    db.add(collection)
+    db.commit()
+    field = make_counter(
+        db, collection_id=collection.id, field_name="seq",
+        value_type=ValueType.INCREMENT, start_number=5, step_number=5
+    )
+    monkeypatch.setattr(
+        "app.api.public.counter_engine", AtomicCounterEngine(session_factory=TestingSessionLocal)
+    )
+
+    responses = [
+        client.get("/api/data/Atomic/Performance", headers={"X-API-Key": api_key}) for _ in range(3)
+    ]
+    assert [r.status_code for r in responses] == [200] * 3, responses[0].text
+    values = [r.json()["data"]["seq"] for r in responses]
+    assert values == [5, 10, 15]
+    db.refresh(field)
+    assert field.current_number == 20
+
+def test_write_through_shared_checkpoint_runs_off_the_event_loop(client, db, admin_user, api_key, monkeypatch, tmp_path):
+    """With a zero flush interval the shared engine checkpoints each request from a worker thread."""
+    collection = Collection(name="Shared", owner_id=admin_user.id)
+    db.add(collection)
+    db.commit()
+    field = make_counter(
+        db, collection_id=collection.id, field_name="seq",
+        value_type=ValueType.INCREMENT, start_number=1, step_number=1
+    )
+    engine = SharedCounterEngine(
+        flush_interval_seconds=0, path=str(tmp_path / "counters"), capacity=64,
+        namespace="test", session_factory=TestingSessionLocal
+    )
+    flush_threads = []
+    flush = engine.flush
+
+    def recording_flush(db=None):
+        flush_threads.append(threading.current_thread())
+        return flush(db)
+
+    monkeypatch.setattr(engine, "flush", recording_flush)
+    monkeypatch.setattr("app.api.public.counter_engine", engine)
+
+    for expected in (1, 2):
+        response = client.get("/api/data/Shared/Performance", headers={"X-API-Key": api_key})
+        assert response.json()["data"]["seq"] == expected
+    db.refresh(field)
+    assert field.current_number == 3
+    assert len(flush_threads) == 2
+    assert all(thread.name.startswith("AnyIO worker thread") for thread in flush_threads)
+    engine.close()
+
+def test_create_counter_engine_rejects_unknown_backend():
+    assert isinstance(counter_engine_module.create_counter_engine("database"), AtomicCounterEngine)
+    with pytest.raises(ValueError):
+        counter_engine_module.create_counter_engine("redis")
+
+def open_shared(path, namespace="test", session_factory=TestingSessionLocal):
+    return SharedCounterEngine(
+        flush_interval_seconds=60, path=str(path), capacity=64,
+        namespace=namespace, session_factory=session_factory
+    )
+
+def test_shared_counter_engine_checkpoints(db, tmp_path):
+    """Shared state follows ValueGenerator's sequence and is flushed to the field."""
+    engine = open_shared(tmp_path / "counters")
+    field = make_counter(db, value_type=ValueType.DECREMENT, start_number=10, step_number=3, reset_number=2)
+    expected, final = ValueGenerator.advance_counter_many(field, None, 6)
+
+    assert [engine.advance(field) for _ in range(3)] + engine.advance_many(field, 3) == expected
+    assert engine.flush() == 1
+    assert engine.flush() == 0
+    db.refresh(field)
+    assert field.current_number == final
+
+    # Another worker opening the same file continues the sequence
+    other = open_shared(tmp_path / "counters")
+    assert other.advance(field) == final
+    other.discard([field.id])
+    assert engine.advance(field) == final
+    engine.close()
+    other.close()
+
+def test_shared_counter_engine_resets_file_for_another_database(tmp_path):
+    field = FieldSpec(id=3, field_name="seq", value_type=ValueType.INCREMENT, start_number=0, step_number=1)
+    engine = open_shared(tmp_path / "counters", namespace="sqlite:///a.db")
+    engine.advance_many(field, 5)
+    engine.close()
+
+    assert open_shared(tmp_path / "counters", namespace="sqlite:///a.db").advance(field) == 5
+    assert open_shared(tmp_path / "counters", namespace="sqlite:///b.db").advance(field) == 0
+
+def advance_in_worker(path, field, results):
+    engine = open_shared(path)
+    results.put([engine.advance(field) for _ in range(100)])
+
+def test_shared_counter_engine_is_shared_across_processes(tmp_path):
+    """Worker processes advancing one field never emit the same value."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("requires fork")
+    context = multiprocessing.get_context("fork")
+    path = tmp_path / "counters"
+    open_shared(path).close()
+    field = FieldSpec(id=7, field_name="seq", value_type=ValueType.INCREMENT, start_number=0, step_number=1)
+
+    results = context.Queue()
+    workers = [context.Process(target=advance_in_worker, args=(path, field, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    emitted = [value for _ in workers for value in results.get(timeout=30)]
+    for worker in workers:
+        worker.join()
+
+    assert sorted(emitted) == list(range(400))
+    assert open_shared(path).advance(field) == 400
+
+def test_shared_counter_engine_capacity(tmp_path):
+    """Ids without a slot fail with the setting to change, and deleting them is a no-op."""
+    engine = open_shared(tmp_path / "counters")
+    field = FieldSpec(id=65, field_name="seq", value_type=ValueType.INCREMENT, start_number=0, step_number=1)
+    with pytest.raises(RuntimeError, match="counter_shared_capacity"):
+        engine.advance(field)
+    engine.discard([65, 1000])
+    assert engine.flush() == 0
+    engine.close()
+
+def checkpoint_in_worker(path, database_url, field, started, done):
+    file_engine = create_engine(database_url, connect_args={"timeout": 30})
+    engine = open_shared(path, session_factory=sessionmaker(bind=file_engine))
+    started.wait(30)
+    engine.advance_many(field, 5)
+    engine.flush()
+    done.set()
+
+def test_shared_counter_checkpoints_never_go_backwards(tmp_path, monkeypatch):
+    """A worker whose checkpoint raced with a newer one cannot commit the older value last."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("requires fork")
+    context = multiprocessing.get_context("fork")
+    database_url = f"sqlite:///{tmp_path / 'counters.db'}"
+    file_engine = create_engine(database_url, connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=file_engine)
+    Session = sessionmaker(bind=file_engine)
+    with Session() as session:
+        field = FieldSpec.from_field(make_counter(
+            session, value_type=ValueType.INCREMENT, start_number=0, step_number=1
+        ))
+
+    path = tmp_path / "counters"
+    engine = open_shared(path, session_factory=Session)
+    engine.advance_many(field, 3)
+    started, done = context.Event(), context.Event()
+    execute = engine._execute
+
+    def slow_execute(statement, params, db):
+        # The other worker advances and checkpoints while this one's UPDATE is in flight
+        started.set()
+        time.sleep(0.5)
+        execute(statement, params, db)
+
+    monkeypatch.setattr(engine, "_execute", slow_execute)
+    worker = context.Process(target=checkpoint_in_worker, args=(path, database_url, field, started, done))
+    worker.start()
+    engine.flush()
+    assert done.wait(30)
+    worker.join()
+
+    with Session() as session:
+        assert session.get(Field, field.id).current_number == 8
+    engine.close()
+    file_engine.dispose()
+
+def test_write_behind_buffer_requires_flush():
+    class Incomplete(WriteBehindBuffer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(flush_interval_seconds=60)
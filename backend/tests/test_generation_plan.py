@@ -0,0 +1,176 @@
+import asyncio
+import random
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.models.field import Field, CollectionType, ValueType
+from app.models.spike_schedule import SpikeSchedule
+from app.models.spike_schedule_field import SpikeScheduleField
+from app.generators.field_spec import FieldSpec
+from app.generators.generation_plan import SpikeOverlay, SpikeTimeline, plan_cache
+from app.generators.counter_engine import counter_engine
+from app.generators.spike_ticker import SpikeActivationTicker
+from tests.helpers import QueryCounter, TestingAsyncSessionLocal
+
+@pytest.fixture(scope="function")
+def collection(make_collection):
+    """Create a Performance collection with a fixed field and a counter."""
+    return make_collection(
+        "Plan Collection",
+        dict(field_name="Fixed", value_type=ValueType.NUMBER_FIXED, fixed_value_number=7),
+        dict(field_name="Counter", value_type=ValueType.INCREMENT, start_number=1, step_number=1)
+    )
+
+def get_plan(collection_name, collection_type):
+    """Look up a plan through the cache with an async session."""
+    async def lookup():
+        async with TestingAsyncSessionLocal() as db:
+            return await plan_cache.get(db, collection_name, collection_type)
+    return asyncio.run(lookup())
+
+def test_plan_is_cached_until_invalidated(db, collection):
+    """A second lookup must not query the configuration tables."""
+    plan = get_plan("Plan Collection", CollectionType.PERFORMANCE)
+    assert [f.field_name for f in plan.fields] == ["Fixed", "Counter"]
+    assert plan.counter_field_ids == [plan.fields[1].id]
+
+    with QueryCounter() as counter:
+        assert get_plan("Plan Collection", CollectionType.PERFORMANCE) is plan
+    assert counter.statements == []
+
+    plan_cache.invalidate_collection(collection.id)
+    assert get_plan("Plan Collection", CollectionType.PERFORMANCE) is not plan
+
+def test_plan_missing_collection(db):
+    """Unknown collections are not cached."""
+    assert get_plan("Missing", CollectionType.PERFORMANCE) is None
+
+def test_plan_spike_overlay(db, collection):
+    """Spike overrides are resolved into the plan by original field id."""
+    fixed = db.query(Field).filter(Field.field_name == "Fixed").first()
+    now = datetime.now(timezone.utc)
+    schedule = SpikeSchedule(
+        collection_id=collection.id,
+        name="Spike",
+        start_datetime=now - timedelta(minutes=5),
+        end_datetime=now + timedelta(minutes=5)
+    )
+    db.add(schedule)
+    db.flush()
+    db.add(SpikeScheduleField(
+        spike_schedule_id=schedule.id,
+        original_field_id=fixed.id,
+        collection_type=CollectionType.PERFORMANCE,
+        field_name="Fixed",
+        value_type=ValueType.NUMBER_FIXED,
+        fixed_value_number=700
+    ))
+    db.commit()
+
+    plan = get_plan("Plan Collection", CollectionType.PERFORMANCE)
+    active = plan.active_spike(now)
+    assert active is not None
+    assert active.spike_fields[fixed.id]["fixed_value_number"] == 700
+    assert plan.active_spike(now + timedelta(minutes=10)) is None
+
+    # Overrides are merged into immutable specs once per overlay, not per request
+    effective = active.effective_fields(plan.fields)
+    assert active.effective_fields(plan.fields) is effective
+    assert all(isinstance(f, FieldSpec) for f in effective)
+    assert [f.fixed_value_number for f in effective] == [700, None]
+    assert effective[1] is plan.fields[1]
+
+def test_public_endpoint_uses_plan(client, db, collection, api_key):
+    """The public endpoint generates from the plan and writes counter state behind."""
+    headers = {"X-API-Key": api_key}
+    values = []
+    for _ in range(3):
+        response = client.get("/api/data/Plan%20Collection/Performance", headers=headers)
+        assert response.status_code == 200
+        values.append(response.json()["data"]["Counter"])
+        assert response.json()["data"]["Fixed"] == 7
+    assert values == [1, 2, 3]
+
+    # Counter progress is written behind, not on every request
+    counter = db.query(Field).filter(Field.field_name == "Counter").first()
+    assert counter.current_number is None
+    assert counter_engine.flush() == 1
+    db.refresh(counter)
+    assert counter.current_number == 4
+
+def test_spike_timeline_matches_linear_scan():
+    """The interval index picks the same overlay as scanning overlays in start order."""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rng = random.Random(7)
+    overlays = []
+    for schedule_id in range(1, 30):
+        start = base + timedelta(minutes=rng.randrange(0, 500))
+        overlays.append(SpikeOverlay(schedule_id, start, start + timedelta(minutes=rng.randrange(1, 60))))
+    ordered = sorted(overlays, key=lambda o: (o.start_datetime, o.schedule_id))
+    timeline = SpikeTimeline(overlays)
+
+    probes = [base + timedelta(seconds=30 * i) for i in range(-10, 1200)]
+    probes += [o.start_datetime for o in overlays] + [o.end_datetime for o in overlays]
+    for now in probes:
+        expected = next((o for o in ordered if o.is_active(now)), None)
+        assert timeline.active_at(now) is expected
+
+def test_spike_schedule_offsets_are_stored_as_utc(db, collection):
+    """Non-UTC offsets are converted before SQLite drops them."""
+    now = datetime.now(timezone.utc)
+    plus_two = timezone(timedelta(hours=2))
+    schedule = SpikeSchedule(
+        collection_id=collection.id,
+        name="Offset",
+        start_datetime=(now - timedelta(minutes=5)).astimezone(plus_two),
+        end_datetime=(now + timedelta(minutes=5)).astimezone(plus_two)
+    )
+    db.add(schedule)
+    db.commit()
+    db.expire_all()
+
+    stored = db.query(SpikeSchedule).filter(SpikeSchedule.name == "Offset").first()
+    assert stored.start_datetime.tzinfo is not None
+    assert stored.start_datetime == now - timedelta(minutes=5)
+
+    plan = get_plan("Plan Collection", CollectionType.PERFORMANCE)
+    assert plan.active_spike(datetime.now(timezone.utc)).schedule_id == stored.id
+
+def test_spike_ticker_prewarms_and_releases(db, collection):
+    """Overlays are merged shortly before they start and released after they end."""
+    fixed = db.query(Field).filter(Field.field_name == "Fixed").first()
+    now = datetime.now(timezone.utc)
+    for name, starts_in in [("Soon", timedelta(minutes=1)), ("Later", timedelta(hours=1))]:
+        schedule = SpikeSchedule(
+            collection_id=collection.id,
+            name=name,
+            start_datetime=now + starts_in,
+            end_datetime=now + starts_in + timedelta(minutes=5)
+        )
+        db.add(schedule)
+        db.flush()
+        db.add(SpikeScheduleField(
+            spike_schedule_id=schedule.id,
+            original_field_id=fixed.id,
+            collection_type=CollectionType.PERFORMANCE,
+            field_name="Fixed",
+            value_type=ValueType.NUMBER_FIXED,
+            fixed_value_number=700
+        ))
+    db.commit()
+
+    plan = get_plan("Plan Collection", CollectionType.PERFORMANCE)
+    soon, later = plan.spike_overlays
+    assert not soon.compiled and not later.compiled
+
+    ticker = SpikeActivationTicker(plan_cache, interval_seconds=1, prewarm_seconds=5)
+    assert ticker.tick(now) == 0
+    assert ticker.tick(soon.start_datetime - timedelta(seconds=3)) == 1
+    assert soon.compiled and not later.compiled
+    assert ticker.tick(soon.start_datetime) == 0
+
+    # The first request of the spike finds the merged specs ready
+    assert plan.active_spike(soon.start_datetime).compiled
+
+    ticker.tick(soon.end_datetime + timedelta(seconds=1))
+    assert not soon.compiled
@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from app.core.metrics import LatencyHistogram, MetricsMiddleware, MetricsRegistry, PUBLIC_STAGE_SECONDS, metrics
+from app.models.field import ValueType
+
+@pytest.fixture(scope="function")
+def collection(make_collection):
+    return make_collection(
+        "Timed",
+        dict(field_name="value", value_type=ValueType.NUMBER_RANGE, range_start_number=1, range_end_number=10)
+    )
+
+def test_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram(bounds=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.005, 0.05, 0.5, 5.0):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["sum"] == pytest.approx(5.56)
+    assert snapshot["buckets"] == [(0.01, 2), (0.1, 3), (1.0, 4), (float("inf"), 5)]
+    assert snapshot["p50"] == 0.1
+    assert snapshot["p99"] == float("inf")
+    assert LatencyHistogram().snapshot()["p50"] is None
+
+def test_prometheus_rendering():
+    registry = MetricsRegistry()
+    registry.describe("demo_seconds", "Demo latency")
+    registry.histogram("demo_seconds", route='/a"b').observe(0.2)
+
+    text = registry.render_prometheus()
+    assert "# HELP demo_seconds Demo latency\n# TYPE demo_seconds histogram\n" in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="0.25"} 1' in text
+    assert 'demo_seconds_bucket{route="/a\\"b",le="+Inf"} 1' in text
+    assert 'demo_seconds_count{route="/a\\"b"} 1' in text
+
+def test_public_request_records_route_and_stages(client, collection, api_key):
+    response = client.get("/api/data/Timed/Performance", headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+
+    request = metrics.histogram(
+        "http_request_duration_seconds", method="GET",
+        route="/api/data/{collection_name}/{collection_type}", status="2xx"
+    )
+    assert request.count == 1
+    for stage in ("auth", "plan_load", "access_check", "spike_lookup", "generate"):
+        assert metrics.histogram(PUBLIC_STAGE_SECONDS, stage=stage).count == 1, stage
+
+    text = client.get("/api/metrics").text
+    assert 'public_stage_duration_seconds_count{stage="generate"} 1' in text
+
+def test_admin_metrics_requires_admin(client, admin_client, collection, api_key):
+    admin_client.get("/api/data/Timed/Performance", headers={"X-API-Key": api_key})
+    response = admin_client.get("/api/admin/metrics")
+    assert response.status_code == 200
+    stages = {
+        h["labels"]["stage"]: h for h in response.json()["histograms"]
+        if h["name"] == PUBLIC_STAGE_SECONDS
+    }
+    assert stages["generate"]["count"] == 1
+    assert stages["generate"]["p50_seconds"] is not None
+
+    admin_client.cookies.clear()
+    assert admin_client.get("/api/admin/metrics").status_code == 401
+
+def test_middleware_resolves_each_histogram_once(monkeypatch):
+    """Requests after the first for a route, method and status class only do lookups."""
+    registry = MetricsRegistry()
+    route = type("Route", (), {"path": "/items/{item_id}"})()
+
+    async def app(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": scope["status"]})
+
+    async def send(message):
+        pass
+
+    middleware = MetricsMiddleware(app, registry)
+    resolved = []
+    histogram = registry.histogram
+    monkeypatch.setattr(registry, "histogram", lambda name, **labels: resolved.append(labels) or histogram(name, **labels))
+
+    async def requests():
+        for status in (200, 204, 200, 404):
+            await middleware({"type": "http", "method": "GET", "status": status}, None, send)
+    asyncio.run(requests())
+
+    assert resolved == [
+        {"method": "GET", "route": "/items/{item_id}", "status": "2xx"},
+        {"method": "GET", "route": "/items/{item_id}", "status": "4xx"},
+    ]
+    assert histogram("http_request_duration_seconds", method="GET", route="/items/{item_id}", status="2xx").count == 3
@@ -0,0 +1,39 @@
+import asyncio
+from argon2 import PasswordHasher
+from app.auth import password
+from app.auth.password import hash_password, needs_rehash, ph, verify_password_async
+from app.core.metrics import metrics
+from app.models.user import User
+
+LOGIN = {"email": "admin@test.com", "password": "testpassword123"}
+
+def test_async_verify_runs_on_the_hashing_pool():
+    hashed = hash_password("secret")
+    assert asyncio.run(verify_password_async("secret", hashed)) is True
+    assert asyncio.run(verify_password_async("wrong", hashed)) is False
+    assert asyncio.run(verify_password_async("secret", "not-a-hash")) is False
+    assert metrics.histogram("password_hash_queue_seconds").count == 3
+    assert metrics.histogram("password_hash_duration_seconds").count == 3
+
+def test_needs_rehash_follows_cost_settings():
+    assert not needs_rehash(hash_password("secret"))
+    weak = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1).hash("secret")
+    assert needs_rehash(weak)
+
+def test_login_rehashes_outdated_hash(client, db, admin_user):
+    admin_user.password_hash = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1).hash(LOGIN["password"])
+    db.commit()
+
+    assert client.post("/api/auth/login", json=LOGIN).status_code == 200
+    db.refresh(admin_user)
+    assert not needs_rehash(admin_user.password_hash)
+    ph.verify(admin_user.password_hash, LOGIN["password"])
+
+    # The upgraded hash still logs in
+    assert client.post("/api/auth/login", json=LOGIN).status_code == 200
+
+def test_login_is_refused_when_hashing_queue_is_full(client, admin_user, monkeypatch):
+    monkeypatch.setattr(password.settings, "password_hash_max_pending", 0)
+    response = client.post("/api/auth/login", json=LOGIN)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
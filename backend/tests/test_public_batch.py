@@ -0,0 +1,50 @@
+import pytest
+from app.models.field import CollectionType, ValueType
+from tests.helpers import QueryCounter
+
+@pytest.fixture(scope="function")
+def collections(make_collection):
+    """Create ten collections with one Performance and one Configuration field each."""
+    for i in range(10):
+        make_collection(
+            f"Device {i}",
+            dict(field_name="cpu", value_type=ValueType.NUMBER_RANGE, range_start_number=0, range_end_number=100),
+            dict(
+                collection_type=CollectionType.CONFIGURATION,
+                field_name="hostname",
+                value_type=ValueType.TEXT_FIXED,
+                fixed_value_text=f"device-{i}"
+            )
+        )
+
+def test_batch_returns_payloads_and_errors(client, collections, api_key):
+    """Each item carries its payload or the error the single endpoint would return."""
+    response = client.post("/api/data/batch", headers={"X-API-Key": api_key}, json={"items": [
+        {"collection": "Device 0", "type": "performance"},
+        {"collection": "Device 1", "type": "Configuration"},
+        {"collection": "Missing", "type": "Performance"},
+        {"collection": "Device 2", "type": "Metrics"}
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert results[0]["type"] == "Performance"
+    assert 0 <= results[0]["data"]["cpu"] <= 100
+    assert results[1]["data"] == {"hostname": "device-1"}
+    assert results[2]["error"]["status_code"] == 403
+    assert results[3]["error"]["status_code"] == 400
+
+def test_batch_loads_plans_together(client, collections, api_key):
+    """Plan misses for every collection in the batch share one query per table."""
+    items = [{"collection": f"Device {i}", "type": "Performance"} for i in range(10)]
+    with QueryCounter() as counter:
+        response = client.post("/api/data/batch", headers={"X-API-Key": api_key}, json={"items": items})
+    assert response.status_code == 200
+    assert all("data" in result for result in response.json()["results"])
+    # api_keys, api_key_allowed, collections, fields, spike_schedules
+    assert len([s for s in counter.statements if s.lstrip().upper().startswith("SELECT")]) == 5
+
+def test_batch_requires_api_key(client, collections):
+    """The batch endpoint is authenticated like the single-collection endpoint."""
+    response = client.post("/api/data/batch", json={"items": []})
+    assert response.status_code == 401
@@ -0,0 +1,68 @@
+import pytest
+from app.models.field import Field, ValueType
+from app.generators.counter_engine import counter_engine
+from app.generators.value_generator import ValueGenerator
+
+@pytest.fixture(scope="function")
+def collection(make_collection):
+    """Create a Performance collection with range, fixed and counter fields."""
+    return make_collection(
+        "Load Test",
+        dict(field_name="requests", value_type=ValueType.NUMBER_RANGE, range_start_number=10, range_end_number=20),
+        dict(
+            field_name="latency",
+            value_type=ValueType.FLOAT_RANGE,
+            range_start_float=0.5,
+            range_end_float=1.5,
+            float_precision=3
+        ),
+        dict(field_name="site", value_type=ValueType.TEXT_FIXED, fixed_value_text="dc1"),
+        dict(
+            field_name="sequence",
+            value_type=ValueType.INCREMENT,
+            start_number=1,
+            step_number=1,
+            reset_number=100
+        )
+    )
+
+def test_samples_generate_consecutive_records(client, db, collection, api_key):
+    """Counters advance one step per record and only the final state is stored."""
+    response = client.get(
+        "/api/data/Load%20Test/Performance/samples",
+        params={"count": 250},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 250
+    records = body["records"]
+    assert len(records) == 250
+
+    assert [r["sequence"] for r in records] == [(i % 100) + 1 for i in range(250)]
+    assert all(10 <= r["requests"] <= 20 for r in records)
+    assert all(0.5 <= r["latency"] <= 1.5 for r in records)
+    assert {r["site"] for r in records} == {"dc1"}
+
+    # The next single poll continues where the samples left off
+    response = client.get("/api/data/Load%20Test/Performance", headers={"X-API-Key": api_key})
+    assert response.json()["data"]["sequence"] == 51
+
+    assert counter_engine.flush() == 1
+    sequence = db.query(Field).filter(Field.field_name == "sequence").first()
+    db.refresh(sequence)
+    assert sequence.current_number == 52
+
+def test_samples_count_limit(client, collection, api_key):
+    """Requests above samples_max_count are rejected."""
+    response = client.get(
+        "/api/data/Load%20Test/Performance/samples",
+        params={"count": 10 ** 9},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 400
+
+def test_generate_column_covers_range():
+    """Column generation draws from the full inclusive range."""
+    field = Field(value_type=ValueType.NUMBER_RANGE, range_start_number=1, range_end_number=3)
+    assert set(ValueGenerator.generate_column(field, 1000)) == {1, 2, 3}
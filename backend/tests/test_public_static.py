@@ -0,0 +1,86 @@
+import json
+import pytest
+from app.models.field import Field, CollectionType, ValueType
+from app.generators.field_spec import FieldSpec
+from app.generators.record_template import build_record_template
+
+@pytest.fixture(scope="function")
+def collection(make_collection):
+    """Create a Configuration collection made only of fixed values and an epoch."""
+    return make_collection(
+        "Inventory",
+        dict(field_name="hostname", value_type=ValueType.TEXT_FIXED, fixed_value_text="srv-ü1"),
+        dict(field_name="seen_at", value_type=ValueType.EPOCH_NOW),
+        dict(field_name="cores", value_type=ValueType.NUMBER_FIXED, fixed_value_number=16),
+        dict(
+            collection_type=CollectionType.PERFORMANCE,
+            field_name="load",
+            value_type=ValueType.FLOAT_RANGE,
+            range_start_float=0.0,
+            range_end_float=1.0
+        ),
+        collection_type=CollectionType.CONFIGURATION
+    )
+
+URL = "/api/data/Inventory/Configuration"
+
+def test_fixed_collection_is_served_with_etag(client, collection, api_key):
+    """The cached body matches a generated one, with the epoch patched in."""
+    headers = {"X-API-Key": api_key}
+    response = client.get(URL, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    body = response.json()
+    assert body["collection"] == "Inventory"
+    assert body["type"] == "Configuration"
+    assert body["data"] == {"hostname": "srv-ü1", "seen_at": body["generated_at_epoch"], "cores": 16}
+    assert list(body["data"]) == ["hostname", "seen_at", "cores"]
+
+    response = client.get(URL, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+def test_field_edit_changes_etag(admin_client, db, collection, api_key):
+    """Editing a field invalidates the cached body."""
+    headers = {"X-API-Key": api_key}
+    etag = admin_client.get(URL, headers=headers).headers["etag"]
+
+    cores = db.query(Field).filter(Field.field_name == "cores").first()
+    response = admin_client.patch(f"/api/admin/fields/{cores.id}", json={"fixed_value_number": 32})
+    assert response.status_code == 200
+
+    response = admin_client.get(URL, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["data"]["cores"] == 32
+
+def test_random_fields_are_not_cached(client, collection, api_key):
+    """Collections with generated values carry no ETag."""
+    response = client.get("/api/data/Inventory/Performance", headers={"X-API-Key": api_key})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+def test_record_template_splices_dynamic_values():
+    """Rendering matches encoding the equivalent record dict."""
+    fields = [
+        FieldSpec(id=1, field_name='name "quoted"', value_type=ValueType.TEXT_FIXED, fixed_value_text="a\nb"),
+        FieldSpec(id=2, field_name="now", value_type=ValueType.EPOCH_NOW),
+        FieldSpec(id=3, field_name="load", value_type=ValueType.FLOAT_RANGE, range_start_float=0.0, range_end_float=1.0),
+        FieldSpec(id=4, field_name="ratio", value_type=ValueType.FLOAT_FIXED, fixed_value_float=0.1),
+        FieldSpec(id=5, field_name="seq", value_type=ValueType.INCREMENT, start_number=1.0, step_number=1.0),
+    ]
+    template = build_record_template("Métrics", "Performance", fields)
+    assert template.etag is None
+    assert [f.id for f in template.dynamic_fields] == [3, 5]
+
+    body = template.render(1700000000, [0.25, 7.0])
+    assert json.loads(body) == {
+        "collection": "Métrics",
+        "type": "Performance",
+        "generated_at_epoch": 1700000000,
+        "data": {'name "quoted"': "a\nb", "now": 1700000000, "load": 0.25, "ratio": 0.1, "seq": 7.0}
+    }
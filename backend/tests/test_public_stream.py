@@ -0,0 +1,95 @@
+import json
+import pytest
+from app.core.config import settings
+from app.models.api_key import APIKey
+from app.models.field import ValueType
+from app.auth.api_key_usage import api_key_usage
+
+@pytest.fixture(scope="function")
+def collection(make_collection):
+    """Create a Performance collection with a fixed and a counter field."""
+    return make_collection(
+        "Live Feed",
+        dict(field_name="site", value_type=ValueType.TEXT_FIXED, fixed_value_text="dc1"),
+        dict(field_name="sequence", value_type=ValueType.INCREMENT, start_number=1, step_number=1)
+    )
+
+@pytest.fixture(autouse=True)
+def fast_streams(monkeypatch):
+    monkeypatch.setattr(settings, "stream_min_interval_seconds", 0.0)
+
+def test_ndjson_stream_emits_consecutive_records(client, db, collection, api_key):
+    """Each NDJSON line is one record and counters advance between them."""
+    with client.stream(
+        "GET", "/api/data/Live%20Feed/Performance/stream",
+        params={"interval": 0.01, "limit": 5},
+        headers={"X-API-Key": api_key}
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert [line["data"]["sequence"] for line in lines] == [1, 2, 3, 4, 5]
+    assert {line["data"]["site"] for line in lines} == {"dc1"}
+
+    # The whole stream is recorded as a single request
+    api_key_usage.flush()
+    key = db.query(APIKey).first()
+    db.refresh(key)
+    assert key.request_count == 1
+
+def test_sse_stream_format(client, collection, api_key):
+    """Server-Sent Events carry an id and a JSON data line per record."""
+    with client.stream(
+        "GET", "/api/data/Live%20Feed/Performance/stream",
+        params={"interval": 0.01, "limit": 2, "format": "sse"},
+        headers={"X-API-Key": api_key}
+    ) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = response.read().decode()
+
+    events = [event for event in body.split("\n\n") if event]
+    assert len(events) == 2
+    event_id, data = events[1].split("\n")
+    assert event_id == "id: 2"
+    assert json.loads(data[len("data: "):])["data"]["sequence"] == 2
+
+def test_stream_errors_before_streaming(client, collection, api_key, monkeypatch):
+    """Lookup and validation errors are returned as normal HTTP errors."""
+    response = client.get("/api/data/Missing/Performance/stream", headers={"X-API-Key": api_key})
+    assert response.status_code == 403
+
+    monkeypatch.setattr(settings, "stream_min_interval_seconds", 1.0)
+    response = client.get(
+        "/api/data/Live%20Feed/Performance/stream",
+        params={"interval": 0.5},
+        headers={"X-API-Key": api_key}
+    )
+    assert response.status_code == 400
+
+def test_revoking_key_ends_open_stream(client, db, collection, api_key, monkeypatch):
+    """A key revoked mid-stream gets an error event instead of further records."""
+    from app.api import public
+    from app.auth.api_key_cache import api_key_cache
+    from app.models.api_key import APIKeyStatus
+
+    format_event = public.format_stream_event
+
+    def revoke_after_second_record(payload, stream_format, event_id):
+        if event_id == 2:
+            key = db.query(APIKey).first()
+            key.status = APIKeyStatus.REVOKED
+            db.commit()
+            api_key_cache.invalidate_key(key.id)
+        return format_event(payload, stream_format, event_id)
+
+    monkeypatch.setattr(public, "format_stream_event", revoke_after_second_record)
+    with client.stream(
+        "GET", "/api/data/Live%20Feed/Performance/stream",
+        params={"interval": 0.01, "limit": 6},
+        headers={"X-API-Key": api_key}
+    ) as response:
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert [line["data"]["sequence"] for line in lines[:2]] == [1, 2]
+    assert lines[2:] == [{"error": {"status_code": 401, "detail": "Invalid API key"}}]
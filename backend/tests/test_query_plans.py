@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.models.api_key import APIKeyAllowed
+from app.models.collection import Collection
+from app.models.field import Field, CollectionType, ValueType
+from app.models.spike_schedule import SpikeSchedule
+from app.models.spike_schedule_field import SpikeScheduleField
+from app.generators.generation_plan import load_generation_plans
+from app.auth.api_key_auth import hash_api_key, load_api_key_principal
+from tests.helpers import QueryCounter
+
+@pytest.fixture(scope="function")
+def seeded(db, admin_user, api_key):
+    """A collection with a field, an active spike override and an API key grant."""
+    collection = Collection(name="Indexed", owner_id=admin_user.id)
+    db.add(collection)
+    db.flush()
+    field = Field(
+        collection_id=collection.id,
+        collection_type=CollectionType.PERFORMANCE,
+        field_name="value",
+        value_type=ValueType.NUMBER_FIXED,
+        fixed_value_number=1
+    )
+    now = datetime.now(timezone.utc)
+    schedule = SpikeSchedule(
+        collection_id=collection.id,
+        name="Spike",
+        start_datetime=now - timedelta(minutes=5),
+        end_datetime=now + timedelta(minutes=5)
+    )
+    db.add_all([field, schedule])
+    db.flush()
+    db.add(SpikeScheduleField(
+        spike_schedule_id=schedule.id,
+        original_field_id=field.id,
+        collection_type=CollectionType.PERFORMANCE,
+        field_name="value",
+        value_type=ValueType.NUMBER_FIXED,
+        fixed_value_number=10
+    ))
+    principal_key = load_api_key_principal(hash_api_key(api_key), db)
+    db.add(APIKeyAllowed(api_key_id=principal_key.id, collection_id=collection.id))
+    db.commit()
+    return api_key
+
+def query_plans(db, counter):
+    """Map each table read by the captured SELECTs to its EXPLAIN QUERY PLAN details."""
+    plans = {}
+    connection = db.connection()
+    for statement, parameters in zip(counter.statements, counter.parameters):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            detail = row[-1]
+            table = detail.split()[1]
+            plans.setdefault(table, []).append(detail)
+    return plans
+
+def test_public_lookups_use_composite_indexes(db, seeded):
+    """Plan and API key loading must search the composite indexes, not scan tables."""
+    with QueryCounter() as counter:
+        plans = load_generation_plans(db, [("Indexed", CollectionType.PERFORMANCE)])
+        principal = load_api_key_principal(hash_api_key(seeded), db)
+    assert plans and principal.allowed
+
+    details = query_plans(db, counter)
+    expected = {
+        "fields": "ix_fields_collection_id_collection_type",
+        "spike_schedules": "ix_spike_schedules_collection_id_start_end",
+        "spike_schedule_fields": "ix_spike_schedule_fields_schedule_id_collection_type",
+        "api_key_allowed": "ix_api_key_allowed_api_key_id_collection_id"
+    }
+    for table, index in expected.items():
+        assert any(d.startswith(f"SEARCH {table} USING INDEX {index}") for d in details[table]), details[table]
@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from app.core.request_accounting import RequestAccounting, request_accounting, request_totals
+from app.models.field import ValueType
+from app.models.request_count import RequestCountMinute, RequestCountDaily
+from tests.helpers import TestingSessionLocal
+
+@pytest.fixture(scope="function")
+def collection(make_collection):
+    return make_collection(
+        "Counted",
+        dict(field_name="value", value_type=ValueType.NUMBER_FIXED, fixed_value_number=1)
+    )
+
+def test_flush_rolls_up_minutes_and_days(db):
+    """Repeated flushes add to the existing aggregate rows."""
+    accounting = RequestAccounting(flush_interval_seconds=60, session_factory=TestingSessionLocal, shards=4)
+    for _ in range(3):
+        accounting.record(1, 10, "performance")
+    accounting.record(2, 10, "performance")
+    accounting.record(5, 11, "configuration")
+    assert accounting.flush() == 3
+    assert accounting.flush() == 0
+
+    accounting.record(1, 10, "performance", count=2)
+    assert accounting.flush() == 1
+
+    rows = {
+        (r.api_key_id, r.collection_id, r.collection_type): r.count
+        for r in db.query(RequestCountMinute).all()
+    }
+    # A minute boundary may split the counts across rows
+    assert sum(rows.values()) == 7
+    assert {k[:2] for k in rows} == {(1, 10), (2, 10), (5, 11)}
+    assert request_totals(db)["today"] == 7
+
+def test_failed_flush_keeps_counts(db, monkeypatch):
+    accounting = RequestAccounting(flush_interval_seconds=60, session_factory=TestingSessionLocal)
+    accounting.record(1, 10, "performance")
+    monkeypatch.setattr(accounting, "_prune", lambda session: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        accounting.flush()
+    monkeypatch.undo()
+    assert accounting.flush() == 1
+    assert db.query(RequestCountDaily).one().count == 1
+
+def test_request_totals_cover_the_month(db):
+    today = date(2026, 3, 15)
+    db.add_all([
+        RequestCountDaily(day=date(2026, 2, 28), count=100),
+        RequestCountDaily(day=date(2026, 3, 1), count=5),
+        RequestCountDaily(day=date(2026, 3, 14), count=7),
+        RequestCountDaily(day=today, count=3)
+    ])
+    db.commit()
+    assert request_totals(db, today) == {"today": 3, "month": 15}
+
+def test_prune_drops_expired_minutes(db):
+    old = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
+    db.add(RequestCountMinute(bucket_start=old, api_key_id=1, collection_id=1, collection_type="performance", count=1))
+    db.commit()
+    accounting = RequestAccounting(flush_interval_seconds=60, session_factory=TestingSessionLocal)
+    accounting.record(1, 1, "performance")
+    accounting.flush()
+    assert db.query(RequestCountMinute).filter(RequestCountMinute.bucket_start == old).count() == 0
+
+def test_dashboard_stats_count_public_requests(admin_client, collection, api_key):
+    headers = {"X-API-Key": api_key}
+    assert admin_client.get("/api/data/Counted/Performance", headers=headers).status_code == 200
+    assert admin_client.get("/api/data/Counted/Performance/samples?count=3", headers=headers).status_code == 200
+    response = admin_client.post("/api/data/batch", headers=headers, json={"items": [
+        {"collection": "Counted", "type": "Performance"},
+        {"collection": "Missing", "type": "Performance"}
+    ]})
+    assert response.status_code == 200
+
+    # Nothing reaches the database until the write-behind flush
+    assert admin_client.get("/api/admin/stats").json()["total_requests_today"] == 0
+    request_accounting.flush()
+
+    stats = admin_client.get("/api/admin/stats").json()
+    assert stats["total_api_keys"] == 1
+    assert stats["total_requests_today"] == 3
+    assert stats["total_requests_month"] == 3
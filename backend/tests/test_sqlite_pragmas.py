@@ -0,0 +1,38 @@
+import asyncio
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.database import apply_sqlite_pragmas
+
+def read_pragmas(connection):
+    return {
+        name: connection.execute(text(f"PRAGMA {name}")).scalar()
+        for name in ["journal_mode", "synchronous", "cache_size", "temp_store", "busy_timeout"]
+    }
+
+EXPECTED = {
+    "journal_mode": "wal",
+    "synchronous": 1,    # NORMAL
+    "cache_size": -65536,
+    "temp_store": 2,     # MEMORY
+    "busy_timeout": 5000
+}
+
+def test_profile_applied_to_sync_connections(tmp_path):
+    """Every new connection gets the configured profile."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    with engine.connect() as connection:
+        assert read_pragmas(connection) == EXPECTED
+    engine.dispose()
+
+def test_profile_applied_to_async_connections(tmp_path):
+    """The aiosqlite engine used by the public endpoints gets the same profile."""
+    async def check():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+        async with engine.connect() as connection:
+            pragmas = await connection.run_sync(read_pragmas)
+        await engine.dispose()
+        return pragmas
+    assert asyncio.run(check()) == EXPECTED
@@ -0,0 +1,23 @@
+import start_server
+from start_server import uvicorn_options
+
+def test_production_options_come_from_settings(monkeypatch):
+    """Without reload the launcher runs the configured workers."""
+    monkeypatch.setattr(start_server.settings, "server_reload", False)
+    monkeypatch.setattr(start_server.settings, "server_workers", 4)
+    monkeypatch.setattr(start_server.settings, "server_limit_concurrency", 200)
+
+    options = uvicorn_options()
+    assert options["workers"] == 4
+    assert "reload" not in options
+    assert options["limit_concurrency"] == 200
+    assert options["backlog"] == start_server.settings.server_backlog
+    assert options["timeout_graceful_shutdown"] == start_server.settings.server_graceful_shutdown_seconds
+
+def test_reload_runs_a_single_process(monkeypatch):
+    monkeypatch.setattr(start_server.settings, "server_reload", True)
+    monkeypatch.setattr(start_server.settings, "server_workers", 4)
+
+    options = uvicorn_options()
+    assert options["reload"] is True
+    assert "workers" not in options
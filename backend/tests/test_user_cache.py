@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from app.models.user import User
+from app.auth.user_cache import user_cache
+from tests.helpers import QueryCounter
+
+def login(client, email):
+    response = client.post("/api/auth/login", json={"email": email, "password": "testpassword123"})
+    assert response.status_code == 200
+
+def test_admin_reads_do_not_query_users_or_write(admin_client):
+    """After login the user is loaded once and last_login_at is fresh."""
+    with QueryCounter() as counter:
+        for _ in range(3):
+            assert admin_client.get("/api/auth/me").status_code == 200
+    assert len(counter.statements) == 1
+    assert counter.statements[0].startswith("SELECT")
+
+def test_last_login_is_coalesced(admin_client, db, admin_user):
+    """A stale last_login_at is refreshed once, not on every request."""
+    db.query(User).filter(User.id == admin_user.id).update(
+        {User.last_login_at: datetime.utcnow() - timedelta(hours=1)}
+    )
+    db.commit()
+    user_cache.clear()
+
+    with QueryCounter() as counter:
+        for _ in range(3):
+            assert admin_client.get("/api/auth/me").status_code == 200
+    updates = [s for s in counter.statements if s.startswith("UPDATE users")]
+    assert len(updates) == 1
+    db.refresh(admin_user)
+    assert admin_user.last_login_at > datetime.utcnow() - timedelta(minutes=1)
+
+def test_role_change_applies_to_next_request(client, db, admin_user, editor_user):
+    login(client, "editor@test.com")
+    assert client.get("/api/admin/stats").status_code == 200
+
+    # Demote the editor through the admin API from a separate session
+    client.post("/api/auth/logout")
+    login(client, "admin@test.com")
+    response = client.patch(f"/api/admin/users/{editor_user.id}", json={"role": "Viewer"})
+    assert response.status_code == 200
+
+    login(client, "editor@test.com")
+    assert client.get("/api/admin/stats").status_code == 403
+
+def test_deleted_user_is_rejected(client, db, admin_user, editor_user):
+    login(client, "editor@test.com")
+    editor_cookie = client.cookies.get("session_token")
+    assert client.get("/api/auth/me").status_code == 200
+
+    login(client, "admin@test.com")
+    assert client.delete(f"/api/admin/users/{editor_user.id}").status_code == 200
+
+    client.cookies.set("session_token", editor_cookie)
+    assert client.get("/api/auth/me").status_code == 401
+
+def test_profile_update_uses_the_user_row(admin_client, db, admin_user):
+    response = admin_client.patch("/api/admin/profile", json={"username": "renamed"})
+    assert response.status_code == 200
+    assert response.json()["username"] == "renamed"
+    assert admin_client.get("/api/auth/me").json()["username"] == "renamed"
@@ -0,0 +1,201 @@
+import pytest
+from decimal import Decimal
+from app.models.field import Field, CollectionType, ValueType
+from app.generators.value_generator import ValueGenerator
+
+np = pytest.importorskip("numpy")
+
+from app.generators import vectorized
+from app.generators.vectorized import NumpyValueGenerator, batch_generator
+
+
+def make_field(value_type, **kwargs):
+    return Field(
+        id=kwargs.pop("id", 1),
+        collection_id=1,
+        collection_type=CollectionType.PERFORMANCE,
+        field_name=kwargs.pop("field_name", "value"),
+        value_type=value_type,
+        **kwargs
+    )
+
+
+@pytest.fixture
+def generator():
+    return NumpyValueGenerator(seed=1234)
+
+
+def test_columns_keep_field_order_and_fixed_values(generator):
+    fields = [
+        make_field(ValueType.TEXT_FIXED, fixed_value_text="dc1"),
+        make_field(ValueType.NUMBER_RANGE, range_start_number=1, range_end_number=6),
+        make_field(ValueType.FLOAT_FIXED, fixed_value_float=2.5),
+        make_field(ValueType.FLOAT_RANGE, range_start_float=0.0, range_end_float=1.0),
+        make_field(ValueType.NUMBER_FIXED, fixed_value_number=7),
+    ]
+    columns = generator.generate_columns(fields, 50)
+    assert [len(c) for c in columns] == [50] * 5
+    assert columns[0] == ["dc1"] * 50
+    assert columns[2] == [2.5] * 50
+    assert columns[4] == [7] * 50
+    assert all(isinstance(v, int) for v in columns[1])
+    assert all(isinstance(v, float) for v in columns[3])
+
+
+def test_number_range_is_inclusive_and_matches_scalar(generator):
+    field = make_field(ValueType.NUMBER_RANGE, range_start_number=-2, range_end_number=3)
+    column = generator.generate_columns([field], 5000)[0]
+    assert set(column) == set(ValueGenerator.generate_column(field, 5000)) == set(range(-2, 4))
+
+
+def test_float_range_bounds_mean_and_precision(generator):
+    fields = [
+        make_field(ValueType.FLOAT_RANGE, range_start_float=10.0, range_end_float=20.0, float_precision=3),
+        make_field(ValueType.FLOAT_RANGE, range_start_float=-1.0, range_end_float=1.0),
+    ]
+    vectorized_columns = generator.generate_columns(fields, 20000)
+    scalar_columns = ValueGenerator.generate_columns(fields, 20000)
+    for field, column, scalar in zip(fields, vectorized_columns, scalar_columns):
+        precision = field.float_precision or 2
+        assert min(column) >= field.range_start_float
+        assert max(column) <= field.range_end_float
+        assert all(round(v, precision) == v for v in column)
+        assert np.mean(column) == pytest.approx(np.mean(scalar), abs=0.1)
+
+
+@pytest.mark.parametrize("value_type,start,step,reset", [
+    (ValueType.INCREMENT, 0.0, 1.5, None),
+    (ValueType.INCREMENT, 0.0, 1.5, 10.0),
+    (ValueType.DECREMENT, 100.0, 7.0, None),
+    (ValueType.DECREMENT, 100.0, 7.0, 50.0),
+])
+@pytest.mark.parametrize("current_number", [None, 3.0])
+def test_counter_sequence_matches_scalar(generator, value_type, start, step, reset, current_number):
+    field = make_field(value_type, start_number=start, step_number=step, reset_number=reset)
+    expected = ValueGenerator.advance_counter_many(field, current_number, 40)
+    assert generator.advance_counter_many(field, current_number, 40) == expected
+
+
+def test_randomized_steps_are_bounded_and_non_negative(generator):
+    field = make_field(
+        ValueType.INCREMENT, start_number=0.0, step_number=10.0, randomization_percentage=150.0
+    )
+    values, final = generator.advance_counter_many(field, None, 1000)
+    steps = np.diff(values + [final])
+    assert steps.min() >= 0
+    assert steps.max() <= 25.0
+    assert values[0] == 0.0
+
+
+def test_batch_generator_respects_setting(monkeypatch):
+    monkeypatch.setattr(vectorized.settings, "generator_backend", "python")
+    assert batch_generator() is ValueGenerator
+    monkeypatch.setattr(vectorized.settings, "generator_backend", "auto")
+    assert isinstance(batch_generator(), NumpyValueGenerator)
+
+
+SAMPLE_SIZE = 20000
+
+
+def decimal_places(value):
+    return max(0, -Decimal(repr(value)).as_tuple().exponent)
+
+
+@pytest.mark.parametrize("kwargs,value_type,bounds", [
+    (dict(range_start_number=-50, range_end_number=50), ValueType.NUMBER_RANGE, (-50, 50)),
+    (dict(range_start_number=7, range_end_number=7), ValueType.NUMBER_RANGE, (7, 7)),
+    (dict(range_start_float=0.0, range_end_float=1.0, float_precision=1), ValueType.FLOAT_RANGE, (0.0, 1.0)),
+    (dict(range_start_float=-5.0, range_end_float=5.0, float_precision=4), ValueType.FLOAT_RANGE, (-5.0, 5.0)),
+    (dict(range_start_float=100.0, range_end_float=1000.0), ValueType.FLOAT_RANGE, (100.0, 1000.0)),
+    (dict(fixed_value_text="eu-west"), ValueType.TEXT_FIXED, None),
+    (dict(fixed_value_number=3), ValueType.NUMBER_FIXED, None),
+    (dict(fixed_value_float=0.25), ValueType.FLOAT_FIXED, None),
+    (dict(), ValueType.EPOCH_NOW, None),
+])
+def test_columns_match_scalar_bounds_types_and_precision(generator, kwargs, value_type, bounds):
+    """Over a large sample both paths emit the same types, bounds and decimal places."""
+    field = make_field(value_type, **kwargs)
+    column = generator.generate_columns([field], SAMPLE_SIZE)[0]
+    scalar = ValueGenerator.generate_columns([field], SAMPLE_SIZE)[0]
+
+    assert len(column) == SAMPLE_SIZE
+    assert {type(v) for v in column} == {type(v) for v in scalar}
+    if bounds is None:
+        assert set(column) == set(scalar)
+        return
+
+    low, high = bounds
+    assert low <= min(column) and max(column) <= high
+    if value_type == ValueType.NUMBER_RANGE:
+        # Every value in the inclusive range is drawn by both paths
+        assert set(column) == set(scalar) == set(range(low, high + 1))
+    else:
+        places = {decimal_places(v) for v in column}
+        assert max(places) == max(decimal_places(v) for v in scalar) == (field.float_precision or 2)
+        assert np.mean(column) == pytest.approx(np.mean(scalar), abs=(high - low) * 0.02)
+
+
+@pytest.mark.parametrize("value_type,start,step,reset,percentage", [
+    (ValueType.INCREMENT, 0.0, 2.5, None, 40.0),
+    (ValueType.INCREMENT, 0.0, 2.5, 100.0, 40.0),
+    (ValueType.INCREMENT, 10.0, 1.0, 30.0, 150.0),
+    (ValueType.DECREMENT, 1000.0, 3.0, None, 25.0),
+    (ValueType.DECREMENT, 1000.0, 3.0, 900.0, 25.0),
+])
+@pytest.mark.parametrize("current_number", [None, 20.0])
+def test_randomized_counter_matches_advance_counter(
+    monkeypatch, value_type, start, step, reset, percentage, current_number
+):
+    """Fed the same randomized steps, advance_counter() emits the vectorized sequence."""
+    field = make_field(
+        value_type, start_number=start, step_number=step,
+        reset_number=reset, randomization_percentage=percentage
+    )
+    count = 2000
+    values, final = NumpyValueGenerator(seed=99).advance_counter_many(field, current_number, count)
+
+    # Replay the steps the seeded generator drew, computed as ValueGenerator does
+    factors = np.random.default_rng(99).uniform(-percentage / 100, percentage / 100, size=count)
+    steps = iter([max(0, step * (1 + factor)) for factor in factors.tolist()])
+    monkeypatch.setattr(ValueGenerator, "_apply_randomization", staticmethod(lambda step, percentage: next(steps)))
+
+    expected = []
+    state = current_number
+    for _ in range(count):
+        value, state = ValueGenerator.advance_counter(field, state)
+        expected.append(value)
+    assert values == expected
+    assert final == state
+    assert {type(v) for v in values} == {float}
+    if reset is not None:
+        low, high = (start, reset) if value_type == ValueType.INCREMENT else (reset, start)
+        assert all(low <= v <= high for v in values[1:])
+
+
+def test_chunked_counter_advances_match_single_steps(generator):
+    """Advancing in chunks of any size continues the one-step-at-a-time sequence."""
+    field = make_field(ValueType.DECREMENT, start_number=50.0, step_number=0.75, reset_number=-10.0)
+    expected = []
+    state = None
+    for _ in range(1000):
+        value, state = ValueGenerator.advance_counter(field, state)
+        expected.append(value)
+
+    values = []
+    current_number = None
+    for size in [1, 7, 250, 3, 400, 339]:
+        chunk, current_number = generator.advance_counter_many(field, current_number, size)
+        values.extend(chunk)
+    assert values == expected
+    assert current_number == state
+
+
+@pytest.mark.parametrize("precision", [1, 3, 5, 6])
+def test_float_rounding_matches_python_round(precision):
+    """Float draws are rounded exactly as round() rounds them, at every precision."""
+    field = make_field(
+        ValueType.FLOAT_RANGE, range_start_float=0.0, range_end_float=1000000.0, float_precision=precision
+    )
+    column = NumpyValueGenerator(seed=7).generate_columns([field], 500000)[0]
+    draws = np.random.default_rng(7).uniform([0.0], [1000000.0], size=(500000, 1))[:, 0].tolist()
+    assert column == [round(value, precision) for value in draws]
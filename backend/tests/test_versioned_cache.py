@@ -0,0 +1,59 @@
+import time
+from app.core.shared_generation import SharedGeneration
+from app.core.versioned_cache import VersionedTTLCache
+
+def test_put_after_racing_invalidation_is_dropped():
+    """A value loaded before an invalidation finished is not stored."""
+    cache = VersionedTTLCache(ttl_seconds=60)
+    version = cache.version
+    cache.invalidate("a")
+    cache.put("a", 1, version)
+    assert cache.get("a") is None
+
+    cache.put("a", 2, cache.version)
+    assert cache.get("a") == 2
+
+def test_entries_expire_and_evict_least_recently_used(monkeypatch):
+    cache = VersionedTTLCache(ttl_seconds=10, max_size=2)
+    cache.put_many({"a": 1, "b": 2}, cache.version)
+    assert cache.get("a") == 1
+    cache.put("c", 3, cache.version)
+    assert cache.get("b") is None
+    assert sorted(cache.values()) == [1, 3]
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("a") is None
+
+def test_invalidate_where_and_disabled_cache():
+    cache = VersionedTTLCache(ttl_seconds=60)
+    cache.put_many({"a": 1, "b": 2}, cache.version)
+    cache.invalidate_where(lambda value: value == 2)
+    assert cache.values() == [1]
+
+    disabled = VersionedTTLCache(ttl_seconds=0)
+    disabled.put("a", 1, disabled.version)
+    assert disabled.get("a") is None
+
+def test_invalidation_reaches_caches_sharing_a_generation(tmp_path):
+    """Two workers' caches on one shared file see each other's invalidations."""
+    path = str(tmp_path / "generations")
+    first = VersionedTTLCache(ttl_seconds=60, shared=SharedGeneration(path, 0))
+    second = VersionedTTLCache(ttl_seconds=60, shared=SharedGeneration(path, 0))
+    other_slot = VersionedTTLCache(ttl_seconds=60, shared=SharedGeneration(path, 1))
+    for cache in (first, second, other_slot):
+        cache.put_many({"a": 1, "b": 2}, cache.version)
+
+    loading = second.version
+    first.invalidate("a")
+    assert first.values() == [2]
+    assert second.get("b") is None
+    second.put("a", 1, loading)
+    assert second.get("a") is None
+    assert sorted(other_slot.values()) == [1, 2]
+
+    second.put("a", 3, second.version)
+    assert second.get("a") == 3
+    second.clear()
+    first.invalidate("b")
+    assert first.get("b") is None and second.get("a") is None
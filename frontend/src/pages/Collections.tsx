@@ -1,8 +1,14 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { collectionsApi } from '../services/api';
 import type { Collection } from '../types/api';
 
+// Collections are listed a page at a time in summary mode (field counts, no field lists)
+const PAGE_SIZE = 60;
+const SEARCH_DELAY_MS = 250;
+
+type CollectionSort = 'created' | 'name';
+
 interface DeleteConfirmationDialogProps {
   isOpen: boolean;
   collections: Collection[];
@@ -78,6 +84,10 @@ export default function Collections() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
+  const [sort, setSort] = useState<CollectionSort>('created');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const latestRequest = useRef(0);
   const [selectedCollections, setSelectedCollections] = useState<Set<number>>(new Set());
   const [showDeleteDialog, setShowDeleteDialog] = useState(false);
   const [deleting, setDeleting] = useState(false);
@@ -88,19 +98,51 @@ export default function Collections() {
   const [copying, setCopying] = useState(false);
 
   useEffect(() => {
-    loadCollections();
-  }, []);
+    // Search runs on the server as a name prefix match; wait for typing to pause
+    const timer = setTimeout(() => loadCollections(), searchTerm ? SEARCH_DELAY_MS : 0);
+    return () => clearTimeout(timer);
+  }, [searchTerm, sort]);
+
+  const fetchPage = (cursor?: string) =>
+    collectionsApi.listPage({
+      summary: true,
+      q: searchTerm.trim() || undefined,
+      sort,
+      order: 'asc',
+      limit: PAGE_SIZE,
+      cursor,
+    });
 
   const loadCollections = async () => {
+    const request = ++latestRequest.current;
     try {
-      setLoading(true);
       setError('');
-      const data = await collectionsApi.list();
-      setCollections(data);
+      const page = await fetchPage();
+      // Drop responses for a search term that has since changed
+      if (request !== latestRequest.current) return;
+      setCollections(page.items);
+      setNextCursor(page.nextCursor);
+    } catch (err: any) {
+      if (request !== latestRequest.current) return;
+      setError(err.response?.data?.detail || 'Failed to load collections');
+    } finally {
+      if (request === latestRequest.current) setLoading(false);
+    }
+  };
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    const request = latestRequest.current;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      if (request !== latestRequest.current) return;
+      setCollections(current => [...current, ...page.items]);
+      setNextCursor(page.nextCursor);
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to load collections');
     } finally {
-      setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -135,50 +177,8 @@ export default function Collections() {
     setCopyCount(1);
   };
 
-  // Search function across collections and fields
-  const filteredCollections = collections.filter(collection => {
-    if (!searchTerm) return true;
-    
-    const term = searchTerm.toLowerCase();
-    
-    // Search collection name and description
-    if (collection.name.toLowerCase().includes(term) || 
-        collection.description?.toLowerCase().includes(term)) {
-      return true;
-    }
-    
-    // Search in field names, types, and field values (if fields exist)
-    if (collection.fields && collection.fields.length > 0) {
-      return collection.fields.some(field => 
-        field.field_name.toLowerCase().includes(term) ||
-        field.value_type.toLowerCase().includes(term) ||
-        (field.fixed_value_text && field.fixed_value_text.toLowerCase().includes(term)) ||
-        (field.fixed_value_number && field.fixed_value_number.toString().includes(term)) ||
-        (field.fixed_value_float && field.fixed_value_float.toString().includes(term)) ||
-        (field.range_start_number && field.range_start_number.toString().includes(term)) ||
-        (field.range_end_number && field.range_end_number.toString().includes(term)) ||
-        (field.range_start_float && field.range_start_float.toString().includes(term)) ||
-        (field.range_end_float && field.range_end_float.toString().includes(term)) ||
-        (field.start_number && field.start_number.toString().includes(term)) ||
-        (field.step_number && field.step_number.toString().includes(term)) ||
-        (field.reset_number && field.reset_number.toString().includes(term))
-      );
-    }
-    
-    return false;
-  });
-
-  const getSearchMatchType = (collection: Collection) => {
-    if (!searchTerm) return null;
-    const term = searchTerm.toLowerCase();
-    
-    if (collection.name.toLowerCase().includes(term) || 
-        collection.description?.toLowerCase().includes(term)) {
-      return 'collection';
-    }
-    
-    return 'field';
-  };
+  // Filtering happens on the server, so every loaded collection matches the search
+  const filteredCollections = collections;
 
   const toggleSelection = (collectionId: number) => {
     const newSelected = new Set(selectedCollections);
@@ -198,13 +198,16 @@ export default function Collections() {
     }
   };
 
+  const fieldCount = (collection: Collection) =>
+    collection.field_count ?? collection.fields?.length ?? 0;
+
   const calculateCascadeInfo = (selectedCollectionIds: number[]) => {
     const selectedCollectionObjects = collections.filter(c => selectedCollectionIds.includes(c.id));
     
     let totalFields = 0;
     
     selectedCollectionObjects.forEach(collection => {
-      totalFields += collection.fields?.length || 0;
+      totalFields += fieldCount(collection);
       // Note: We don't have API key permission count in the frontend data
       // The backend will provide this info in the response
     });
@@ -324,17 +327,28 @@ export default function Collections() {
             id="search"
             name="search"
             className="block w-full pl-10 pr-3 py-2 border border-gray-300 rounded-md leading-5 bg-white placeholder-gray-500 focus:outline-none focus:placeholder-gray-400 focus:ring-1 focus:ring-blue-500 focus:border-blue-500"
-            placeholder="Search collections and fields..."
+            placeholder="Search collections by name..."
             type="search"
             value={searchTerm}
             onChange={(e) => setSearchTerm(e.target.value)}
           />
         </div>
-        {searchTerm && (
-          <p className="mt-2 text-sm text-gray-600">
-            Found {filteredCollections.length} collection{filteredCollections.length !== 1 ? 's' : ''}
+        <div className="mt-2 flex items-center justify-between">
+          <p className="text-sm text-gray-600">
+            {searchTerm ? 'Found' : 'Showing'} {filteredCollections.length}{nextCursor ? '+' : ''} collection{filteredCollections.length !== 1 ? 's' : ''}
           </p>
-        )}
+          <label className="flex items-center text-sm text-gray-700">
+            <span className="mr-2">Sort by</span>
+            <select
+              value={sort}
+              onChange={(e) => setSort(e.target.value as CollectionSort)}
+              className="border border-gray-300 rounded-md px-2 py-1 text-sm"
+            >
+              <option value="created">Created</option>
+              <option value="name">Name</option>
+            </select>
+          </label>
+        </div>
       </div>
 
       {error && (
@@ -367,7 +381,6 @@ export default function Collections() {
           ) : (
             <div className="grid grid-cols-1 gap-6 sm:grid-cols-2 lg:grid-cols-3">
               {filteredCollections.map((collection) => {
-                const matchType = getSearchMatchType(collection);
                 const isSelected = selectedCollections.has(collection.id);
                 
                 return (
@@ -376,9 +389,7 @@ export default function Collections() {
                   className={`relative rounded-lg border p-6 shadow-sm hover:shadow-md transition-shadow ${
                     isSelected 
                       ? "border-blue-500 bg-blue-50" 
-                      : matchType 
-                        ? "border-blue-300 bg-blue-25" 
-                        : "border-gray-300 bg-white"
+                      : "border-gray-300 bg-white"
                   }`}
                 >
                   {/* Checkbox - positioned to avoid card click area */}
@@ -395,14 +406,6 @@ export default function Collections() {
                     />
                   </div>
 
-                  {matchType === "field" && searchTerm && (
-                    <div className="absolute top-2 right-2">
-                      <span className="inline-flex items-center px-2 py-1 rounded-full text-xs font-medium bg-yellow-100 text-yellow-800">
-                        Match in fields
-                      </span>
-                    </div>
-                  )}
-
                   <div className="flex items-center space-x-3 ml-8">
                     <div className="flex-shrink-0">
                       <div className="w-10 h-10 bg-blue-100 rounded-lg flex items-center justify-center">
@@ -422,7 +425,7 @@ export default function Collections() {
                         </p>
                       </Link>
                       <p className="text-sm text-gray-500">
-                        {collection.fields?.length || 0} field{(collection.fields?.length || 0) !== 1 ? 's' : ''}
+                        {fieldCount(collection)} field{fieldCount(collection) !== 1 ? 's' : ''}
                       </p>
                       {collection.owner_username && (
                         <p className="text-xs text-gray-400">
@@ -470,6 +473,17 @@ export default function Collections() {
               );})}
             </div>
           )}
+          {nextCursor && (
+            <div className="mt-6 text-center">
+              <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="bg-white py-2 px-4 border border-gray-300 rounded-md shadow-sm text-sm font-medium text-gray-700 hover:bg-gray-50 disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
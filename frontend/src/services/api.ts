@@ -16,7 +16,9 @@ import type {
   PasswordChangeRequest,
   SpikeSchedule,
   CreateSpikeScheduleRequest,
-  UpdateSpikeScheduleRequest
+  UpdateSpikeScheduleRequest,
+  ListPageParams,
+  Page
 } from '../types/api';
 import { SessionExpiredError, isAuthenticationError } from './errors';
 
@@ -50,6 +52,13 @@ api.interceptors.response.use(
   }
 );
 
+// Fetch one page of an admin list; the next page's cursor comes back in a header
+const getPage = <T>(url: string, params: ListPageParams & { summary?: boolean }): Promise<Page<T>> =>
+  api.get(url, { params }).then(res => ({
+    items: res.data,
+    nextCursor: res.headers['x-next-cursor'] ?? null,
+  }));
+
 export const authApi = {
   login: (credentials: LoginRequest): Promise<LoginResponse> =>
     api.post('/auth/login', credentials).then(res => res.data),
@@ -65,6 +74,9 @@ export const collectionsApi = {
   list: (): Promise<Collection[]> =>
     api.get('/admin/collections').then(res => res.data),
 
+  listPage: (params: ListPageParams & { summary?: boolean }): Promise<Page<Collection>> =>
+    getPage('/admin/collections', params),
+
   get: (id: number): Promise<Collection> =>
     api.get(`/admin/collections/${id}`).then(res => res.data),
 
@@ -102,6 +114,9 @@ export const apiKeysApi = {
   list: (): Promise<APIKey[]> =>
     api.get('/admin/api-keys').then(res => res.data),
 
+  listPage: (params: ListPageParams): Promise<Page<APIKey>> =>
+    getPage('/admin/api-keys', params),
+
   create: (keyData: CreateAPIKeyRequest): Promise<CreateAPIKeyResponse> =>
     api.post('/admin/api-keys', keyData).then(res => res.data),
 
@@ -134,6 +149,9 @@ export const spikeSchedulesApi = {
   list: (): Promise<SpikeSchedule[]> =>
     api.get('/admin/spike-schedules').then(res => res.data),
 
+  listPage: (params: ListPageParams): Promise<Page<SpikeSchedule>> =>
+    getPage('/admin/spike-schedules', params),
+
   listByCollection: (collectionId: number): Promise<SpikeSchedule[]> =>
     api.get(`/admin/collections/${collectionId}/spike-schedules`).then(res => res.data),
 
@@ -158,6 +176,9 @@ export const usersApi = {
   list: (): Promise<User[]> =>
     api.get('/admin/users').then(res => res.data),
 
+  listPage: (params: ListPageParams): Promise<Page<User>> =>
+    getPage('/admin/users', params),
+
   create: (userData: UserCreate): Promise<User> =>
     api.post('/admin/users', userData).then(res => res.data),
 
@@ -16,6 +16,21 @@ export interface Collection {
   created_at: string;
   updated_at: string;
   fields?: Field[];
+  field_count?: number; // Set instead of fields when listed with summary=true
+}
+
+// Query parameters shared by the paginated admin list endpoints
+export interface ListPageParams {
+  q?: string; // Name prefix
+  sort?: string;
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string;
+}
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null; // Pass as cursor to fetch the next page; null on the last page
 }
 
 export interface Field {
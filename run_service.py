@@ -2,8 +2,8 @@
 """
 Data Generator Service Runner
 Runs the complete service on port 8088 serving both API and frontend.
+Server options (workers, reload, ...) come from backend Settings; see backend/start_server.py.
 """
-import uvicorn
 import os
 import sys
 
@@ -14,18 +14,8 @@ sys.path.insert(0, project_root)
 sys.path.insert(0, backend_path)
 
 if __name__ == "__main__":
-    print("Starting Data Generator Service on port 8088...")
-    print("Backend API: http://0.0.0.0:8088/api/")
-    print("Admin UI: http://0.0.0.0:8088/")
-    print("API Docs: http://0.0.0.0:8088/docs")
-    
-    # Change to backend directory so relative imports work
+    # Change to backend directory so relative paths and the app import resolve
     os.chdir(backend_path)
     
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8088,
-        reload=True,
-        reload_dirs=[backend_path, os.path.join(project_root, "frontend/dist")]
-    )
+    from start_server import main
+    main()
@@ -30,6 +30,13 @@ SERVICE_FILE="/etc/systemd/system/${SERVICE_NAME}.service"
 SERVICE_DESCRIPTION="RPO GenData Service"
 PROJECT_ROOT="/home/ubuntu/RPO_GenData"
 USER="ubuntu"
+# One worker per CPU by default. Workers on this host share the counter file
+# (COUNTER_BACKEND=shared) and publish cache invalidations to each other through
+# a small file in /dev/shm, so admin edits apply to every worker on its next
+# request. Instances on other hosts only see edits once the cache TTLs expire
+# (USER_CACHE_TTL_SECONDS, API_KEY_CACHE_TTL_SECONDS, PLAN_CACHE_TTL_SECONDS);
+# set WORKERS=1 to avoid the shared files entirely.
+WORKERS="${WORKERS:-$(nproc)}"
 
 echo -e "${GREEN}=== RPO GenData Systemd Service Setup ===${NC}"
 echo
@@ -45,9 +52,14 @@ After=network.target
 [Service]
 Type=simple
 User=$USER
-WorkingDirectory=$PROJECT_ROOT
+WorkingDirectory=$PROJECT_ROOT/backend
 Environment=PATH=/home/ubuntu/RPO_GenData/backend/venv/bin
+# Production server options; see backend/app/core/config.py
+Environment=SERVER_WORKERS=$WORKERS
+Environment=COUNTER_BACKEND=shared
 ExecStart=/home/ubuntu/RPO_GenData/backend/venv/bin/python start_server.py
+# Leave room for the graceful shutdown timeout before systemd kills workers
+TimeoutStopSec=45
 Restart=always
 RestartSec=10
 